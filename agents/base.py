@@ -3,8 +3,11 @@ Base AI Agent interface
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 from models.agent_response import AgentResponse
+from utils.cache import prompt_fingerprint
+from utils.cost import cost_tracker
+from utils.rate_limiter import estimate_tokens, rate_limiters
 
 
 class AIAgent(ABC):
@@ -12,6 +15,15 @@ class AIAgent(ABC):
     모든 AI 에이전트가 구현해야 하는 추상 인터페이스
     """
 
+    # rate_limiters 키 (하위 클래스에서 지정)
+    provider: str = ""
+
+    # 출력 토큰 상한을 지정하지 않는 API의 사전 차감용 예상 출력 토큰 수
+    default_output_tokens: int = 2000
+
+    # 호출마다 같은 고정 지시문 (프롬프트 캐시 대상, 가변 내용은 _build_prompt)
+    system_prompt: str = ""
+
     def __init__(self, api_key: str, config: Dict[str, Any]):
         """
         Args:
@@ -48,6 +60,131 @@ class AIAgent(ABC):
         """
         pass
 
+    @property
+    def model_name(self) -> str:
+        """사용 모델 이름 (캐시 키 등에 사용)"""
+        return self.config.get("model", self.name)
+
+    def prompt_fingerprint(self) -> str:
+        """프롬프트 템플릿 해시"""
+        builder = getattr(type(self), "_build_prompt", type(self).query)
+        return prompt_fingerprint(builder, self.system_prompt)
+
+    @staticmethod
+    def _request_timeout(context: Optional[Dict]) -> Optional[float]:
+        """오케스트레이터가 넘긴 남은 단계 기한 (SDK 요청 타임아웃, 초)"""
+        return context.get("timeout") if context else None
+
+    @staticmethod
+    def _stream_callback(context: Optional[Dict]) -> Optional[Callable[[str], None]]:
+        """
+        스트리밍 출력 콜백 (오케스트레이터가 streaming 모드에서 넘김)
+
+        있으면 에이전트는 스트리밍 API를 사용해 생성되는 텍스트 조각마다
+        콜백을 호출하고, 없으면 응답 전체를 한 번에 받습니다.
+        """
+        return context.get("on_chunk") if context else None
+
+    @staticmethod
+    def _refinement_note(context: Optional[Dict]) -> str:
+        """
+        보정 요청 문구 (파이프라이닝으로 입력 일부만 보고 쓴 초안이 있을 때)
+
+        오케스트레이터가 context["draft"]에 초안을 넣으면 프롬프트 끝에
+        붙여, 전체 입력을 반영해 초안을 고친 최종본을 요청합니다.
+        """
+        draft = context.get("draft") if context else None
+        if not draft:
+            return ""
+        return f"""
+
+이전 초안 (앞선 전문가 결과의 일부만 보고 작성):
+{draft}
+
+위의 전체 결과를 반영해 초안을 보완한 최종본을 작성하세요.
+새로 추가된 정보와 관련 없는 부분은 초안을 그대로 유지하세요."""
+
+    async def _acquire_rate_limit(self, prompt: str, max_output_tokens: int) -> int:
+        """
+        프로바이더 레이트 리미터 통과 대기
+
+        Args:
+            prompt: 전송할 프롬프트
+            max_output_tokens: 최대 출력 토큰 수
+
+        Returns:
+            사전 차감한 예상 토큰 수 (_reconcile_rate_limit에 전달)
+        """
+        estimate = estimate_tokens(prompt) + max_output_tokens
+        await rate_limiters[self.provider].acquire(tokens=estimate)
+        return estimate
+
+    def _reconcile_rate_limit(self, estimated: int, actual: Optional[int]):
+        """
+        호출 성공 반영
+
+        실제 사용 토큰 수로 사전 차감분을 보정하고(사용량을 모르면 그대로 둠)
+        적응형 속도 조정에 성공을 알립니다.
+        """
+        limiter = rate_limiters[self.provider]
+        if actual is not None:
+            limiter.reconcile(estimated, actual)
+        limiter.observe()
+
+    @staticmethod
+    def _batch_runner(context: Optional[Dict]):
+        """
+        배치 실행기 (오케스트레이터가 LOW 질문을 배치 모드로 처리할 때 넘김)
+
+        있으면 에이전트는 실시간 레이트 리미터를 거치지 않고 요청 인자를
+        batch.call(provider, params)로 넘겨 배치 결과를 기다립니다.
+        """
+        return context.get("batch") if context else None
+
+    def _record_usage(
+        self,
+        estimated: Optional[int],
+        input_tokens: Optional[int],
+        output_tokens: Optional[int],
+        prompt: str = "",
+        content: str = "",
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0,
+        price_factor: float = 1.0,
+    ) -> Dict[str, Any]:
+        """
+        호출 성공 반영 및 사용량/비용 기록
+
+        레이트 리미터를 실제 사용량으로 보정하고(estimated가 None이면 리미터를
+        거치지 않은 배치 호출) 가격표로 비용을 계산합니다. API가 사용량을 주지
+        않으면 prompt/content 길이로 추정합니다. input_tokens는 프롬프트
+        캐시에서 읽은/쓴 토큰을 포함한 전체 입력입니다.
+
+        Returns:
+            응답 metadata에 넣을 사용량 (CostTracker.record 참고)
+        """
+        estimated_usage = input_tokens is None or output_tokens is None
+        if estimated is not None:
+            self._reconcile_rate_limit(
+                estimated, None if estimated_usage else input_tokens + output_tokens
+            )
+        if estimated_usage:
+            input_tokens = estimate_tokens(prompt)
+            output_tokens = estimate_tokens(content)
+        return cost_tracker.record(
+            self.model_name,
+            input_tokens,
+            output_tokens,
+            estimated=estimated_usage,
+            cache_read_tokens=cache_read_tokens,
+            cache_write_tokens=cache_write_tokens,
+            price_factor=price_factor,
+        )
+
+    def _report_rate_limit_error(self, error: BaseException):
+        """호출 실패 반영 (429면 프로바이더 전체 백오프)"""
+        rate_limiters[self.provider].observe(error)
+
     def get_role(self) -> str:
         """
         에이전트 역할 설명 반환
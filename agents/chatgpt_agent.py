@@ -2,9 +2,10 @@
 OpenAI ChatGPT Agent implementation
 """
 
+import time
 from openai import AsyncOpenAI
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Callable, Dict, Optional, Tuple
 from .base import AIAgent
 from models.agent_response import AgentResponse
 from utils.logger import get_logger
@@ -17,6 +18,22 @@ class ChatGPTAgent(AIAgent):
     OpenAI ChatGPT 분석 에이전트
     """
 
+    provider = "openai"
+
+    # 고정 지시문. OpenAI는 요청 앞부분이 같으면 자동으로 프롬프트 캐시를 쓰므로
+    # (1024토큰 이상) 가변 내용보다 앞의 system 메시지에 둠
+    system_prompt = """
+당신은 전략 분석 전문가입니다. 사용자 메시지의 분야 관점에서 질문과 수집된
+정보를 바탕으로 다음을 분석하세요:
+1. 핵심 인사이트 (3-5개)
+2. SWOT 분석
+3. 기회와 위험 요인
+4. 전략적 제안 (구체적이고 실행 가능한)
+5. 예상 결과 및 지표
+
+**창의적이고 데이터 기반으로 분석하세요.**
+""".strip()
+
     def __init__(self, api_key: str, config: Dict):
         super().__init__(api_key, config)
         self.client = AsyncOpenAI(api_key=api_key)
@@ -37,30 +54,75 @@ class ChatGPTAgent(AIAgent):
 
             prompt = self._build_prompt(question, gemini_result, context)
 
-            response = await self.client.chat.completions.create(
+            request = dict(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "당신은 전략 분석 전문가입니다."},
+                    {"role": "system", "content": self.system_prompt},
                     {"role": "user", "content": prompt},
                 ],
                 temperature=self.temperature,
             )
-
-            content = response.choices[0].message.content
+            batch = self._batch_runner(context)
+            if batch and batch.supports(self.provider):
+                # 배치 API: 실시간 레이트 리미터를 거치지 않고 완료까지 대기
+                estimate = None
+                reply = await batch.call(self.provider, request)
+                content = reply["text"]
+                counts = (
+                    reply["input_tokens"],
+                    reply["output_tokens"],
+                    reply["cache_read_tokens"],
+                )
+                metadata = {"batch": True}
+            else:
+                batch = None
+                timeout = self._request_timeout(context)
+                if timeout:
+                    request["timeout"] = timeout
+                estimate = await self._acquire_rate_limit(
+                    self.system_prompt + prompt,
+                    self.config.get("max_output_tokens", self.default_output_tokens),
+                )
+                metadata = {}
+                on_chunk = self._stream_callback(context)
+                if on_chunk:
+                    content, usage, metadata["first_token"] = await self._stream(
+                        request, on_chunk
+                    )
+                else:
+                    call_start = time.monotonic()
+                    response = await self.client.chat.completions.create(**request)
+                    metadata["first_token"] = round(time.monotonic() - call_start, 3)
+                    content = response.choices[0].message.content
+                    usage = response.usage
+                counts = self._usage_counts(usage)
+
+            metadata.update(
+                self._record_usage(
+                    estimate,
+                    counts[0],
+                    counts[1],
+                    prompt,
+                    content,
+                    cache_read_tokens=counts[2],
+                    price_factor=batch.price_factor if batch else 1.0,
+                )
+            )
 
             return AgentResponse(
                 agent_name=self.name,
                 content=content,
                 metadata={
-                    "tokens": response.usage.total_tokens,
                     "duration": (datetime.now() - start_time).total_seconds(),
                     "model": self.model,
+                    **metadata,
                 },
                 timestamp=datetime.now(),
                 success=True,
             )
 
         except Exception as e:
+            self._report_rate_limit_error(e)
             logger.error(f"ChatGPT 오류: {e}", exc_info=True)
             return AgentResponse(
                 agent_name=self.name,
@@ -71,39 +133,76 @@ class ChatGPTAgent(AIAgent):
                 error=str(e),
             )
 
+    @staticmethod
+    def _usage_counts(usage) -> Tuple[Optional[int], Optional[int], int]:
+        """usage → (입력 토큰, 출력 토큰, 캐시에서 읽은 입력 토큰)"""
+        details = getattr(usage, "prompt_tokens_details", None)
+        return (
+            getattr(usage, "prompt_tokens", None),
+            getattr(usage, "completion_tokens", None),
+            getattr(details, "cached_tokens", None) or 0,
+        )
+
+    async def _stream(self, request: Dict, on_chunk: Callable[[str], None]) -> Tuple:
+        """
+        스트리밍 호출
+
+        Returns:
+            (전체 텍스트, 마지막 청크의 usage 또는 None, 첫 토큰까지 걸린 시간)
+        """
+        start = time.monotonic()
+        parts = []
+        usage = None
+        first_token = None
+
+        stream = await self.client.chat.completions.create(
+            stream=True, stream_options={"include_usage": True}, **request
+        )
+        async for chunk in stream:
+            if chunk.usage:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            text = chunk.choices[0].delta.content
+            if text:
+                if first_token is None:
+                    first_token = round(time.monotonic() - start, 3)
+                parts.append(text)
+                on_chunk(text)
+
+        return "".join(parts), usage, first_token
+
     def _build_prompt(
         self, question: str, research: str, context: Optional[Dict]
     ) -> str:
-        """프롬프트 생성"""
+        """프롬프트 생성 (가변 부분, 고정 지시문은 system_prompt)"""
         category = context.get("category", "일반") if context else "일반"
 
         prompt = f"""
-당신은 {category} 분야의 전략 분석가입니다.
+분야: {category}
 
 질문: {question}
 
 수집된 정보:
 {research}
-
-다음을 분석하세요:
-1. 핵심 인사이트 (3-5개)
-2. SWOT 분석
-3. 기회와 위험 요인
-4. 전략적 제안 (구체적이고 실행 가능한)
-5. 예상 결과 및 지표
-
-**창의적이고 데이터 기반으로 분석하세요.**
 """
-        return prompt.strip()
+        return prompt.strip() + self._refinement_note(context)
 
     async def health_check(self) -> bool:
         """API 연결 확인"""
         try:
+            estimate = await self._acquire_rate_limit("test", 5)
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[{"role": "user", "content": "test"}],
                 max_tokens=5,
             )
+            self._record_usage(
+                estimate,
+                getattr(response.usage, "prompt_tokens", None),
+                getattr(response.usage, "completion_tokens", None),
+                "test",
+            )
             return bool(response.choices)
         except Exception:
             return False
@@ -3,8 +3,9 @@ Anthropic Claude Agent implementation
 """
 
 import anthropic
+import time
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Any, Callable, Dict, List, Optional
 from .base import AIAgent
 from models.agent_response import AgentResponse
 from utils.logger import get_logger
@@ -12,14 +13,110 @@ from utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+def cached_system(text: str) -> List[Dict[str, Any]]:
+    """
+    프롬프트 캐시 표시를 붙인 system 블록
+
+    고정 지시문을 system 앞쪽에 두고 cache_control을 붙이면 같은 지시문으로
+    다시 호출할 때 캐시에서 읽어(입력 가격의 약 10%) 입력 처리 시간도 줄어듭니다.
+    캐시 최소 길이(모델별 1024~2048토큰)보다 짧으면 API가 표시를 무시합니다.
+    """
+    return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+
+
+def _usage(usage: Any) -> Dict[str, int]:
+    """Anthropic usage → 입력 전체/캐시 읽기/캐시 쓰기 토큰 수"""
+    read = getattr(usage, "cache_read_input_tokens", None) or 0
+    write = getattr(usage, "cache_creation_input_tokens", None) or 0
+    return {
+        "input_tokens": usage.input_tokens + read + write,
+        "cache_read_tokens": read,
+        "cache_write_tokens": write,
+    }
+
+
+async def send_message(
+    client: anthropic.AsyncAnthropic,
+    on_chunk: Optional[Callable[[str], None]] = None,
+    **request,
+) -> Dict[str, Any]:
+    """
+    messages.create 호출 (on_chunk가 있으면 스트리밍)
+
+    스트리밍이면 텍스트 조각마다 on_chunk를 호출합니다. 끝나면 전체 텍스트,
+    사용량(캐시 읽기/쓰기 포함 입력 전체, 출력), 첫 토큰까지 걸린 시간(초,
+    스트리밍이 아니면 응답 전체를 받기까지의 시간)을 반환합니다.
+    """
+    start = time.monotonic()
+    result: Dict[str, Any] = {
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "cache_read_tokens": 0,
+        "cache_write_tokens": 0,
+        "first_token": None,
+    }
+
+    if not on_chunk:
+        message = await client.messages.create(**request)
+        result.update(_usage(message.usage))
+        result["output_tokens"] = message.usage.output_tokens
+        result["first_token"] = round(time.monotonic() - start, 3)
+        result["text"] = message.content[0].text
+        return result
+
+    parts = []
+    stream = await client.messages.create(stream=True, **request)
+    async for event in stream:
+        if event.type == "message_start":
+            result.update(_usage(event.message.usage))
+        elif event.type == "content_block_delta" and event.delta.type == "text_delta":
+            if result["first_token"] is None:
+                result["first_token"] = round(time.monotonic() - start, 3)
+            parts.append(event.delta.text)
+            on_chunk(event.delta.text)
+        elif event.type == "message_delta":
+            result["output_tokens"] = event.usage.output_tokens
+
+    result["text"] = "".join(parts)
+    return result
+
+
 class ClaudeAgent(AIAgent):
     """
     Anthropic Claude 실행 계획 에이전트
     """
 
+    provider = "anthropic"
+    max_tokens = 4000
+
+    # 고정 지시문 (프롬프트 캐시 접두사). 분야/질문/앞선 결과는 사용자 메시지로
+    system_prompt = """
+당신은 실행 전문가이자 검증자입니다. 사용자 메시지의 분야 관점에서 질문과
+앞선 전문가들의 정보 수집 결과(Gemini), 분석 및 전략(ChatGPT)을 검토합니다.
+
+당신의 역할:
+1. **실행 계획**: 단계별 액션 플랜 (타임라인 포함)
+2. **법적/규제 검토**: 준수 사항 및 리스크
+3. **리소스 계획**: 필요한 예산, 인력, 도구
+4. **리스크 관리**: 시나리오별 대응 방안
+5. **검증**: 앞선 분석의 논리적 오류나 누락 지적
+6. **최종 권고**: 실행 여부 및 이유
+
+**비판적이고 현실적으로 검토하세요.**
+**법적 리스크를 명확히 지적하세요.**
+
+출력 구조:
+# Executive Summary
+# 실행 계획
+# 법적/규제 검토
+# 리스크 관리
+# Next Actions (우선순위별)
+# 최종 의사결정 권고
+""".strip()
+
     def __init__(self, api_key: str, config: Dict):
         super().__init__(api_key, config)
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.client = anthropic.AsyncAnthropic(api_key=api_key)
         self.model = config.get("model", "claude-sonnet-4-5-20250929")
 
     async def query(
@@ -39,27 +136,57 @@ class ClaudeAgent(AIAgent):
                 question, gemini_result, chatgpt_result, context
             )
 
-            message = self.client.messages.create(
+            params = dict(
                 model=self.model,
-                max_tokens=4000,
+                max_tokens=self.max_tokens,
+                system=cached_system(self.system_prompt),
                 messages=[{"role": "user", "content": prompt}],
             )
-
-            content = message.content[0].text
+            batch = self._batch_runner(context)
+            if batch and batch.supports(self.provider):
+                # 배치 API: 실시간 레이트 리미터를 거치지 않고 완료까지 대기
+                estimate = None
+                reply = await batch.call(self.provider, params)
+                metadata = {"batch": True}
+            else:
+                batch = None
+                timeout = self._request_timeout(context)
+                estimate = await self._acquire_rate_limit(
+                    self.system_prompt + prompt, self.max_tokens
+                )
+                reply = await send_message(
+                    self.client,
+                    self._stream_callback(context),
+                    **params,
+                    **({"timeout": timeout} if timeout else {}),
+                )
+                metadata = {"first_token": reply["first_token"]}
+            content = reply["text"]
+            metadata.update(
+                self._record_usage(
+                    estimate,
+                    reply["input_tokens"],
+                    reply["output_tokens"],
+                    cache_read_tokens=reply["cache_read_tokens"],
+                    cache_write_tokens=reply["cache_write_tokens"],
+                    price_factor=batch.price_factor if batch else 1.0,
+                )
+            )
 
             return AgentResponse(
                 agent_name=self.name,
                 content=content,
                 metadata={
-                    "tokens": message.usage.input_tokens + message.usage.output_tokens,
                     "duration": (datetime.now() - start_time).total_seconds(),
                     "model": self.model,
+                    **metadata,
                 },
                 timestamp=datetime.now(),
                 success=True,
             )
 
         except Exception as e:
+            self._report_rate_limit_error(e)
             logger.error(f"Claude 오류: {e}", exc_info=True)
             return AgentResponse(
                 agent_name=self.name,
@@ -73,11 +200,11 @@ class ClaudeAgent(AIAgent):
     def _build_prompt(
         self, question: str, research: str, analysis: str, context: Optional[Dict]
     ) -> str:
-        """프롬프트 생성"""
+        """프롬프트 생성 (가변 부분, 고정 지시문은 system_prompt)"""
         category = context.get("category", "일반") if context else "일반"
 
         prompt = f"""
-당신은 {category} 분야의 실행 전문가이자 검증자입니다.
+분야: {category}
 
 질문: {question}
 
@@ -86,36 +213,20 @@ class ClaudeAgent(AIAgent):
 
 분석 및 전략 (ChatGPT):
 {analysis}
-
-당신의 역할:
-1. **실행 계획**: 단계별 액션 플랜 (타임라인 포함)
-2. **법적/규제 검토**: 준수 사항 및 리스크
-3. **리소스 계획**: 필요한 예산, 인력, 도구
-4. **리스크 관리**: 시나리오별 대응 방안
-5. **검증**: 앞선 분석의 논리적 오류나 누락 지적
-6. **최종 권고**: 실행 여부 및 이유
-
-**비판적이고 현실적으로 검토하세요.**
-**법적 리스크를 명확히 지적하세요.**
-
-출력 구조:
-# Executive Summary
-# 실행 계획
-# 법적/규제 검토
-# 리스크 관리
-# Next Actions (우선순위별)
-# 최종 의사결정 권고
 """
-        return prompt.strip()
+        return prompt.strip() + self._refinement_note(context)
 
     async def health_check(self) -> bool:
         """API 연결 확인"""
         try:
-            message = self.client.messages.create(
+            estimate = await self._acquire_rate_limit("test", 10)
+            reply = await send_message(
+                self.client,
                 model=self.model,
                 max_tokens=10,
                 messages=[{"role": "user", "content": "test"}],
             )
-            return bool(message.content)
+            self._record_usage(estimate, reply["input_tokens"], reply["output_tokens"])
+            return bool(reply["text"])
         except Exception:
             return False
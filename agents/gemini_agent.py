@@ -3,6 +3,7 @@ Google Gemini Agent implementation
 """
 
 import google.generativeai as genai
+import time
 from datetime import datetime
 from typing import Optional, Dict
 from .base import AIAgent
@@ -17,6 +18,8 @@ class GeminiAgent(AIAgent):
     Google Gemini 정보 수집 에이전트
     """
 
+    provider = "gemini"
+
     def __init__(self, api_key: str, config: Dict):
         super().__init__(api_key, config)
         genai.configure(api_key=api_key)
@@ -34,22 +37,62 @@ class GeminiAgent(AIAgent):
             # 역할별 프롬프트 구성
             prompt = self._build_prompt(question, context)
 
-            # Gemini 호출
-            response = self.model.generate_content(prompt)
+            # Gemini 호출 (비동기 - 이벤트 루프 블로킹 방지)
+            estimate = await self._acquire_rate_limit(
+                prompt, self.config.get("max_output_tokens", self.default_output_tokens)
+            )
+            timeout = self._request_timeout(context)
+            options = {"request_options": {"timeout": timeout}} if timeout else {}
+            metadata = {}
+            on_chunk = self._stream_callback(context)
+            if on_chunk:
+                # 스트리밍: 조각마다 콜백, 사용량은 스트림이 끝난 뒤 응답에 채워짐
+                stream_start = time.monotonic()
+                parts = []
+                response = await self.model.generate_content_async(
+                    prompt, stream=True, **options
+                )
+                async for chunk in response:
+                    text = chunk.text if chunk.parts else ""
+                    if text:
+                        if not parts:
+                            metadata["first_token"] = round(
+                                time.monotonic() - stream_start, 3
+                            )
+                        parts.append(text)
+                        on_chunk(text)
+                content = "".join(parts)
+            else:
+                call_start = time.monotonic()
+                response = await self.model.generate_content_async(prompt, **options)
+                metadata["first_token"] = round(time.monotonic() - call_start, 3)
+                content = response.text
+            usage = getattr(response, "usage_metadata", None)
+            metadata.update(
+                self._record_usage(
+                    estimate,
+                    getattr(usage, "prompt_token_count", None),
+                    getattr(usage, "candidates_token_count", None),
+                    prompt,
+                    content,
+                )
+            )
 
             # 응답 구성
             return AgentResponse(
                 agent_name=self.name,
-                content=response.text,
+                content=content,
                 metadata={
-                    "tokens": len(response.text.split()),
                     "duration": (datetime.now() - start_time).total_seconds(),
+                    "model": self.model_name,
+                    **metadata,
                 },
                 timestamp=datetime.now(),
                 success=True,
             )
 
         except Exception as e:
+            self._report_rate_limit_error(e)
             logger.error(f"Gemini 오류: {e}", exc_info=True)
             return AgentResponse(
                 agent_name=self.name,
@@ -79,12 +122,23 @@ class GeminiAgent(AIAgent):
 **출처 URL을 반드시 포함하세요.**
 **구조화된 형식으로 정리하세요.**
 """
-        return base_prompt.strip()
+        return base_prompt.strip() + self._refinement_note(context)
 
     async def health_check(self) -> bool:
         """API 연결 확인"""
         try:
-            test_response = self.model.generate_content("Hello")
+            estimate = await self._acquire_rate_limit(
+                "Hello", self.default_output_tokens
+            )
+            test_response = await self.model.generate_content_async("Hello")
+            usage = getattr(test_response, "usage_metadata", None)
+            self._record_usage(
+                estimate,
+                getattr(usage, "prompt_token_count", None),
+                getattr(usage, "candidates_token_count", None),
+                "Hello",
+                test_response.text,
+            )
             return bool(test_response.text)
         except Exception:
             return False
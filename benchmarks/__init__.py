@@ -0,0 +1,3 @@
+"""
+Load benchmarks with mock providers and a mock Notion
+"""
@@ -0,0 +1,401 @@
+"""
+End-to-end load benchmark with mock providers and a mock Notion
+
+Application → NotionWatcher → Orchestrator 전체 경로를 모의 프로바이더와 모의
+Notion으로 실행하고 처리량, 질문별 처리 시간(Inbox 도착 → completed/failed)
+백분위수, 워커 사용률, 레이트 리미터 대기 시간을 보고합니다.
+
+    python -m benchmarks.load --questions 1000
+    python -m benchmarks.load --questions 1000 --output after.json --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import yaml
+
+from benchmarks.mocks import (
+    MockAnthropic,
+    MockGemini,
+    MockNotion,
+    MockOpenAI,
+    MockProvider,
+    ProviderProfile,
+)
+from core.cassette import Cassette
+from core.hedging import LatencyTracker
+from main import Application
+from utils.circuit_breaker import configure_circuit_breakers
+from utils.cost import cost_tracker
+from utils.rate_limiter import configure_rate_limiters, rate_limiters
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PROFILE = Path(__file__).resolve().parent / "profiles" / "default.yaml"
+
+# ConfigManager가 요구하는 환경변수 (모의 클라이언트를 쓰므로 값은 쓰이지 않음)
+REQUIRED_ENV = (
+    "ANTHROPIC_API_KEY",
+    "OPENAI_API_KEY",
+    "GEMINI_API_KEY",
+    "NOTION_API_KEY",
+    "NOTION_INBOX_DB_ID",
+    "NOTION_RESULTS_DB_ID",
+)
+
+# 비교 출력 지표: (표시 이름, 보고서 경로, 높을수록 좋은지)
+COMPARED_METRICS = [
+    ("처리량 (질문/분)", ("throughput_per_min",), True),
+    ("p50 처리 시간", ("latency", "p50"), False),
+    ("p95 처리 시간", ("latency", "p95"), False),
+    ("p99 처리 시간", ("latency", "p99"), False),
+    ("워커 사용률", ("worker_utilization",), True),
+]
+
+
+def load_profile(path: Optional[str] = None) -> Dict:
+    """벤치마크 프로필 YAML 로드 (기본: benchmarks/profiles/default.yaml)"""
+    path = Path(path) if path else DEFAULT_PROFILE
+    with open(path, "r", encoding="utf-8") as f:
+        profile = yaml.safe_load(f) or {}
+    profile.setdefault("name", path.stem)
+    return profile
+
+
+def deep_merge(base: Dict, override: Dict) -> Dict:
+    """딕셔너리 재귀 병합 (override 우선)"""
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def write_config(profile: Dict, workdir: Path) -> Path:
+    """config.yaml에 프로필 설정을 덮어써 작업 디렉토리에 저장"""
+    with open(ROOT / "config.yaml", "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    config = deep_merge(config, profile.get("config") or {})
+
+    # 실행마다 빈 원장/캐시로 시작
+    config.setdefault("storage", {})["job_db"] = str(workdir / "jobs.db")
+    config.setdefault("cache", {})["path"] = None
+
+    path = workdir / "config.yaml"
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f, allow_unicode=True)
+    return path
+
+
+def create_mocks(profile: Dict, seed: int = 0) -> Dict[str, MockProvider]:
+    """프로필의 providers 설정으로 모의 클라이언트 생성"""
+    providers = profile.get("providers") or {}
+    classes = {
+        "gemini": MockGemini,
+        "openai": MockOpenAI,
+        "anthropic": MockAnthropic,
+        "notion": MockNotion,
+    }
+    return {
+        name: cls(ProviderProfile.from_config(providers.get(name)), seed)
+        for name, cls in classes.items()
+    }
+
+
+def install_mocks(app: Application, mocks: Dict[str, MockProvider]):
+    """Application의 모든 SDK 클라이언트를 모의 클라이언트로 교체"""
+    orchestrator = app.orchestrator
+    for agent in orchestrator.all_agents():
+        if agent.provider == "gemini":
+            agent.model = mocks["gemini"]
+        else:
+            agent.client = mocks[agent.provider]
+    orchestrator.synthesis.client = mocks["anthropic"]
+    app.notion.client = mocks["notion"]
+
+
+def bind_clock(app: Application, clock: Callable[[], float]):
+    """
+    시각 함수를 쓰는 구성 요소를 모두 같은 시계로 교체
+
+    이벤트 루프 시계(loop.time)를 넘기면 benchmarks.simulate의 가상 시계
+    루프에서도 레이트 리미터/서킷 브레이커/스케줄러 에이징/전체 재동기화가
+    가상 시간으로 동작합니다.
+    """
+    config = app.config.config
+    configure_rate_limiters(config.get("rate_limits"), clock=clock)
+    configure_circuit_breakers(config.get("circuit_breakers"), clock=clock)
+    app.watcher.queue.clock = clock
+    app.notion.clock = clock
+    if app.orchestrator.batch:
+        app.orchestrator.batch.clock = clock
+
+
+async def _arrive(notion: MockNotion, count: int, workload: Dict, seed: int):
+    """Inbox에 질문 도착 (arrival_rate가 있으면 포아송 도착)"""
+    rng = random.Random(f"{seed}:workload")
+    rate = workload.get("arrival_rate") or 0
+    priorities = workload.get("priorities") or {"medium": 1.0}
+    categories = workload.get("categories") or {}
+
+    for i in range(count):
+        if rate and i:
+            await asyncio.sleep(rng.expovariate(rate))
+        priority = rng.choices(list(priorities), weights=list(priorities.values()))[0]
+        roll, category = rng.random(), None
+        for name, share in categories.items():
+            roll -= share
+            if roll < 0:
+                category = name
+                break
+        words = " ".join(rng.choices("시장 고객 전략 비용 성장 채널 가격".split(), k=8))
+        notion.add_question(f"[{i + 1}] {words}?", priority, category)
+
+
+async def _sample(app: Application, samples: Dict[str, List[float]], interval: float):
+    """워커 사용률 (처리 중인 질문 수 / 워커 수)과 큐 길이 표본"""
+    workers = app.watcher.max_concurrent_tasks
+    while True:
+        stats = app.watcher.stats()
+        samples["workers"].append(stats["in_flight"] / workers)
+        samples["queue"].append(stats["queued"])
+        await asyncio.sleep(interval)
+
+
+async def run_benchmark(
+    profile: Dict,
+    questions: int,
+    seed: int = 0,
+    timeout: Optional[float] = None,
+    sample_interval: float = 0.1,
+    cassette: Optional[str] = None,
+    timing: float = 1.0,
+) -> Dict:
+    """
+    부하 벤치마크 한 번 실행
+
+    Args:
+        profile: 벤치마크 프로필 (load_profile)
+        questions: Inbox에 넣을 질문 수
+        seed: 지연/오류/질문 분포 난수 시드
+        timeout: 전체 실행 제한 시간 (초, 넘으면 끝난 질문까지만 보고)
+        sample_interval: 워커 사용률/큐 길이 표본 간격 (초)
+        cassette: 있으면 AI 프로바이더 응답을 모의 클라이언트 대신 이 카세트에서
+                  재생 (Notion은 계속 모의 클라이언트)
+        timing: 카세트 재생 지연 배율
+
+    Returns:
+        보고서 (format_report로 출력)
+    """
+    for key in REQUIRED_ENV:
+        os.environ.setdefault(key, "benchmark")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        app = Application(str(write_config(profile, Path(workdir))))
+        mocks = create_mocks(profile, seed)
+        install_mocks(app, mocks)
+        replay = None
+        if cassette:
+            replay = Cassette(
+                cassette, "replay", ["anthropic", "openai", "gemini"], timing
+            )
+            replay.install(app.orchestrator)
+        notion: MockNotion = mocks["notion"]
+
+        loop = asyncio.get_running_loop()
+        bind_clock(app, loop.time)
+        started = loop.time()
+        samples: Dict[str, List[float]] = {"workers": [], "queue": []}
+
+        app.writer.start()
+        watcher = asyncio.create_task(app.watcher.start(callback=app.process_question))
+        sampler = asyncio.create_task(_sample(app, samples, sample_interval))
+        arrivals = asyncio.create_task(
+            _arrive(notion, questions, profile.get("workload") or {}, seed)
+        )
+
+        async def finished():
+            await arrivals
+            while len(notion.finished) < questions:
+                await asyncio.sleep(sample_interval)
+
+        try:
+            await asyncio.wait_for(finished(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            arrivals.cancel()
+            sampler.cancel()
+            app.watcher.stop()
+            await asyncio.gather(watcher, sampler, arrivals, return_exceptions=True)
+            await app.writer.close()
+            app.jobs.close()
+
+        end = max(notion.finished.values(), default=loop.time())
+        report = _report(profile, questions, seed, app, mocks, samples, end - started)
+        if replay:
+            report["cassette"] = replay.stats()
+        return report
+
+
+def _report(
+    profile: Dict,
+    questions: int,
+    seed: int,
+    app: Application,
+    mocks: Dict[str, MockProvider],
+    samples: Dict[str, List[float]],
+    elapsed: float,
+) -> Dict:
+    """실행 결과 집계"""
+    notion: MockNotion = mocks["notion"]
+    latencies = LatencyTracker(window=max(1, questions))
+    for page_id, finished_at in notion.finished.items():
+        latencies.record(finished_at - notion.arrived[page_id])
+    statuses = [notion.statuses[page_id] for page_id in notion.finished]
+
+    return {
+        "profile": profile.get("name"),
+        "seed": seed,
+        "questions": questions,
+        "completed": statuses.count("completed"),
+        "failed": statuses.count("failed"),
+        "unfinished": questions - len(notion.finished),
+        "elapsed": round(elapsed, 3),
+        "throughput_per_min": (
+            round(len(notion.finished) / elapsed * 60, 2) if elapsed > 0 else 0.0
+        ),
+        "latency": {
+            "mean": (
+                round(sum(latencies.samples) / len(latencies), 3)
+                if len(latencies)
+                else None
+            ),
+            **{
+                f"p{p}": (round(latencies.percentile(p), 3) if len(latencies) else None)
+                for p in (50, 95, 99)
+            },
+        },
+        "worker_utilization": _mean(samples["workers"]),
+        "queue_depth": {
+            "mean": _mean(samples["queue"]),
+            "max": max(samples["queue"], default=0),
+        },
+        "rate_limiters": {
+            name: _limiter_stats(name, elapsed)
+            for name in mocks
+            if name in rate_limiters
+        },
+        "providers": {name: mock.stats() for name, mock in mocks.items()},
+        "result_pages": notion.result_pages,
+        "cost": round(cost_tracker.stats()["cost"], 4),
+    }
+
+
+def _limiter_stats(name: str, elapsed: float) -> Dict:
+    """레이트 리미터 통계 + 사용률 (획득한 요청 수 / 실행 시간 동안의 설정 한도)"""
+    limiter = rate_limiters[name]
+    stats = {key: round(value, 3) for key, value in limiter.stats().items()}
+    capacity = limiter.max_requests / limiter.time_window * elapsed
+    stats["utilization"] = round(limiter.acquired / capacity, 3) if capacity else 0.0
+    return stats
+
+
+def _mean(values: List[float]) -> float:
+    return round(sum(values) / len(values), 3) if values else 0.0
+
+
+def _metric(report: Dict, path: tuple) -> Optional[float]:
+    value = report
+    for key in path:
+        value = (value or {}).get(key)
+    return value
+
+
+def format_report(report: Dict, baseline: Optional[Dict] = None) -> str:
+    """보고서를 사람이 읽을 형식으로 (baseline이 있으면 변화율 포함)"""
+    latency = report["latency"]
+    lines = [
+        f"📊 {report['profile']} (시드 {report['seed']}): 질문 {report['questions']}개, "
+        f"완료 {report['completed']}, 실패 {report['failed']}, "
+        f"미완료 {report['unfinished']}",
+        f"⏱️  {report['elapsed']:.1f}초, {report['throughput_per_min']:.1f} 질문/분",
+        f"⌛ 처리 시간: p50 {latency['p50']}초, p95 {latency['p95']}초, "
+        f"p99 {latency['p99']}초",
+        f"👷 워커 사용률: {report['worker_utilization']:.0%}, 큐 길이: 평균 "
+        f"{report['queue_depth']['mean']:.1f} / 최대 {report['queue_depth']['max']}",
+    ]
+    for name, stats in report["rate_limiters"].items():
+        calls = report["providers"][name]
+        lines.append(
+            f"🚦 {name}: 대기 평균 {stats['avg_wait']:.3f}초 / 합계 "
+            f"{stats['total_wait']:.1f}초, 429 {stats['rate_limited']:.0f}회 "
+            f"(호출 {calls['calls']}, 오류 {calls['errors']}, "
+            f"모의 429 {calls['rate_limited']})"
+        )
+
+    if baseline:
+        lines.append(f"🔁 기준 대비 ({baseline.get('profile')}):")
+        for label, path, higher_is_better in COMPARED_METRICS:
+            before, after = _metric(baseline, path), _metric(report, path)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before * 100 if before else 0.0
+            better = (change > 0) == higher_is_better or change == 0
+            lines.append(
+                f"   {'✅' if better else '⚠️ '} {label}: {before} → {after} "
+                f"({change:+.1f}%)"
+            )
+    return "\n".join(lines)
+
+
+def main():
+    """CLI 진입점"""
+    parser = argparse.ArgumentParser(description="모의 프로바이더 부하 벤치마크")
+    parser.add_argument("--questions", type=int, default=100)
+    parser.add_argument("--profile", help="프로필 YAML (기본: profiles/default.yaml)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, help="전체 실행 제한 시간 (초)")
+    parser.add_argument("--output", help="보고서 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 보고서 JSON")
+    parser.add_argument("--cassette", help="AI 프로바이더 응답을 재생할 카세트")
+    parser.add_argument("--timing", type=float, default=1.0, help="재생 지연 배율")
+    parser.add_argument("--verbose", action="store_true", help="애플리케이션 로그 출력")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+
+    profile = load_profile(args.profile)
+    report = asyncio.run(
+        run_benchmark(
+            profile,
+            args.questions,
+            seed=args.seed,
+            timeout=args.timeout,
+            cassette=args.cassette,
+            timing=args.timing,
+        )
+    )
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print(format_report(report, baseline))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+"""
+Mock provider and Notion clients for load benchmarks
+"""
+
+import asyncio
+import itertools
+import math
+import random
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Deque, Dict, List, Optional
+
+from utils.rate_limiter import estimate_tokens
+
+# 응답 본문 생성용 단어 (출력 크기만 맞으면 되므로 내용은 의미 없음)
+WORDS = (
+    "시장 고객 전략 분석 비용 매출 경쟁사 리스크 실행 계획 단계 우선순위 "
+    "데이터 성장 채널 가격 제품 서비스 운영 조직 예산 일정 지표 목표 검토 "
+    "market customer strategy revenue growth channel pricing risk plan metric"
+).split()
+
+# 스트리밍 응답의 최대 조각 수
+MAX_CHUNKS = 20
+
+
+@dataclass
+class LatencyModel:
+    """
+    로그정규 지연 분포 (중앙값과 p95로 지정, 초)
+
+    config 형식: {median: 2.0, p95: 6.0, min: 0.1} 또는 고정값 숫자
+    """
+
+    median: float = 1.0
+    p95: float = 1.0
+    minimum: float = 0.0
+
+    @classmethod
+    def from_config(cls, config: Any) -> "LatencyModel":
+        if isinstance(config, (int, float)):
+            return cls(float(config), float(config))
+        config = config or {}
+        median = float(config.get("median", 1.0))
+        return cls(
+            median=median,
+            p95=float(config.get("p95", median)),
+            minimum=float(config.get("min", 0.0)),
+        )
+
+    def sample(self, rng: random.Random) -> float:
+        """지연 시간 하나 추출"""
+        if self.p95 <= self.median or self.median <= 0:
+            return max(self.minimum, self.median)
+        sigma = math.log(self.p95 / self.median) / 1.645
+        return max(self.minimum, rng.lognormvariate(math.log(self.median), sigma))
+
+
+@dataclass
+class ProviderProfile:
+    """
+    모의 프로바이더 동작
+
+    config 형식 (벤치마크 프로필의 providers.<이름>):
+        latency: {median: 2.0, p95: 6.0}
+        error_rate: 0.01  # 500 오류 비율
+        rate_limit_rate: 0.0  # 무작위 429 비율
+        max_requests_per_minute: 120  # 서버 측 한도 (넘으면 429 + Retry-After)
+        retry_after: 1.0  # 무작위 429의 Retry-After (초)
+        output_tokens: 800  # 응답 본문 크기
+        first_token_ratio: 0.2  # 스트리밍 첫 조각까지 걸리는 비율
+    """
+
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    max_requests_per_minute: Optional[int] = None
+    retry_after: float = 1.0
+    output_tokens: int = 800
+    first_token_ratio: float = 0.2
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> "ProviderProfile":
+        config = config or {}
+        return cls(
+            latency=LatencyModel.from_config(config.get("latency")),
+            error_rate=config.get("error_rate", 0.0),
+            rate_limit_rate=config.get("rate_limit_rate", 0.0),
+            max_requests_per_minute=config.get("max_requests_per_minute"),
+            retry_after=config.get("retry_after", 1.0),
+            output_tokens=config.get("output_tokens", 800),
+            first_token_ratio=config.get("first_token_ratio", 0.2),
+        )
+
+
+class MockAPIError(Exception):
+    """
+    모의 API 오류 (SDK 예외처럼 status_code/code/응답 헤더 제공)
+
+    429면 utils.rate_limiter.is_rate_limit_error가 속도 제한으로 인식하고
+    retry_after()가 Retry-After 헤더를 읽습니다.
+    """
+
+    def __init__(self, status_code: int, message: str, retry_after: float = None):
+        super().__init__(f"{status_code} {message}")
+        self.status_code = status_code
+        self.code = status_code
+        self.headers = {}
+        if retry_after is not None:
+            self.headers["retry-after"] = f"{retry_after:.3f}"
+        self.response = SimpleNamespace(headers=self.headers)
+
+
+class MockProvider:
+    """
+    모의 클라이언트 공통 동작 (지연, 오류, 429, 호출 통계)
+
+    지연과 오류는 시드로 초기화한 난수로 정해지므로 같은 프로필/시드면 같은
+    분포로 다시 실행할 수 있습니다.
+    """
+
+    def __init__(self, name: str, profile: ProviderProfile, seed: int = 0):
+        """
+        Args:
+            name: 프로바이더 이름 (통계 키, 난수 시드에 포함)
+            profile: 지연/오류 동작
+            seed: 난수 시드
+        """
+        self.name = name
+        self.profile = profile
+        self.rng = random.Random(f"{seed}:{name}")
+        self.calls = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self._recent: Deque[float] = deque()
+
+    def stats(self) -> Dict[str, int]:
+        """호출/오류/429 횟수"""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+        }
+
+    async def _respond(self) -> float:
+        """
+        호출 하나 처리 (오류면 지연 후 예외)
+
+        Returns:
+            이 응답에 쓸 지연 시간 (초, 아직 기다리지 않음)
+        """
+        self.calls += 1
+        latency = self.profile.latency.sample(self.rng)
+        roll = self.rng.random()
+
+        limit = self.profile.max_requests_per_minute
+        if limit:
+            now = asyncio.get_running_loop().time()
+            while self._recent and now - self._recent[0] >= 60:
+                self._recent.popleft()
+            if len(self._recent) >= limit:
+                self.rate_limited += 1
+                raise MockAPIError(
+                    429, "rate limit exceeded", 60 - (now - self._recent[0])
+                )
+            self._recent.append(now)
+
+        if roll < self.profile.rate_limit_rate:
+            self.rate_limited += 1
+            raise MockAPIError(429, "rate limit exceeded", self.profile.retry_after)
+        if roll < self.profile.rate_limit_rate + self.profile.error_rate:
+            self.errors += 1
+            await asyncio.sleep(latency)
+            raise MockAPIError(500, "internal server error")
+        return latency
+
+    def _text(self) -> str:
+        """output_tokens 분량의 마크다운 응답 본문"""
+        target = self.profile.output_tokens * 2  # estimate_tokens: 2자당 1토큰
+        parts: List[str] = []
+        length = 0
+        section = 0
+        while length < target:
+            if section % 4 == 0:
+                parts.append(f"## {self.rng.choice(WORDS)} {section // 4 + 1}")
+                length += len(parts[-1]) + 2
+            parts.append(" ".join(self.rng.choices(WORDS, k=24)) + ".")
+            length += len(parts[-1]) + 2
+            section += 1
+        return "\n\n".join(parts)
+
+    async def _pieces(self, text: str, duration: float):
+        """duration초 동안 text를 조각으로 나눠 내보냄"""
+        size = max(1, math.ceil(len(text) / MAX_CHUNKS))
+        pieces = [text[i : i + size] for i in range(0, len(text), size)]
+        for piece in pieces:
+            await asyncio.sleep(duration / len(pieces))
+            yield piece
+
+
+class MockAnthropic(MockProvider):
+    """anthropic.AsyncAnthropic 대체 (messages.create, 스트리밍 이벤트)"""
+
+    def __init__(self, profile: ProviderProfile, seed: int = 0):
+        super().__init__("anthropic", profile, seed)
+        self.messages = SimpleNamespace(create=self._create)
+
+    async def _create(self, stream: bool = False, **request):
+        latency = await self._respond()
+        system = request.get("system") or ""
+        if isinstance(system, list):
+            system = "".join(block["text"] for block in system)
+        usage = SimpleNamespace(
+            input_tokens=estimate_tokens(
+                system + "".join(m["content"] for m in request["messages"])
+            ),
+            output_tokens=self.profile.output_tokens,
+            cache_read_input_tokens=0,
+            cache_creation_input_tokens=0,
+        )
+        text = self._text()
+        if stream:
+            await asyncio.sleep(latency * self.profile.first_token_ratio)
+            return self._events(text, usage, latency)
+        await asyncio.sleep(latency)
+        return SimpleNamespace(content=[SimpleNamespace(text=text)], usage=usage)
+
+    async def _events(self, text: str, usage, latency: float):
+        yield SimpleNamespace(
+            type="message_start", message=SimpleNamespace(usage=usage)
+        )
+        rest = latency * (1 - self.profile.first_token_ratio)
+        async for piece in self._pieces(text, rest):
+            yield SimpleNamespace(
+                type="content_block_delta",
+                delta=SimpleNamespace(type="text_delta", text=piece),
+            )
+        yield SimpleNamespace(
+            type="message_delta",
+            usage=SimpleNamespace(output_tokens=usage.output_tokens),
+        )
+
+
+class MockOpenAI(MockProvider):
+    """openai.AsyncOpenAI 대체 (chat.completions.create, 스트리밍 청크)"""
+
+    def __init__(self, profile: ProviderProfile, seed: int = 0):
+        super().__init__("openai", profile, seed)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, stream: bool = False, **request):
+        latency = await self._respond()
+        prompt_tokens = estimate_tokens(
+            "".join(m["content"] for m in request["messages"])
+        )
+        usage = SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=self.profile.output_tokens,
+            total_tokens=prompt_tokens + self.profile.output_tokens,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=0),
+        )
+        text = self._text()
+        if stream:
+            await asyncio.sleep(latency * self.profile.first_token_ratio)
+            return self._chunks(text, usage, latency)
+        await asyncio.sleep(latency)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+            usage=usage,
+        )
+
+    async def _chunks(self, text: str, usage, latency: float):
+        rest = latency * (1 - self.profile.first_token_ratio)
+        async for piece in self._pieces(text, rest):
+            delta = SimpleNamespace(content=piece)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+        yield SimpleNamespace(choices=[], usage=usage)
+
+
+class MockGeminiStream:
+    """AsyncGenerateContentResponse 대체 (스트림이 끝나면 usage_metadata 설정)"""
+
+    def __init__(self, provider: "MockGemini", text: str, usage, duration: float):
+        self.provider = provider
+        self.text = text
+        self.usage = usage
+        self.duration = duration
+        self.usage_metadata = None
+
+    async def __aiter__(self):
+        async for piece in self.provider._pieces(self.text, self.duration):
+            yield SimpleNamespace(text=piece, parts=[piece])
+        self.usage_metadata = self.usage
+
+
+class MockGemini(MockProvider):
+    """genai.GenerativeModel 대체 (generate_content_async)"""
+
+    def __init__(self, profile: ProviderProfile, seed: int = 0):
+        super().__init__("gemini", profile, seed)
+
+    async def generate_content_async(self, prompt: str, stream: bool = False, **_):
+        latency = await self._respond()
+        input_tokens = estimate_tokens(prompt)
+        usage = SimpleNamespace(
+            prompt_token_count=input_tokens,
+            candidates_token_count=self.profile.output_tokens,
+            total_token_count=input_tokens + self.profile.output_tokens,
+        )
+        text = self._text()
+        if stream:
+            await asyncio.sleep(latency * self.profile.first_token_ratio)
+            rest = latency * (1 - self.profile.first_token_ratio)
+            return MockGeminiStream(self, text, usage, rest)
+        await asyncio.sleep(latency)
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+
+class MockNotion(MockProvider):
+    """
+    notion_client.AsyncClient 대체 (메모리 Inbox/Results 데이터베이스)
+
+    Inbox 조회는 상태가 pending인 페이지만 돌려주고(델타 조회 필터는 무시하므로
+    항상 전체 조회와 같음), Inbox 상태가 completed/failed로 바뀐 시각을 기록해
+    질문별 처리 시간을 계산합니다.
+    """
+
+    FINAL_STATUSES = ("completed", "failed")
+
+    def __init__(self, profile: ProviderProfile, seed: int = 0):
+        super().__init__("notion", profile, seed)
+        self.inbox: Dict[str, Dict] = {}
+        self.arrived: Dict[str, float] = {}
+        self.finished: Dict[str, float] = {}
+        self.statuses: Dict[str, str] = {}
+        self.result_pages = 0
+        self._ids = itertools.count(1)
+
+        self.databases = SimpleNamespace(query=self._query)
+        self.pages = SimpleNamespace(create=self._create, update=self._update)
+        self.blocks = SimpleNamespace(children=SimpleNamespace(append=self._append))
+        self.users = SimpleNamespace(me=self._me)
+
+    def add_question(
+        self, text: str, priority: str = "medium", category: Optional[str] = None
+    ) -> str:
+        """Inbox에 pending 질문 추가 (도착 시각 기록)"""
+        page_id = f"question-{len(self.inbox) + 1}"
+        now = datetime.now(timezone.utc).isoformat()
+        self.inbox[page_id] = {
+            "id": page_id,
+            "created_time": now,
+            "last_edited_time": now,
+            "properties": {
+                "제목": {"title": [{"text": {"content": text}}]},
+                "상태": {"status": {"name": "pending"}},
+                "우선순위": {"select": {"name": priority}},
+                "카테고리": {"select": {"name": category} if category else None},
+            },
+        }
+        self.statuses[page_id] = "pending"
+        self.arrived[page_id] = asyncio.get_running_loop().time()
+        return page_id
+
+    async def _query(self, database_id, filter=None, sorts=None, **kwargs):
+        await asyncio.sleep(await self._respond())
+        pending = [
+            page
+            for page_id, page in self.inbox.items()
+            if self.statuses[page_id] == "pending"
+        ]
+        page_size = kwargs.get("page_size", 100)
+        start = int(kwargs.get("start_cursor") or 0)
+        has_more = start + page_size < len(pending)
+        return {
+            "results": pending[start : start + page_size],
+            "has_more": has_more,
+            "next_cursor": str(start + page_size) if has_more else None,
+        }
+
+    async def _update(self, page_id, properties=None, **kwargs):
+        await asyncio.sleep(await self._respond())
+        status = ((properties or {}).get("상태") or {}).get("status")
+        if page_id in self.inbox and status:
+            self.statuses[page_id] = status["name"]
+            self.inbox[page_id]["properties"]["상태"] = {"status": status}
+            if status["name"] in self.FINAL_STATUSES:
+                self.finished.setdefault(page_id, asyncio.get_running_loop().time())
+        return {"id": page_id}
+
+    async def _create(self, **kwargs):
+        await asyncio.sleep(await self._respond())
+        self.result_pages += 1
+        page_id = f"result-{next(self._ids)}"
+        return {"id": page_id, "url": f"https://notion.so/{page_id}"}
+
+    async def _append(self, block_id, children, **kwargs):
+        await asyncio.sleep(await self._respond())
+        return {
+            "results": [
+                {"id": f"block-{next(self._ids)}", "type": block["type"]}
+                for block in children
+            ]
+        }
+
+    async def _me(self):
+        return {"object": "user"}
@@ -0,0 +1,301 @@
+"""
+Discrete-event capacity simulation on a virtual clock
+
+benchmarks.load와 같은 경로(NotionWatcher → Orchestrator → RateLimiter, 모의
+프로바이더/Notion)를 가상 시계 이벤트 루프에서 실행합니다. 실행할 콜백이 없으면
+루프가 기다리지 않고 다음 타이머 시각으로 바로 건너뛰므로, 며칠 분량의 트래픽을
+몇 초~몇 분 안에 재현할 수 있습니다.
+
+    python -m benchmarks.simulate --hours 24 --arrival-rate 0.05 --workers 5 10 20
+    python -m benchmarks.simulate --questions 2000 --workers 10 20 \\
+        --set rate_limits.openai.max_requests=100
+
+워커 수별 처리량, 큐 길이, 프로바이더별 레이트 리밋 사용률과 포화 지점을
+출력합니다. 시간은 모두 가상 시간(초)입니다.
+
+가상 시간을 따르는 것은 이벤트 루프 시계(asyncio.sleep, wait_for 등)와
+bind_clock으로 교체하는 시계뿐입니다. 작업 원장의 쓰기 재시도 시각처럼
+time.time()을 직접 쓰는 부분은 실제 시간을 따릅니다.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import selectors
+import time
+from typing import Dict, List, Optional
+
+import yaml
+
+from benchmarks.load import deep_merge, load_profile, run_benchmark
+
+# 레이트 리밋 사용률이 이 이상이면 그 프로바이더가 포화된 것으로 판단
+SATURATION = 0.9
+
+# 레이트 리미터 평균 대기가 이 이상이어도 포화로 판단 (초, 429로 AIMD가
+# 유효 한도를 낮추면 설정 한도 대비 사용률은 낮아도 요청이 밀림)
+MAX_WAIT = 1.0
+
+# 워커를 늘려도 처리량이 이 비율 미만으로 늘면 처리량 포화로 판단
+MIN_GAIN = 0.05
+
+
+class _VirtualSelector(selectors.DefaultSelector):
+    """
+    I/O를 기다리는 대신 가상 시계를 timeout만큼 전진시키는 셀렉터
+
+    준비된 I/O가 있으면 그대로 돌려주고, 없으면 이벤트 루프가 다음 타이머까지
+    기다리려던 시간만큼 시계를 앞당깁니다.
+    """
+
+    def __init__(self, loop: "VirtualClockLoop"):
+        super().__init__()
+        self._loop = loop
+
+    def select(self, timeout: Optional[float] = None):
+        events = super().select(0)
+        if events or timeout == 0:
+            return events
+        if timeout is None:
+            # 예약된 타이머도 실행할 콜백도 없음 → 영원히 깨어나지 않음
+            raise RuntimeError("시뮬레이션 교착: 실행할 콜백과 타이머가 없습니다")
+        self._loop.advance(timeout)
+        return []
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """
+    가상 시계 이벤트 루프
+
+    time()은 가상 시각(0부터 시작)을 반환하고, 루프가 잠들어야 할 때는 실제로
+    기다리지 않고 다음 타이머 시각으로 건너뜁니다. 스레드/실제 소켓을 쓰지
+    않는 코드에서만 결과가 의미 있습니다.
+    """
+
+    def __init__(self):
+        self._now = 0.0
+        super().__init__(_VirtualSelector(self))
+
+    def time(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float):
+        """가상 시계 전진"""
+        self._now += max(0.0, seconds)
+
+
+def run_virtual(coro):
+    """코루틴을 새 가상 시계 루프에서 실행 (asyncio.run 대응)"""
+    loop = VirtualClockLoop()
+    try:
+        asyncio.set_event_loop(loop)
+        result = loop.run_until_complete(coro)
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        return result
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+def simulate(
+    profile: Dict,
+    questions: int,
+    seed: int = 0,
+    timeout: Optional[float] = None,
+    sample_interval: float = 5.0,
+) -> Dict:
+    """
+    가상 시계로 벤치마크 한 번 실행
+
+    Args:
+        profile: 벤치마크 프로필 (load_profile)
+        questions: Inbox에 넣을 질문 수
+        seed: 지연/오류/질문 분포 난수 시드
+        timeout: 가상 시간 제한 (초, 넘으면 끝난 질문까지만 보고)
+        sample_interval: 워커 사용률/큐 길이 표본 간격 (가상 초)
+
+    Returns:
+        benchmarks.load 보고서 + wall_time (실제 걸린 시간)
+    """
+    started = time.perf_counter()
+    report = run_virtual(
+        run_benchmark(
+            profile,
+            questions,
+            seed=seed,
+            timeout=timeout,
+            sample_interval=sample_interval,
+        )
+    )
+    report["wall_time"] = round(time.perf_counter() - started, 3)
+    return report
+
+
+def sweep(
+    profile: Dict,
+    questions: int,
+    workers: List[int],
+    seed: int = 0,
+    timeout: Optional[float] = None,
+    sample_interval: float = 5.0,
+) -> Dict:
+    """
+    워커 수(system.max_concurrent_tasks)별로 시뮬레이션하고 포화 지점 계산
+
+    Returns:
+        {"runs": [워커 수별 보고서], "saturation": 포화 지점}
+    """
+    runs = []
+    for count in workers:
+        override = {"config": {"system": {"max_concurrent_tasks": count}}}
+        report = simulate(
+            deep_merge(profile, override),
+            questions,
+            seed=seed,
+            timeout=timeout,
+            sample_interval=sample_interval,
+        )
+        report["workers"] = count
+        runs.append(report)
+    return {"runs": runs, "saturation": saturation_points(runs)}
+
+
+def saturation_points(runs: List[Dict]) -> Dict[str, Optional[int]]:
+    """
+    자원별로 처음 포화된 워커 수 (포화되지 않았으면 None)
+
+    - 프로바이더: 레이트 리밋 사용률이 SATURATION 이상이거나 평균 대기가
+      MAX_WAIT 이상
+    - workers: 평균 워커 사용률이 SATURATION 이상
+    - throughput: 큐가 밀려 있었는데도(평균 1개 이상) 워커를 늘려 처리량이
+      MIN_GAIN 미만으로 증가 (도착률이 처리량을 정하는 경우는 제외)
+    """
+    points: Dict[str, Optional[int]] = {"workers": None, "throughput": None}
+    for name in runs[0]["rate_limiters"] if runs else []:
+        points[name] = None
+
+    previous = None
+    for run in runs:
+        for name, stats in run["rate_limiters"].items():
+            saturated = (
+                stats["utilization"] >= SATURATION or stats["avg_wait"] >= MAX_WAIT
+            )
+            if points.get(name) is None and saturated:
+                points[name] = run["workers"]
+        if points["workers"] is None and run["worker_utilization"] >= SATURATION:
+            points["workers"] = run["workers"]
+        backlog = previous and previous["queue_depth"]["mean"] >= 1
+        if backlog and points["throughput"] is None:
+            before = previous["throughput_per_min"]
+            if before and run["throughput_per_min"] < before * (1 + MIN_GAIN):
+                points["throughput"] = run["workers"]
+        previous = run
+    return points
+
+
+def format_sweep(result: Dict) -> str:
+    """워커 수별 결과와 포화 지점을 사람이 읽을 형식으로"""
+    runs = result["runs"]
+    providers = list(runs[0]["rate_limiters"]) if runs else []
+    lines = []
+    for run in runs:
+        latency = run["latency"]
+        lines.append(
+            f"👷 워커 {run['workers']}개: {run['throughput_per_min']:.1f} 질문/분, "
+            f"완료 {run['completed']} / 실패 {run['failed']} / "
+            f"미완료 {run['unfinished']}, 가상 {run['elapsed'] / 3600:.2f}시간 "
+            f"(실제 {run['wall_time']:.1f}초)"
+        )
+        lines.append(
+            f"   ⌛ p50 {latency['p50']}초, p95 {latency['p95']}초 | 워커 사용률 "
+            f"{run['worker_utilization']:.0%} | 큐 길이 평균 "
+            f"{run['queue_depth']['mean']:.1f} / 최대 {run['queue_depth']['max']}"
+        )
+        lines.append(
+            "   🚦 "
+            + ", ".join(
+                f"{name} {stats['utilization']:.0%} (대기 평균 "
+                f"{stats['avg_wait']:.2f}초)"
+                for name, stats in run["rate_limiters"].items()
+            )
+        )
+
+    labels = {"workers": "워커", "throughput": "처리량"}
+    lines.append("🧱 포화 지점:")
+    for name in ["workers", "throughput", *providers]:
+        point = result["saturation"].get(name)
+        label = labels.get(name, name)
+        lines.append(
+            f"   {label}: 워커 {point}개부터" if point else f"   {label}: 포화 없음"
+        )
+    return "\n".join(lines)
+
+
+def _parse_override(value: str) -> Dict:
+    """--set 값(예: rate_limits.openai.max_requests=100)을 중첩 딕셔너리로"""
+    path, _, raw = value.partition("=")
+    if not raw:
+        raise argparse.ArgumentTypeError(f"KEY=VALUE 형식이 아닙니다: {value}")
+    override = yaml.safe_load(raw)
+    for key in reversed(path.split(".")):
+        override = {key: override}
+    return override
+
+
+def main():
+    """CLI 진입점"""
+    parser = argparse.ArgumentParser(description="가상 시계 용량 시뮬레이션")
+    parser.add_argument("--workers", type=int, nargs="+", default=[5, 10, 20])
+    parser.add_argument("--questions", type=int, help="질문 수")
+    parser.add_argument("--hours", type=float, help="도착률로 이만큼의 트래픽 생성")
+    parser.add_argument("--arrival-rate", type=float, help="초당 도착 질문 수")
+    parser.add_argument("--profile", help="프로필 YAML (기본: profiles/default.yaml)")
+    parser.add_argument(
+        "--set",
+        dest="overrides",
+        type=_parse_override,
+        action="append",
+        default=[],
+        help="설정 덮어쓰기 (예: rate_limits.openai.max_requests=100)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, help="가상 시간 제한 (초)")
+    parser.add_argument("--sample-interval", type=float, default=5.0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--verbose", action="store_true", help="애플리케이션 로그 출력")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+
+    profile = load_profile(args.profile)
+    for override in args.overrides:
+        profile = deep_merge(profile, {"config": override})
+    workload = profile.setdefault("workload", {})
+    if args.arrival_rate is not None:
+        workload["arrival_rate"] = args.arrival_rate
+
+    questions = args.questions
+    if questions is None:
+        if not args.hours or not workload.get("arrival_rate"):
+            parser.error("--questions 또는 --hours와 도착률(arrival_rate)이 필요합니다")
+        questions = round(workload["arrival_rate"] * args.hours * 3600)
+
+    result = sweep(
+        profile,
+        questions,
+        sorted(args.workers),
+        seed=args.seed,
+        timeout=args.timeout,
+        sample_interval=args.sample_interval,
+    )
+    print(format_sweep(result))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,5 +5,28 @@ Core orchestration components
 from .orchestrator import Orchestrator
 from .synthesis_engine import SynthesisEngine
 from .notion_watcher import NotionWatcher
+from .notion_writer import NotionWriter
+from .job_store import JobStore, JobState
+from .similarity_index import SimilarityIndex
+from .pipeline import EarlyStart, Pipeline, PipelineRegistry, PipelineStage
+from .hedging import Hedger, LatencyTracker
+from .result_stream import ResultStream
+from .scheduler import QuestionScheduler
 
-__all__ = ["Orchestrator", "SynthesisEngine", "NotionWatcher"]
+__all__ = [
+    "Orchestrator",
+    "SynthesisEngine",
+    "NotionWatcher",
+    "NotionWriter",
+    "Pipeline",
+    "EarlyStart",
+    "PipelineRegistry",
+    "PipelineStage",
+    "JobStore",
+    "JobState",
+    "SimilarityIndex",
+    "Hedger",
+    "LatencyTracker",
+    "ResultStream",
+    "QuestionScheduler",
+]
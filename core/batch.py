@@ -0,0 +1,434 @@
+"""
+Offline batch-API execution for low priority questions
+"""
+
+import asyncio
+import itertools
+import json
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class BatchError(Exception):
+    """배치 요청 실패 (배치 전체 실패/만료 또는 개별 요청 오류)"""
+
+
+def _anthropic_reply(message: Any) -> Dict[str, Any]:
+    """Anthropic 메시지 → 정규화된 응답"""
+    usage = message.usage
+    read = getattr(usage, "cache_read_input_tokens", None) or 0
+    write = getattr(usage, "cache_creation_input_tokens", None) or 0
+    return {
+        "text": message.content[0].text,
+        "input_tokens": usage.input_tokens + read + write,
+        "output_tokens": usage.output_tokens,
+        "cache_read_tokens": read,
+        "cache_write_tokens": write,
+    }
+
+
+def _openai_reply(body: Dict[str, Any]) -> Dict[str, Any]:
+    """OpenAI chat.completions 응답 본문(JSON) → 정규화된 응답"""
+    usage = body.get("usage") or {}
+    details = usage.get("prompt_tokens_details") or {}
+    return {
+        "text": body["choices"][0]["message"]["content"],
+        "input_tokens": usage.get("prompt_tokens", 0),
+        "output_tokens": usage.get("completion_tokens", 0),
+        "cache_read_tokens": details.get("cached_tokens") or 0,
+        "cache_write_tokens": 0,
+    }
+
+
+class BatchBackend(ABC):
+    """
+    프로바이더 배치 API 어댑터
+
+    submit으로 요청 묶음을 제출하고 poll로 완료 여부를 확인합니다. 결과는
+    custom_id별로 정규화된 응답({'text', 'input_tokens', 'output_tokens',
+    'cache_read_tokens', 'cache_write_tokens'}) 또는 {'error': '...'}입니다.
+    """
+
+    # rate_limiters / 에이전트 provider 키
+    provider: str = ""
+
+    @abstractmethod
+    async def submit(self, requests: Dict[str, Dict]) -> str:
+        """
+        요청 묶음 제출
+
+        Args:
+            requests: custom_id별 요청 파라미터 (실시간 API 호출 인자와 동일)
+
+        Returns:
+            배치 ID
+        """
+
+    @abstractmethod
+    async def poll(self, batch_id: str) -> Optional[Dict[str, Dict]]:
+        """완료됐으면 custom_id별 결과, 아직 처리 중이면 None"""
+
+    def available(self) -> bool:
+        """설치된 SDK 클라이언트가 배치 API를 제공하는지"""
+        return True
+
+
+class AnthropicBatchBackend(BatchBackend):
+    """Anthropic Message Batches API (messages.batches)"""
+
+    provider = "anthropic"
+
+    def __init__(self, client: Any):
+        """
+        Args:
+            client: anthropic.AsyncAnthropic 인스턴스
+        """
+        self.client = client
+
+    def available(self) -> bool:
+        # messages.batches는 anthropic>=0.41에만 있음
+        return hasattr(getattr(self.client, "messages", None), "batches")
+
+    async def submit(self, requests: Dict[str, Dict]) -> str:
+        batch = await self.client.messages.batches.create(
+            requests=[
+                {"custom_id": custom_id, "params": params}
+                for custom_id, params in requests.items()
+            ]
+        )
+        return batch.id
+
+    async def poll(self, batch_id: str) -> Optional[Dict[str, Dict]]:
+        batch = await self.client.messages.batches.retrieve(batch_id)
+        if batch.processing_status != "ended":
+            return None
+
+        results = {}
+        async for entry in await self.client.messages.batches.results(batch_id):
+            result = entry.result
+            if result.type == "succeeded":
+                results[entry.custom_id] = _anthropic_reply(result.message)
+            else:
+                error = getattr(result, "error", None)
+                results[entry.custom_id] = {"error": f"{result.type}: {error}"}
+        return results
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """OpenAI Batch API (JSONL 파일 업로드 → batches → 결과 파일)"""
+
+    provider = "openai"
+    endpoint = "/v1/chat/completions"
+
+    # 아직 끝나지 않은 배치 상태
+    RUNNING = ("validating", "in_progress", "finalizing")
+
+    def __init__(self, client: Any, completion_window: str = "24h"):
+        """
+        Args:
+            client: openai.AsyncOpenAI 인스턴스
+            completion_window: 배치 완료 기한 (현재 API는 "24h"만 지원)
+        """
+        self.client = client
+        self.completion_window = completion_window
+
+    def available(self) -> bool:
+        return hasattr(self.client, "batches") and hasattr(self.client, "files")
+
+    async def submit(self, requests: Dict[str, Dict]) -> str:
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": self.endpoint,
+                    "body": body,
+                },
+                ensure_ascii=False,
+            )
+            for custom_id, body in requests.items()
+        ]
+        upload = await self.client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=upload.id,
+            endpoint=self.endpoint,
+            completion_window=self.completion_window,
+        )
+        return batch.id
+
+    async def poll(self, batch_id: str) -> Optional[Dict[str, Dict]]:
+        batch = await self.client.batches.retrieve(batch_id)
+        if batch.status in self.RUNNING:
+            return None
+
+        results: Dict[str, Dict] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = await self.client.files.content(file_id)
+            for line in content.text.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                response = entry.get("response") or {}
+                if response.get("status_code") == 200:
+                    results[entry["custom_id"]] = _openai_reply(response["body"])
+                else:
+                    error = entry.get("error") or response.get("body")
+                    results[entry["custom_id"]] = {"error": str(error)}
+
+        if batch.status != "completed" and not results:
+            raise BatchError(f"배치 {batch_id} {batch.status}")
+        return results
+
+
+@dataclass
+class _Pending:
+    """제출 대기 중인 요청"""
+
+    custom_id: str
+    params: Dict
+    future: asyncio.Future
+
+
+@dataclass
+class _Submitted:
+    """제출되어 완료를 기다리는 배치"""
+
+    batch_id: str
+    futures: Dict[str, asyncio.Future]
+    submitted_at: float
+    polls: int = 0
+
+
+class BatchRunner:
+    """
+    LOW 질문의 에이전트 호출을 프로바이더 배치 API로 처리
+
+    call()로 들어온 요청을 프로바이더별로 collect_window초 동안(또는
+    max_batch_size개가 모일 때까지) 모아 한 배치로 제출하고, poll_interval초마다
+    완료를 확인해 각 호출자에게 결과를 돌려줍니다. 배치 호출은 실시간 레이트
+    리미터를 거치지 않으므로 실시간 한도는 급한 질문에 남고, 비용은 price_factor
+    (배치 할인, 기본 0.5)를 곱해 기록합니다.
+
+    백엔드는 BatchBackend 구현을 주입하므로 테스트에서는 로컬 가짜 배치 서버를
+    쓸 수 있습니다. 제출한 배치 ID는 메모리에만 있으므로 재시작하면 끝나지 않은
+    단계는 작업 원장 복구 과정에서 다시 제출됩니다.
+
+    config.yaml 형식 (batch):
+        enabled: true
+        priorities: [low]
+        collect_window: 30
+        max_batch_size: 100
+        poll_interval: 60
+        price_factor: 0.5
+    """
+
+    def __init__(
+        self,
+        backends: Dict[str, BatchBackend],
+        priorities: Optional[List[str]] = None,
+        collect_window: float = 30.0,
+        max_batch_size: int = 100,
+        poll_interval: float = 60.0,
+        price_factor: float = 0.5,
+        max_offloaded: int = 100,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            backends: provider별 배치 백엔드 (없는 provider는 실시간 호출)
+            priorities: 배치로 처리할 질문 우선순위 (기본 low)
+            collect_window: 첫 요청 후 배치 제출까지 더 모으는 시간 (초)
+            max_batch_size: 배치 하나의 최대 요청 수 (차면 바로 제출)
+            poll_interval: 완료 확인 간격 (초)
+            price_factor: 배치 요청 비용 배율 (실시간 가격 대비)
+            max_offloaded: 워커 슬롯 없이 동시에 기다릴 수 있는 배치 질문 수
+            sleep: 대기 함수 (테스트용)
+            clock: 시계 함수 (테스트용)
+        """
+        self.backends = backends
+        self.priorities = set(priorities or ["low"])
+        self.collect_window = collect_window
+        self.max_batch_size = max_batch_size
+        self.poll_interval = poll_interval
+        self.price_factor = price_factor
+        self.max_offloaded = max_offloaded
+        self.sleep = sleep
+        self.clock = clock
+
+        self._pending: Dict[str, List[_Pending]] = {p: [] for p in backends}
+        self._flush_tasks: Dict[str, asyncio.Task] = {}
+        self._poll_tasks: List[asyncio.Task] = []
+        self._ids = itertools.count(1)
+
+        self._stats = {"requests": 0, "batches": 0, "completed": 0, "failed": 0}
+        self._turnaround: List[float] = []
+
+    @classmethod
+    def from_config(
+        cls, config: Optional[Dict], backends: Dict[str, BatchBackend]
+    ) -> Optional["BatchRunner"]:
+        """batch 설정으로 생성 (비활성화면 None)"""
+        config = config or {}
+        if not config.get("enabled", False):
+            return None
+        return cls(
+            backends,
+            priorities=config.get("priorities"),
+            collect_window=config.get("collect_window", 30.0),
+            max_batch_size=config.get("max_batch_size", 100),
+            poll_interval=config.get("poll_interval", 60.0),
+            price_factor=config.get("price_factor", 0.5),
+            max_offloaded=config.get("max_offloaded", 100),
+        )
+
+    def applies(self, priority: Optional[str]) -> bool:
+        """이 우선순위 질문을 배치로 처리할지"""
+        return (priority or "medium") in self.priorities
+
+    def supports(self, provider: str) -> bool:
+        """provider에 쓸 수 있는 배치 백엔드가 있는지 (없으면 실시간 호출)"""
+        backend = self.backends.get(provider)
+        return backend is not None and backend.available()
+
+    async def call(self, provider: str, params: Dict) -> Dict[str, Any]:
+        """
+        요청 하나를 배치로 처리하고 결과를 기다림
+
+        Args:
+            provider: 배치 백엔드 키
+            params: 실시간 API 호출 인자 (timeout 등 SDK 전용 인자는 제외됨)
+
+        Returns:
+            정규화된 응답 ({'text', 'input_tokens', 'output_tokens', ...})
+
+        Raises:
+            BatchError: 배치 또는 개별 요청 실패
+        """
+        params = {k: v for k, v in params.items() if k not in ("timeout", "stream")}
+        pending = _Pending(
+            f"{provider}-{next(self._ids)}",
+            params,
+            asyncio.get_running_loop().create_future(),
+        )
+        queue = self._pending[provider]
+        queue.append(pending)
+        self._stats["requests"] += 1
+
+        if len(queue) >= self.max_batch_size:
+            self._cancel_flush(provider)
+            await self._flush(provider)
+        elif provider not in self._flush_tasks:
+            self._flush_tasks[provider] = asyncio.create_task(
+                self._flush_later(provider)
+            )
+
+        return await pending.future
+
+    def stats(self) -> Dict[str, Any]:
+        """배치 처리 현황"""
+        turnaround = sorted(self._turnaround)
+        return {
+            **self._stats,
+            "pending": sum(len(q) for q in self._pending.values()),
+            "in_progress": sum(1 for t in self._poll_tasks if not t.done()),
+            "median_turnaround": (
+                turnaround[len(turnaround) // 2] if turnaround else None
+            ),
+        }
+
+    async def close(self):
+        """제출 대기/완료 대기 작업 취소 (호출자는 CancelledError를 받음)"""
+        for provider in list(self._flush_tasks):
+            self._cancel_flush(provider)
+        for task in self._poll_tasks:
+            task.cancel()
+        for queue in self._pending.values():
+            for pending in queue:
+                pending.future.cancel()
+            queue.clear()
+        await asyncio.gather(*self._poll_tasks, return_exceptions=True)
+
+    def _cancel_flush(self, provider: str):
+        task = self._flush_tasks.pop(provider, None)
+        if task and task is not asyncio.current_task():
+            task.cancel()
+
+    async def _flush_later(self, provider: str):
+        """collect_window 뒤에 모인 요청 제출"""
+        await self.sleep(self.collect_window)
+        self._flush_tasks.pop(provider, None)
+        await self._flush(provider)
+
+    async def _flush(self, provider: str):
+        """모인 요청을 배치 하나로 제출하고 완료 확인 작업 시작"""
+        queue = self._pending[provider]
+        batch, queue[:] = queue[: self.max_batch_size], queue[self.max_batch_size :]
+        if not batch:
+            return
+
+        try:
+            batch_id = await self.backends[provider].submit(
+                {p.custom_id: p.params for p in batch}
+            )
+        except Exception as e:
+            logger.error(f"📦 {provider} 배치 제출 실패: {e}")
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(BatchError(f"배치 제출 실패: {e}"))
+            self._stats["failed"] += len(batch)
+            return
+
+        self._stats["batches"] += 1
+        logger.info(f"📦 {provider} 배치 제출: {batch_id} ({len(batch)}건)")
+        submitted = _Submitted(
+            batch_id, {p.custom_id: p.future for p in batch}, self.clock()
+        )
+        self._poll_tasks = [t for t in self._poll_tasks if not t.done()]
+        self._poll_tasks.append(asyncio.create_task(self._poll(provider, submitted)))
+
+    async def _poll(self, provider: str, submitted: _Submitted):
+        """완료될 때까지 주기적으로 확인하고 결과 전달"""
+        backend = self.backends[provider]
+        while True:
+            await self.sleep(self.poll_interval)
+            submitted.polls += 1
+            try:
+                results = await backend.poll(submitted.batch_id)
+            except BatchError as e:
+                logger.error(f"📦 {provider} 배치 {submitted.batch_id} 실패: {e}")
+                results = {}
+            except Exception as e:
+                # 일시적인 조회 오류는 다음 주기에 다시 확인
+                logger.warning(f"📦 {provider} 배치 상태 조회 실패: {e}")
+                continue
+            if results is not None:
+                break
+
+        elapsed = self.clock() - submitted.submitted_at
+        self._turnaround.append(elapsed)
+        logger.info(
+            f"📦 {provider} 배치 완료: {submitted.batch_id} "
+            f"({elapsed:.0f}초, 확인 {submitted.polls}회)"
+        )
+        for custom_id, future in submitted.futures.items():
+            if future.done():
+                continue
+            result = results.get(custom_id)
+            if result is None or "error" in result:
+                error = result["error"] if result else "결과 없음"
+                future.set_exception(BatchError(error))
+                self._stats["failed"] += 1
+            else:
+                future.set_result(result)
+                self._stats["completed"] += 1
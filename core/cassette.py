@@ -0,0 +1,424 @@
+"""
+Record/replay cassettes of provider and Notion traffic
+"""
+
+import asyncio
+import hashlib
+import json
+from collections import defaultdict, deque
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 프로바이더별로 녹화/재생하는 클라이언트 메서드 (점으로 이은 속성 경로)
+RECORDED_METHODS: Dict[str, Tuple[str, ...]] = {
+    "anthropic": ("messages.create",),
+    "openai": ("chat.completions.create",),
+    "gemini": ("generate_content_async",),
+    "notion": (
+        "databases.query",
+        "pages.create",
+        "pages.update",
+        "blocks.children.append",
+        "users.me",
+    ),
+}
+
+# 요청 일치 판정에서 제외할 인자 (호출마다 달라지는 SDK 옵션)
+VOLATILE_ARGS = ("timeout", "request_options", "stream_options")
+
+# 오류 기록에 남길 응답 헤더 (속도 제한 동작 재현용)
+ERROR_HEADER_PREFIXES = ("retry-after", "x-ratelimit", "anthropic-ratelimit")
+
+
+class CassetteMissError(LookupError):
+    """재생할 녹화가 없는 호출"""
+
+
+class ReplayedAPIError(Exception):
+    """
+    녹화된 API 오류 재생
+
+    원래 예외의 status_code/code와 속도 제한 헤더를 그대로 갖고 있어
+    레이트 리미터와 서킷 브레이커가 녹화 때와 같이 반응합니다.
+    """
+
+    def __init__(self, error: Dict[str, Any]):
+        super().__init__(f"{error.get('type')}: {error.get('message')}")
+        self.status_code = error.get("status_code")
+        self.code = error.get("code")
+        self.headers = error.get("headers") or {}
+        self.response = SimpleNamespace(headers=self.headers)
+
+
+def _jsonable(value: Any) -> Any:
+    """SDK 응답 객체 → JSON 호환 값"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if hasattr(value, "model_dump"):  # anthropic/openai (pydantic)
+        return value.model_dump(mode="json")
+    if hasattr(value, "__dict__"):
+        return {
+            k: _jsonable(v) for k, v in vars(value).items() if not k.startswith("_")
+        }
+    return str(value)
+
+
+def _namespace(value: Any) -> Any:
+    """JSON 값 → 속성 접근 객체 (SDK 응답 흉내)"""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{k: _namespace(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [_namespace(v) for v in value]
+    return value
+
+
+def _gemini_usage(usage: Any) -> Optional[Dict[str, Any]]:
+    if usage is None:
+        return None
+    return {
+        key: getattr(usage, key, None)
+        for key in ("prompt_token_count", "candidates_token_count", "total_token_count")
+    }
+
+
+def _dump(provider: str, value: Any) -> Any:
+    """응답(또는 스트림 조각) 기록 형식"""
+    if provider == "gemini":
+        # GenerateContentResponse.text는 조각에 내용이 없으면 예외를 던지는 속성
+        text = value.text if getattr(value, "parts", True) else ""
+        return {
+            "text": text,
+            "usage_metadata": _gemini_usage(getattr(value, "usage_metadata", None)),
+        }
+    return _jsonable(value)
+
+
+def _load(provider: str, data: Any) -> Any:
+    """기록 형식 → 코드가 기대하는 응답 객체 (Notion은 dict 그대로)"""
+    if provider == "notion":
+        return data
+    if provider == "gemini":
+        return SimpleNamespace(
+            text=data["text"],
+            parts=[data["text"]] if data["text"] else [],
+            usage_metadata=_namespace(data.get("usage_metadata")),
+        )
+    return _namespace(data)
+
+
+def _dump_error(error: BaseException) -> Dict[str, Any]:
+    # notion_client.APIResponseError는 headers, openai/anthropic은 response.headers
+    headers = getattr(error, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+    headers = headers or {}
+    return {
+        "type": type(error).__name__,
+        "message": str(error),
+        "status_code": getattr(error, "status_code", None)
+        or getattr(error, "status", None),
+        "code": _jsonable(getattr(error, "code", None)),
+        "headers": {
+            key: value
+            for key, value in dict(headers).items()
+            if key.lower().startswith(ERROR_HEADER_PREFIXES)
+        },
+    }
+
+
+def request_key(args: tuple, kwargs: Dict[str, Any]) -> str:
+    """요청 일치 판정용 해시 (SDK 옵션 제외)"""
+    request = {
+        "args": _jsonable(list(args)),
+        "kwargs": {
+            k: _jsonable(v) for k, v in kwargs.items() if k not in VOLATILE_ARGS
+        },
+    }
+    encoded = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+class _RecordingStream:
+    """스트리밍 응답을 그대로 넘기면서 조각과 도착 시각을 기록"""
+
+    def __init__(self, cassette: "Cassette", entry: Dict, stream: Any, start: float):
+        self._cassette = cassette
+        self._entry = entry
+        self._stream = stream
+        self._start = start
+
+    def __getattr__(self, name: str):
+        # Gemini: 스트림이 끝난 뒤 usage_metadata 조회
+        return getattr(self._stream, name)
+
+    async def __aiter__(self):
+        loop = asyncio.get_running_loop()
+        provider = self._entry["provider"]
+        events = []
+        try:
+            async for event in self._stream:
+                events.append(
+                    {
+                        "offset": round(loop.time() - self._start, 4),
+                        "data": _dump(provider, event),
+                    }
+                )
+                yield event
+        except Exception as e:
+            self._entry["error"] = _dump_error(e)
+            raise
+        finally:
+            self._entry["events"] = events
+            if provider == "gemini":
+                self._entry["usage_metadata"] = _gemini_usage(
+                    getattr(self._stream, "usage_metadata", None)
+                )
+            self._cassette._write(self._entry)
+
+
+class _ReplayStream:
+    """녹화된 스트림 조각을 녹화 간격(×timing)으로 내보냄"""
+
+    def __init__(self, provider: str, entry: Dict, timing: float):
+        self.provider = provider
+        self.entry = entry
+        self.timing = timing
+        self.usage_metadata = None
+
+    async def __aiter__(self):
+        previous = self.entry["duration"]
+        for event in self.entry.get("events", []):
+            await asyncio.sleep(max(0.0, event["offset"] - previous) * self.timing)
+            previous = event["offset"]
+            yield _load(self.provider, event["data"])
+        if self.entry.get("error"):
+            raise ReplayedAPIError(self.entry["error"])
+        self.usage_metadata = _namespace(self.entry.get("usage_metadata"))
+
+
+class _ClientProxy:
+    """클라이언트 속성 경로를 따라가며 녹화 대상 메서드만 가로챔"""
+
+    def __init__(self, cassette: "Cassette", provider: str, target: Any, path: str):
+        self._cassette = cassette
+        self._provider = provider
+        self._target = target
+        self._path = path
+
+    def __getattr__(self, name: str):
+        value = getattr(self._target, name)
+        path = f"{self._path}.{name}" if self._path else name
+        methods = RECORDED_METHODS[self._provider]
+        if path in methods:
+            return self._cassette._intercept(self._provider, path, value)
+        if any(method.startswith(path + ".") for method in methods):
+            return _ClientProxy(self._cassette, self._provider, value, path)
+        return value
+
+
+class Cassette:
+    """
+    에이전트/통합/Notion 클라이언트 트래픽 녹화와 재생
+
+    record 모드는 SDK 클라이언트를 감싸 RECORDED_METHODS 호출의 요청, 응답
+    (스트리밍이면 조각과 도착 시각), 오류, 소요 시간을 JSONL 한 줄씩 기록합니다.
+    replay 모드는 실제 API를 호출하지 않고 같은 코드 경로에 녹화된 응답을
+    돌려줍니다. 요청이 정확히 같은 녹화가 있으면 그것을, 없으면(프롬프트를
+    바꾼 경우 등) 같은 메서드의 녹화를 순서대로 돌려가며 쓰므로, 실제 응답
+    크기와 지연 분포로 프롬프트/스케줄링/캐시 변경을 비교할 수 있습니다.
+    녹화된 지연은 timing배로 재생합니다 (0이면 즉시).
+
+    배치 API 호출은 녹화하지 않습니다.
+
+    config.yaml 형식 (cassette):
+        mode: record  # off | record | replay
+        path: data/cassette.jsonl
+        providers: [anthropic, openai, gemini, notion]
+        timing: 1.0
+    """
+
+    MODES = ("record", "replay")
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "replay",
+        providers: Optional[List[str]] = None,
+        timing: float = 1.0,
+    ):
+        """
+        Args:
+            path: 카세트 파일 경로 (JSONL)
+            mode: record 또는 replay
+            providers: 녹화/재생할 프로바이더 (기본: 전체)
+            timing: 재생 지연 배율 (1.0이면 녹화 그대로)
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"알 수 없는 카세트 모드: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.providers = set(providers or RECORDED_METHODS)
+        self.timing = timing
+
+        self._file = None
+        self._recorded = 0
+        self._by_method: Dict[Tuple[str, str], List[Dict]] = defaultdict(list)
+        self._by_request: Dict[Tuple[str, str, str], Deque[Dict]] = defaultdict(deque)
+        self._cursor: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._stats = {"exact": 0, "sequential": 0, "missing": 0}
+
+        if mode == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        else:
+            self._read()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> Optional["Cassette"]:
+        """cassette 설정으로 생성 (mode가 off거나 없으면 None)"""
+        config = config or {}
+        mode = config.get("mode")
+        if not mode or mode == "off":
+            return None
+        return cls(
+            path=config.get("path", "data/cassette.jsonl"),
+            mode=mode,
+            providers=config.get("providers"),
+            timing=config.get("timing", 1.0),
+        )
+
+    def wrap(self, client: Any, provider: str) -> Any:
+        """클라이언트를 녹화/재생 프록시로 감쌈 (대상이 아닌 프로바이더는 그대로)"""
+        if provider not in self.providers or isinstance(client, _ClientProxy):
+            return client
+        return _ClientProxy(self, provider, client, "")
+
+    def install(self, orchestrator, notion_client=None):
+        """
+        오케스트레이터의 모든 에이전트/통합 클라이언트와 Notion 클라이언트를 감쌈
+
+        Args:
+            orchestrator: Orchestrator 인스턴스
+            notion_client: NotionClient 인스턴스 (있으면 Notion API도 대상)
+        """
+        for agent in orchestrator.all_agents():
+            if agent.provider == "gemini":
+                agent.model = self.wrap(agent.model, "gemini")
+            else:
+                agent.client = self.wrap(agent.client, agent.provider)
+        orchestrator.synthesis.client = self.wrap(
+            orchestrator.synthesis.client, "anthropic"
+        )
+        if notion_client is not None:
+            notion_client.client = self.wrap(notion_client.client, "notion")
+        logger.info(
+            f"📼 카세트 {self.mode}: {self.path} "
+            f"({', '.join(sorted(self.providers))})"
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """녹화 건수 / 재생 일치 현황"""
+        return {"recorded": self._recorded, **self._stats}
+
+    def close(self):
+        """녹화 파일 닫기"""
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _read(self):
+        """카세트 파일 로드"""
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                method = (entry["provider"], entry["method"])
+                self._by_method[method].append(entry)
+                self._by_request[(*method, entry["request_key"])].append(entry)
+        logger.info(
+            f"📼 카세트 로드: {sum(len(e) for e in self._by_method.values())}건"
+        )
+
+    def _write(self, entry: Dict):
+        if self._file:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+            self._recorded += 1
+
+    def _intercept(self, provider: str, path: str, method: Any):
+        """녹화 대상 메서드 대체 함수"""
+
+        async def call(*args, **kwargs):
+            if self.mode == "record":
+                return await self._record(provider, path, method, args, kwargs)
+            return await self._replay(provider, path, args, kwargs)
+
+        return call
+
+    async def _record(
+        self, provider: str, path: str, method: Any, args: tuple, kwargs: Dict
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        entry = {
+            "provider": provider,
+            "method": path,
+            "request_key": request_key(args, kwargs),
+            "request": {
+                "args": _jsonable(list(args)),
+                "kwargs": {
+                    k: _jsonable(v) for k, v in kwargs.items() if k not in VOLATILE_ARGS
+                },
+            },
+            "stream": bool(kwargs.get("stream")),
+        }
+        try:
+            response = await method(*args, **kwargs)
+        except Exception as e:
+            entry["duration"] = round(loop.time() - start, 4)
+            entry["error"] = _dump_error(e)
+            self._write(entry)
+            raise
+
+        entry["duration"] = round(loop.time() - start, 4)
+        if entry["stream"]:
+            # 조각을 모두 받은 뒤 기록
+            return _RecordingStream(self, entry, response, start)
+        entry["response"] = _dump(provider, response)
+        self._write(entry)
+        return response
+
+    async def _replay(self, provider: str, path: str, args: tuple, kwargs: Dict):
+        entry = self._match(provider, path, request_key(args, kwargs))
+        await asyncio.sleep(entry["duration"] * self.timing)
+        if entry.get("stream") and "events" in entry:
+            return _ReplayStream(provider, entry, self.timing)
+        if entry.get("error"):
+            raise ReplayedAPIError(entry["error"])
+        return _load(provider, entry["response"])
+
+    def _match(self, provider: str, path: str, key: str) -> Dict:
+        """요청이 같은 녹화 우선, 없으면 같은 메서드의 녹화를 순서대로"""
+        exact = self._by_request.get((provider, path, key))
+        if exact:
+            self._stats["exact"] += 1
+            return exact.popleft()
+
+        entries = self._by_method.get((provider, path))
+        if not entries:
+            self._stats["missing"] += 1
+            raise CassetteMissError(f"카세트에 {provider} {path} 녹화 없음")
+        self._stats["sequential"] += 1
+        index = self._cursor[(provider, path)]
+        self._cursor[(provider, path)] = index + 1
+        return entries[index % len(entries)]
@@ -0,0 +1,292 @@
+"""
+Token-budgeted packing of upstream results for downstream prompts
+"""
+
+import math
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils.logger import get_logger
+from utils.rate_limiter import estimate_tokens
+
+logger = get_logger(__name__)
+
+_MD_LINK = re.compile(r"\[([^\]\n]+)\]\((https?://[^)\s]+)\)")
+_BARE_URL = re.compile(r"https?://[^\s)>\]]+")
+_HEADING = re.compile(r"^\s*#{1,6}\s")
+_FENCE = re.compile(r"^\s*```")
+_TERM = re.compile(r"\w{2,}")
+_NOISE = re.compile(r"[\W_]+")
+# URL 참고 번호 (모델 출력의 [n] 인용 표시와 겹치지 않는 괄호)
+_REF = re.compile(r"⟨(\d+)⟩")
+
+# 중복 판정에서 제외할 짧은 문단 길이 (정규화 후 글자 수)
+MIN_DEDUPE_LENGTH = 20
+
+
+def _terms(text: str) -> Set[str]:
+    """비교용 단어 집합 (2자 이상, 소문자)"""
+    return {t.lower() for t in _TERM.findall(text)}
+
+
+def _normalize(block: str) -> str:
+    """중복 판정용 정규화 (기호/공백 제거, 소문자)"""
+    return _NOISE.sub("", block).lower()
+
+
+def _split_blocks(text: str) -> List[str]:
+    """
+    빈 줄 기준 문단 분할 (코드 블록은 통째로, 제목 줄은 따로)
+    """
+    blocks: List[str] = []
+    current: List[str] = []
+    in_code = False
+
+    def flush():
+        if current:
+            blocks.append("\n".join(current))
+            current.clear()
+
+    for line in text.splitlines():
+        if _FENCE.match(line):
+            in_code = not in_code
+            current.append(line)
+            continue
+        if in_code:
+            current.append(line)
+        elif not line.strip():
+            flush()
+        elif _HEADING.match(line):
+            flush()
+            blocks.append(line)
+        else:
+            current.append(line)
+    flush()
+    return blocks
+
+
+class ContextPacker:
+    """
+    다운스트림 프롬프트에 넣을 업스트림 결과 압축
+
+    단계마다 토큰 예산(budgets, 없으면 default_budget)을 두고 다음 순서로
+    줄입니다.
+
+    1. URL을 ⟨n⟩ 표시로 바꾸고 결과 끝에 참고 링크 목록으로 한 번만 남김
+    2. 앞선 결과(같은 프롬프트에 들어가는 다른 업스트림 포함)와 같은 문단 제거
+    3. 그래도 예산을 넘으면 입력마다 예산을 나눠, 질문과 겹치는 단어가 많은
+       문단, 섹션 첫 문단, 수치가 있는 문단을 우선해 원래 순서대로 남김
+       (남긴 문단이 속한 제목은 유지)
+
+    pack의 통계(원래/압축 토큰 수, 제거한 문단 수, 원문 단어 보존율)는
+    응답 metadata에 남아 절감량과 품질 손실을 비교할 수 있습니다.
+
+    config.yaml 형식 (context_packing):
+        enabled: true
+        default_budget: 4000
+        budgets:
+          synthesis: 6000
+        strip_urls: true
+    """
+
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, int]] = None,
+        default_budget: Optional[int] = None,
+        strip_urls: bool = True,
+    ):
+        """
+        Args:
+            budgets: 단계 이름별 업스트림 결과 전체 토큰 예산
+            default_budget: budgets에 없는 단계의 예산 (None이면 중복/URL만 정리)
+            strip_urls: URL을 참고 링크 목록으로 분리할지 여부
+        """
+        self.budgets = dict(budgets or {})
+        self.default_budget = default_budget
+        self.strip_urls = strip_urls
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> Optional["ContextPacker"]:
+        """context_packing 설정으로 생성 (비활성화면 None)"""
+        config = config or {}
+        if not config.get("enabled", False):
+            return None
+        return cls(
+            budgets=config.get("budgets"),
+            default_budget=config.get("default_budget"),
+            strip_urls=config.get("strip_urls", True),
+        )
+
+    def budget(self, stage: str) -> Optional[int]:
+        """단계의 토큰 예산"""
+        return self.budgets.get(stage, self.default_budget)
+
+    def pack(
+        self, inputs: Dict[str, str], budget: Optional[int], question: str = ""
+    ) -> Tuple[Dict[str, str], Dict]:
+        """
+        업스트림 결과 압축
+
+        Args:
+            inputs: 이름별 업스트림 결과 (프롬프트에 들어가는 순서)
+            budget: 전체 토큰 예산 (None이면 중복/URL 정리만)
+            question: 사용자 질문 (문단 선택 점수에 사용)
+
+        Returns:
+            (이름별 압축 결과, 통계)
+        """
+        original_tokens = sum(estimate_tokens(text) for text in inputs.values())
+        original_terms = set().union(*(_terms(t) for t in inputs.values()))
+
+        # 1. URL → ⟨n⟩
+        urls: Dict[str, int] = {}
+        bodies = {
+            name: self._strip_urls(text, urls) if self.strip_urls else text
+            for name, text in inputs.items()
+        }
+
+        # 2. 입력 전체에서 같은 문단 제거
+        seen: Set[str] = set()
+        blocks: Dict[str, List[str]] = {}
+        duplicates = 0
+        for name, text in bodies.items():
+            blocks[name] = []
+            for block in _split_blocks(text):
+                key = _normalize(block)
+                if len(key) >= MIN_DEDUPE_LENGTH and not _HEADING.match(block):
+                    if key in seen:
+                        duplicates += 1
+                        continue
+                    seen.add(key)
+                blocks[name].append(block)
+
+        # 3. 예산을 넘으면 입력별로 나눠 문단 선택
+        dropped = 0
+        if budget is not None:
+            reference_tokens = sum(
+                estimate_tokens(f"⟨{n}⟩ {u}") for u, n in urls.items()
+            )
+            shares = self._shares(
+                {n: sum(estimate_tokens(b) for b in bs) for n, bs in blocks.items()},
+                max(0, budget - reference_tokens),
+            )
+            keywords = _terms(question)
+            for name, share in shares.items():
+                kept = self._select(blocks[name], share, keywords)
+                dropped += len(blocks[name]) - len(kept)
+                blocks[name] = kept
+
+        if urls or duplicates or dropped:
+            packed = self._render(blocks, urls)
+        else:
+            packed = dict(inputs)  # 줄일 것이 없으면 원문 그대로
+        packed_tokens = sum(estimate_tokens(text) for text in packed.values())
+        packed_terms = set().union(*(_terms(t) for t in packed.values()))
+        stats = {
+            "original_tokens": original_tokens,
+            "packed_tokens": packed_tokens,
+            "saved_tokens": max(0, original_tokens - packed_tokens),
+            "budget": budget,
+            "duplicates": duplicates,
+            "dropped_blocks": dropped,
+            "urls": len(urls),
+            # 원문 단어 중 압축본에 남은 비율 (품질 손실 대리 지표)
+            "term_recall": (
+                round(len(packed_terms & original_terms) / len(original_terms), 3)
+                if original_terms
+                else 1.0
+            ),
+        }
+        if stats["saved_tokens"]:
+            logger.info(
+                f"🗜️  컨텍스트 압축: {original_tokens} → {packed_tokens} 토큰 "
+                f"(중복 {duplicates}, 생략 {dropped}, 단어 보존 {stats['term_recall']:.0%})"
+            )
+        return packed, stats
+
+    @staticmethod
+    def _strip_urls(text: str, urls: Dict[str, int]) -> str:
+        """URL을 ⟨n⟩으로 교체 (같은 URL은 같은 번호)"""
+
+        def number(url: str) -> int:
+            return urls.setdefault(url, len(urls) + 1)
+
+        text = _MD_LINK.sub(lambda m: f"{m.group(1)} ⟨{number(m.group(2))}⟩", text)
+
+        def bare(match: re.Match) -> str:
+            url = match.group(0).rstrip(".,;:")
+            return f"⟨{number(url)}⟩" + match.group(0)[len(url) :]
+
+        return _BARE_URL.sub(bare, text)
+
+    @staticmethod
+    def _shares(sizes: Dict[str, int], budget: int) -> Dict[str, int]:
+        """예산 분배 (작은 입력은 전부, 남는 예산은 큰 입력들에 균등)"""
+        shares: Dict[str, int] = {}
+        remaining = budget
+        pending = sorted(sizes, key=sizes.get)
+        while pending:
+            name = pending.pop(0)
+            share = remaining // (len(pending) + 1)
+            shares[name] = min(sizes[name], share)
+            remaining -= shares[name]
+        return shares
+
+    @staticmethod
+    def _select(blocks: List[str], budget: int, keywords: Set[str]) -> List[str]:
+        """예산 안에서 점수 높은 문단을 골라 원래 순서로 반환"""
+        if sum(estimate_tokens(b) for b in blocks) <= budget:
+            return blocks
+
+        # 문단별 소속 제목과 점수
+        heading_of: Dict[int, Optional[int]] = {}
+        scores: Dict[int, float] = {}
+        heading = None
+        first_in_section = True
+        for i, block in enumerate(blocks):
+            if _HEADING.match(block):
+                heading, first_in_section = i, True
+                continue
+            heading_of[i] = heading
+            terms = _terms(block)
+            score = len(terms & keywords) / math.sqrt(max(1, len(terms)))
+            if first_in_section:
+                score += 0.5
+            if re.search(r"\d", block):
+                score += 0.3
+            scores[i] = score + 0.5 / (1 + i)
+            first_in_section = False
+
+        kept: Set[int] = set()
+        used = 0
+        for i in sorted(scores, key=lambda i: (-scores[i], i)):
+            cost = estimate_tokens(blocks[i])
+            h = heading_of[i]
+            if h is not None and h not in kept:
+                cost += estimate_tokens(blocks[h])
+            if used + cost > budget:
+                continue
+            kept.add(i)
+            if h is not None:
+                kept.add(h)
+            used += cost
+
+        return [block for i, block in enumerate(blocks) if i in kept]
+
+    @staticmethod
+    def _render(blocks: Dict[str, List[str]], urls: Dict[str, int]) -> Dict[str, str]:
+        """문단을 합치고 입력마다 처음 나온 참고 링크 목록을 붙임"""
+        listed: Set[int] = set()
+        by_number = {n: u for u, n in urls.items()}
+        packed = {}
+        for name, kept in blocks.items():
+            text = "\n\n".join(kept)
+            refs = []
+            for n in sorted({int(m) for m in _REF.findall(text)}):
+                if n in by_number and n not in listed:
+                    listed.add(n)
+                    refs.append(f"⟨{n}⟩ {by_number[n]}")
+            if refs:
+                text += "\n\n참고 링크:\n" + "\n".join(refs)
+            packed[name] = text
+        return packed
@@ -0,0 +1,187 @@
+"""
+Hedged agent requests for cutting tail latency
+"""
+
+import asyncio
+import math
+from collections import deque
+from typing import Dict, Optional
+
+from agents.base import AIAgent
+from models.agent_response import AgentResponse
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LatencyTracker:
+    """최근 호출 지연 시간 기록 (슬라이딩 윈도우 백분위수)"""
+
+    def __init__(self, window: int = 200):
+        """
+        Args:
+            window: 보관할 최근 샘플 수
+        """
+        self.samples: deque = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def record(self, seconds: float):
+        """지연 시간 추가"""
+        self.samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """p 백분위수 (샘플이 없으면 None)"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = max(0, math.ceil(p / 100 * len(ordered)) - 1)
+        return ordered[index]
+
+
+class Hedger:
+    """
+    에이전트 헤지 요청
+
+    호출이 최근 지연 시간의 percentile 백분위수 안에 끝나지 않으면 같은 요청을
+    (fallback_model이 있으면 해당 모델로) 한 번 더 보내고, 먼저 성공한 응답을
+    사용하며 나머지는 취소합니다. 헤지 호출도 에이전트 내부에서 프로바이더
+    레이트 리미터를 거치고, 헤지 비율은 max_hedge_rate로 제한됩니다.
+
+    config.yaml 형식 (agents.<이름>.hedge):
+        enabled: true
+        percentile: 90
+        min_samples: 20
+        max_hedge_rate: 0.1
+        fallback_model: gpt-4o-mini  # 생략하면 같은 모델
+    """
+
+    def __init__(
+        self,
+        agent: AIAgent,
+        percentile: float = 90,
+        min_samples: int = 20,
+        max_hedge_rate: float = 0.1,
+        fallback_agent: Optional[AIAgent] = None,
+        window: int = 200,
+    ):
+        """
+        Args:
+            agent: 기본 에이전트
+            percentile: 헤지 발사 기준 백분위수
+            min_samples: 헤지를 시작하기 전 필요한 최소 샘플 수
+            max_hedge_rate: 전체 호출 대비 최대 헤지 비율
+            fallback_agent: 헤지 요청을 보낼 에이전트 (None이면 기본 에이전트)
+            window: 지연 시간 샘플 윈도우 크기
+        """
+        self.agent = agent
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_hedge_rate = max_hedge_rate
+        self.fallback_agent = fallback_agent or agent
+        self.latency = LatencyTracker(window)
+
+        # 통계
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    @classmethod
+    def from_agent(cls, agent: AIAgent) -> Optional["Hedger"]:
+        """에이전트 설정의 hedge 섹션에서 생성 (비활성화면 None)"""
+        config = agent.config.get("hedge") or {}
+        if not config.get("enabled", False):
+            return None
+
+        fallback_agent = None
+        fallback_model = config.get("fallback_model")
+        if fallback_model:
+            fallback_agent = type(agent)(
+                agent.api_key, {**agent.config, "model": fallback_model}
+            )
+
+        return cls(
+            agent,
+            percentile=config.get("percentile", 90),
+            min_samples=config.get("min_samples", 20),
+            max_hedge_rate=config.get("max_hedge_rate", 0.1),
+            fallback_agent=fallback_agent,
+            window=config.get("window", 200),
+        )
+
+    def hedge_delay(self) -> Optional[float]:
+        """헤지 발사까지 기다릴 시간 (샘플이 부족하면 None)"""
+        if len(self.latency) < self.min_samples:
+            return None
+        return self.latency.percentile(self.percentile)
+
+    def stats(self) -> Dict[str, float]:
+        """헤지 통계"""
+        return {
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "delay": self.hedge_delay(),
+        }
+
+    async def query(self, question: str, context: Optional[Dict]) -> AgentResponse:
+        """헤지를 적용한 에이전트 호출"""
+        loop = asyncio.get_running_loop()
+        self.calls += 1
+        start = loop.time()
+        primary = asyncio.create_task(self.agent.query(question, context))
+        tasks = [primary]
+
+        try:
+            delay = self.hedge_delay()
+            if delay is not None:
+                await asyncio.wait(tasks, timeout=delay)
+
+            if primary.done() or not self._allow_hedge():
+                response = await primary
+                if response.success:
+                    self.latency.record(loop.time() - start)
+                return response
+
+            self.hedges += 1
+            logger.info(
+                f"🏁 {self.agent.name} 헤지 요청 ({delay:.1f}초 초과, "
+                f"모델: {self.fallback_agent.model_name})"
+            )
+            hedge = asyncio.create_task(self.fallback_agent.query(question, context))
+            tasks.append(hedge)
+
+            winner = None
+            pending = set(tasks)
+            while pending and winner is None:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = next(
+                    (t for t in tasks if t in done and t.result().success), None
+                )
+
+            # 둘 다 실패하면 기본 요청의 오류 반환
+            winner = winner or primary
+            # 기본 요청이 지면 취소 시점까지의 시간을 하한값으로 기록
+            self.latency.record(loop.time() - start)
+
+            response = winner.result()
+            response.metadata["hedge"] = {
+                "winner": "hedge" if winner is hedge else "primary",
+                "delay": round(delay, 3),
+                "model": self.fallback_agent.model_name,
+            }
+            if winner is hedge:
+                self.hedge_wins += 1
+            return response
+
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _allow_hedge(self) -> bool:
+        """헤지 비율 상한 확인"""
+        return self.hedges + 1 <= self.max_hedge_rate * self.calls
@@ -0,0 +1,489 @@
+"""
+Durable SQLite-backed job ledger
+"""
+
+import json
+import sqlite3
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from models.agent_response import AgentResponse
+from models.question import Question, QuestionPriority, QuestionStatus
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class JobState(Enum):
+    """작업 처리 상태"""
+
+    QUEUED = "queued"  # 작업 큐 대기
+    PROCESSING = "processing"  # 에이전트/합성 실행 중
+    SYNTHESIZED = "synthesized"  # 결과 생성 완료, Notion 반영 전
+    COMPLETED = "completed"  # Notion 반영 완료
+    FAILED = "failed"
+
+
+# 재시작시 다시 큐에 넣어야 하는 상태
+RECOVERABLE_STATES = (JobState.QUEUED, JobState.PROCESSING, JobState.SYNTHESIZED)
+
+# 새로 큐에 넣지 않는 상태 (진행 중이거나 완료됨)
+ACTIVE_STATES = (*RECOVERABLE_STATES, JobState.COMPLETED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    page_id TEXT PRIMARY KEY,
+    question TEXT NOT NULL,
+    category TEXT,
+    priority TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result_json TEXT,
+    result_url TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs (state, updated_at);
+
+CREATE TABLE IF NOT EXISTS stage_outputs (
+    page_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    response_json TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (page_id, stage)
+);
+
+CREATE TABLE IF NOT EXISTS transitions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    page_id TEXT NOT NULL,
+    from_state TEXT,
+    to_state TEXT NOT NULL,
+    at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transitions_page ON transitions (page_id);
+
+-- Notion 쓰기 대기열 (write-behind). 페이지별로 결과 생성 1건, 상태 변경 1건만
+-- 유지하며, 상태 변경은 새 값으로 교체(coalescing)됩니다.
+CREATE TABLE IF NOT EXISTS notion_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    page_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    status TEXT,
+    result_url TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    UNIQUE (page_id, kind)
+);
+"""
+
+# notion_outbox.kind
+WRITE_RESULT = "result"  # 결과 페이지 생성
+WRITE_STATUS = "status"  # Inbox 상태 변경
+
+
+class JobStore:
+    """
+    질문별 처리 상태, 단계 결과, 시도 횟수를 기록하는 로컬 작업 원장
+
+    - 메모리 사용량이 처리한 질문 수와 무관 (조회는 기본 키 인덱스)
+    - 재시작시 미완료 작업 복구 (recover)
+    - 단계 결과를 저장하여 중단된 질문을 이어서 처리
+    """
+
+    def __init__(self, path: str = "data/jobs.db", retention_days: float = 30):
+        """
+        Args:
+            path: SQLite 파일 경로 (":memory:"면 메모리 DB)
+            retention_days: 완료/실패 작업 보관 기간 (일)
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = path
+        self.retention_days = retention_days
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def enqueue(self, question: Question) -> bool:
+        """
+        질문을 작업으로 등록
+
+        실패한 질문이 Notion에서 다시 pending이 되면 재등록하지만, 실패 상태
+        쓰기가 아직 대기열(write-behind)에 있으면 Notion이 실패를 반영하기 전의
+        pending이므로 건너뜁니다. 시도 횟수는 유지하므로 재등록을 반복해도
+        max_attempts를 넘길 수 없습니다.
+
+        Returns:
+            새로 큐에 넣어야 하면 True (이미 진행 중이거나 완료된 작업이면 False)
+        """
+        state = self.get_state(question.page_id)
+        if state in ACTIVE_STATES:
+            return False
+        if state == JobState.FAILED and self.has_pending_writes(question.page_id):
+            return False
+
+        now = time.time()
+        self._conn.execute(
+            """
+            INSERT INTO jobs (page_id, question, category, priority, state,
+                              created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (page_id) DO UPDATE SET
+                question = excluded.question,
+                category = excluded.category,
+                priority = excluded.priority,
+                state = excluded.state,
+                result_json = NULL,
+                result_url = NULL,
+                updated_at = excluded.updated_at
+            """,
+            (
+                question.page_id,
+                question.text,
+                question.category,
+                question.priority.value,
+                JobState.QUEUED.value,
+                now,
+                now,
+            ),
+        )
+        if state is not None:
+            # 실패 후 다시 pending된 질문 → 이전 단계 결과는 버림
+            self._conn.execute(
+                "DELETE FROM stage_outputs WHERE page_id = ?", (question.page_id,)
+            )
+        self._record_transition(question.page_id, state, JobState.QUEUED)
+        return True
+
+    def get_state(self, page_id: str) -> Optional[JobState]:
+        """작업 상태 조회 (없으면 None)"""
+        row = self._conn.execute(
+            "SELECT state FROM jobs WHERE page_id = ?", (page_id,)
+        ).fetchone()
+        return JobState(row["state"]) if row else None
+
+    def get_attempts(self, page_id: str) -> int:
+        """시도 횟수 조회"""
+        row = self._conn.execute(
+            "SELECT attempts FROM jobs WHERE page_id = ?", (page_id,)
+        ).fetchone()
+        return row["attempts"] if row else 0
+
+    def transition(self, page_id: str, state: JobState):
+        """작업 상태 변경"""
+        previous = self.get_state(page_id)
+        self._conn.execute(
+            "UPDATE jobs SET state = ?, updated_at = ? WHERE page_id = ?",
+            (state.value, time.time(), page_id),
+        )
+        self._record_transition(page_id, previous, state)
+
+    def start_attempt(self, page_id: str) -> int:
+        """
+        처리 시도 시작 (PROCESSING으로 전환, 시도 횟수 증가)
+
+        Returns:
+            이번 시도 번호 (1부터)
+        """
+        previous = self.get_state(page_id)
+        if previous is JobState.SYNTHESIZED:
+            # 결과는 이미 있으므로 Notion 반영만 남음 → 상태 유지
+            self._conn.execute(
+                "UPDATE jobs SET attempts = attempts + 1, updated_at = ? "
+                "WHERE page_id = ?",
+                (time.time(), page_id),
+            )
+        else:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE page_id = ?",
+                (JobState.PROCESSING.value, time.time(), page_id),
+            )
+            self._record_transition(page_id, previous, JobState.PROCESSING)
+        return self.get_attempts(page_id)
+
+    def save_stage(self, page_id: str, stage: str, response: AgentResponse):
+        """파이프라인 단계 결과 저장"""
+        self._conn.execute(
+            """
+            INSERT OR REPLACE INTO stage_outputs
+                (page_id, stage, response_json, created_at)
+            VALUES (?, ?, ?, ?)
+            """,
+            (page_id, stage, json.dumps(response.to_dict()), time.time()),
+        )
+
+    def load_stage(self, page_id: str, stage: str) -> Optional[AgentResponse]:
+        """저장된 단계 결과 조회"""
+        row = self._conn.execute(
+            "SELECT response_json FROM stage_outputs WHERE page_id = ? AND stage = ?",
+            (page_id, stage),
+        ).fetchone()
+        if not row:
+            return None
+        return AgentResponse.from_dict(json.loads(row["response_json"]))
+
+    def load_stages(self, page_id: str) -> Dict[str, AgentResponse]:
+        """저장된 모든 단계 결과 조회"""
+        rows = self._conn.execute(
+            "SELECT stage, response_json FROM stage_outputs WHERE page_id = ?",
+            (page_id,),
+        ).fetchall()
+        return {
+            row["stage"]: AgentResponse.from_dict(json.loads(row["response_json"]))
+            for row in rows
+        }
+
+    def save_result(self, page_id: str, result: Dict):
+        """오케스트레이터 결과 저장 (SYNTHESIZED로 전환)"""
+        previous = self.get_state(page_id)
+        self._conn.execute(
+            "UPDATE jobs SET state = ?, result_json = ?, updated_at = ? "
+            "WHERE page_id = ?",
+            (JobState.SYNTHESIZED.value, json.dumps(result), time.time(), page_id),
+        )
+        self._record_transition(page_id, previous, JobState.SYNTHESIZED)
+
+    def load_result(self, page_id: str) -> Optional[Dict]:
+        """저장된 오케스트레이터 결과 조회"""
+        row = self._conn.execute(
+            "SELECT result_json FROM jobs WHERE page_id = ?", (page_id,)
+        ).fetchone()
+        if not row or not row["result_json"]:
+            return None
+        return json.loads(row["result_json"])
+
+    def cost_since(self, since: float) -> float:
+        """
+        since(epoch 초) 이후 기록한 호출 비용 합계 (USD)
+
+        저장된 단계 결과(캐시 적중 제외)와 통합 결과의 metadata.cost를 더하므로,
+        재시작시 오늘 이미 쓴 금액을 일일 예산에 다시 반영하는 데 씁니다.
+        """
+        total = 0.0
+        for row in self._conn.execute(
+            "SELECT response_json FROM stage_outputs WHERE created_at >= ?", (since,)
+        ):
+            metadata = json.loads(row["response_json"]).get("metadata") or {}
+            if metadata.get("cache") != "hit":
+                total += metadata.get("cost") or 0.0
+        for row in self._conn.execute(
+            "SELECT result_json FROM jobs "
+            "WHERE result_json IS NOT NULL AND updated_at >= ?",
+            (since,),
+        ):
+            metadata = json.loads(row["result_json"]).get("synthesis_metadata") or {}
+            if metadata.get("cache") != "hit":
+                total += metadata.get("cost") or 0.0
+        return total
+
+    def complete(self, page_id: str, result_url: Optional[str] = None):
+        """Notion 반영 완료 (COMPLETED로 전환)"""
+        previous = self.get_state(page_id)
+        self._conn.execute(
+            "UPDATE jobs SET state = ?, result_url = ?, updated_at = ? "
+            "WHERE page_id = ?",
+            (JobState.COMPLETED.value, result_url, time.time(), page_id),
+        )
+        # 결과가 Notion에 반영되었으므로 단계 결과는 더 이상 필요 없음
+        self._conn.execute("DELETE FROM stage_outputs WHERE page_id = ?", (page_id,))
+        self._record_transition(page_id, previous, JobState.COMPLETED)
+
+    def set_result_url(self, page_id: str, result_url: str):
+        """생성된 결과 페이지 URL 기록 (상태는 유지)"""
+        self._conn.execute(
+            "UPDATE jobs SET result_url = ?, updated_at = ? WHERE page_id = ?",
+            (result_url, time.time(), page_id),
+        )
+
+    def put_write(
+        self,
+        page_id: str,
+        kind: str,
+        status: Optional[str] = None,
+        result_url: Optional[str] = None,
+    ) -> bool:
+        """
+        Notion 쓰기 예약
+
+        상태 변경(WRITE_STATUS)은 아직 쓰지 않은 이전 상태 변경을 대체하고,
+        결과 생성(WRITE_RESULT)은 이미 예약되어 있으면 그대로 둡니다.
+
+        Returns:
+            대기 중이던 같은 종류의 쓰기를 대체/병합했으면 True
+        """
+        existing = self._conn.execute(
+            "SELECT id FROM notion_outbox WHERE page_id = ? AND kind = ?",
+            (page_id, kind),
+        ).fetchone()
+        if existing and kind == WRITE_RESULT:
+            return True
+
+        now = time.time()
+        # REPLACE는 새 id를 발급하므로, 쓰는 도중 대체된 항목을 finish_write가
+        # 지우지 않음
+        self._conn.execute(
+            """
+            INSERT OR REPLACE INTO notion_outbox
+                (page_id, kind, status, result_url, next_attempt_at, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (page_id, kind, status, result_url, now, now),
+        )
+        return existing is not None
+
+    def pending_writes(self, limit: int) -> List[Dict]:
+        """
+        지금 시도할 수 있는 Notion 쓰기 (결과 생성 우선, 오래된 순)
+
+        결과 생성이 남은 페이지의 상태 변경은 결과 생성 뒤의 completed로
+        대체될 것이므로 보류합니다.
+        """
+        rows = self._conn.execute(
+            """
+            SELECT * FROM notion_outbox
+            WHERE next_attempt_at <= ?
+              AND NOT (kind = ? AND page_id IN
+                       (SELECT page_id FROM notion_outbox WHERE kind = ?))
+            ORDER BY kind = ? DESC, id LIMIT ?
+            """,
+            (time.time(), WRITE_STATUS, WRITE_RESULT, WRITE_RESULT, limit),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def finish_write(self, write_id: int):
+        """완료된 Notion 쓰기 삭제"""
+        self._conn.execute("DELETE FROM notion_outbox WHERE id = ?", (write_id,))
+
+    def retry_write(self, write_id: int, delay: float):
+        """실패한 Notion 쓰기를 delay초 뒤 재시도"""
+        self._conn.execute(
+            "UPDATE notion_outbox SET attempts = attempts + 1, next_attempt_at = ? "
+            "WHERE id = ?",
+            (time.time() + delay, write_id),
+        )
+
+    def has_pending_writes(self, page_id: str) -> bool:
+        """Notion에 아직 반영하지 않은 쓰기가 있는지"""
+        row = self._conn.execute(
+            "SELECT 1 FROM notion_outbox WHERE page_id = ? LIMIT 1", (page_id,)
+        ).fetchone()
+        return row is not None
+
+    def count_writes(self) -> int:
+        """대기 중인 Notion 쓰기 수"""
+        row = self._conn.execute("SELECT COUNT(*) AS n FROM notion_outbox").fetchone()
+        return row["n"]
+
+    def recover(self) -> List[Question]:
+        """
+        재시작시 미완료 작업 복구
+
+        Returns:
+            다시 처리해야 하는 질문 목록 (QUEUED/PROCESSING/SYNTHESIZED)
+        """
+        placeholders = ",".join("?" for _ in RECOVERABLE_STATES)
+        rows = self._conn.execute(
+            f"SELECT * FROM jobs WHERE state IN ({placeholders}) "
+            "ORDER BY created_at",
+            [s.value for s in RECOVERABLE_STATES],
+        ).fetchall()
+
+        questions = [
+            Question(
+                page_id=row["page_id"],
+                text=row["question"],
+                status=QuestionStatus.PENDING,
+                priority=QuestionPriority(row["priority"]),
+                category=row["category"],
+                metadata={"recovered_state": row["state"]},
+            )
+            for row in rows
+        ]
+
+        if questions:
+            logger.info(f"♻️  미완료 작업 {len(questions)}개 복구")
+        return questions
+
+    def get_job(self, page_id: str) -> Optional[Dict]:
+        """작업 기본 정보 조회 (question, category, state, result_url 등)"""
+        row = self._conn.execute(
+            "SELECT page_id, question, category, priority, state, attempts, "
+            "result_url FROM jobs WHERE page_id = ?",
+            (page_id,),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def iter_completed(self) -> Iterator[Tuple[str, str, Optional[str]]]:
+        """결과가 남아 있는 완료 작업 (page_id, question, category) 순회"""
+        cursor = self._conn.execute(
+            "SELECT page_id, question, category FROM jobs "
+            "WHERE state = ? AND result_json IS NOT NULL ORDER BY updated_at",
+            (JobState.COMPLETED.value,),
+        )
+        for row in cursor:
+            yield row["page_id"], row["question"], row["category"]
+
+    def count(self, state: Optional[JobState] = None) -> int:
+        """작업 수 조회"""
+        if state is None:
+            row = self._conn.execute("SELECT COUNT(*) AS n FROM jobs").fetchone()
+        else:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS n FROM jobs WHERE state = ?", (state.value,)
+            ).fetchone()
+        return row["n"]
+
+    def prune(self) -> int:
+        """
+        보관 기간이 지난 완료/실패 작업 삭제
+
+        Returns:
+            삭제된 작업 수
+        """
+        cutoff = time.time() - self.retention_days * 86400
+        expired = "SELECT page_id FROM jobs WHERE state IN (?, ?) AND updated_at < ?"
+        params = (JobState.COMPLETED.value, JobState.FAILED.value, cutoff)
+
+        for table in ("stage_outputs", "transitions"):
+            self._conn.execute(
+                f"DELETE FROM {table} WHERE page_id IN ({expired})", params
+            )
+        removed = self._conn.execute(
+            f"DELETE FROM jobs WHERE page_id IN ({expired})", params
+        ).rowcount
+
+        if removed:
+            logger.info(f"🧹 오래된 작업 {removed}개 정리")
+        return removed
+
+    def forget_completed(self):
+        """완료 기록 삭제 (같은 질문을 다시 처리할 수 있게 함)"""
+        self._conn.execute(
+            "DELETE FROM jobs WHERE state = ?", (JobState.COMPLETED.value,)
+        )
+
+    def close(self):
+        """DB 연결 종료"""
+        self._conn.close()
+
+    def _record_transition(
+        self, page_id: str, from_state: Optional[JobState], to_state: JobState
+    ):
+        """상태 전이 기록"""
+        self._conn.execute(
+            "INSERT INTO transitions (page_id, from_state, to_state, at) "
+            "VALUES (?, ?, ?, ?)",
+            (
+                page_id,
+                from_state.value if from_state else None,
+                to_state.value,
+                time.time(),
+            ),
+        )
@@ -3,7 +3,11 @@ Notion Watcher Service
 """
 
 import asyncio
-from typing import Set, Callable, Awaitable
+from typing import Callable, Awaitable, Dict, List, Optional, Set
+from core.job_store import JobStore, JobState
+from core.notion_writer import NotionWriter
+from core.scheduler import QuestionScheduler
+from core.similarity_index import SimilarityIndex
 from integrations.notion_client import NotionClient
 from models.question import Question, QuestionStatus
 from utils.logger import get_logger
@@ -21,71 +25,207 @@ class NotionWatcher:
         notion_client: NotionClient,
         polling_interval: int = 30,
         max_concurrent_tasks: int = 5,
+        job_store: Optional[JobStore] = None,
+        max_attempts: int = 3,
+        similarity_index: Optional[SimilarityIndex] = None,
+        writer: Optional[NotionWriter] = None,
+        aging_interval: Optional[float] = 300.0,
+        reserved_high_slots: int = 0,
+        fair_share: Optional[Dict] = None,
+        hold: Optional[Callable[[Question], bool]] = None,
+        offload: Optional[Callable[[Question], bool]] = None,
+        max_offloaded: int = 100,
     ):
         """
         Args:
             notion_client: NotionClient 인스턴스
             polling_interval: 폴링 간격 (초)
             max_concurrent_tasks: 동시 처리 가능한 질문 수
+            job_store: 작업 원장 (없으면 메모리 DB 사용)
+            max_attempts: 질문당 최대 처리 시도 횟수 (재시작 복구 포함)
+            similarity_index: 유사 질문 인덱스 (있으면 중복 질문 표시)
+            writer: Notion 상태 변경 작성기 (없으면 notion_client로 직접 반영)
+            aging_interval: 대기 질문의 우선순위를 한 단계 올리는 간격 (초)
+            reserved_high_slots: HIGH 질문 전용 워커 수 (최소 1개는 공용으로 남김)
+            fair_share: 카테고리/작성자별 공정 분배 설정 (fair_share 섹션)
+            hold: 참이면 그 질문을 큐에 붙잡아 둠 (일일 예산 소진시 LOW 질문)
+            offload: 참이면 워커 슬롯을 쓰지 않고 백그라운드에서 처리
+                     (배치 API로 처리해 완료까지 오래 기다리는 질문)
+            max_offloaded: 백그라운드에서 동시에 처리할 수 있는 최대 질문 수
         """
         self.notion = notion_client
+        # 상태 변경은 write-behind 작성기로 (워커가 Notion 왕복을 기다리지 않음)
+        self.writer = writer or notion_client
         self.polling_interval = polling_interval
         self.max_concurrent_tasks = max_concurrent_tasks
+        self.max_attempts = max_attempts
 
-        # 처리 중인 질문 추적 (중복 방지)
-        self.processing_ids: Set[str] = set()
+        # 작업 원장 (대기/처리 중/완료 질문 추적 및 중복 방지)
+        self.jobs = job_store or JobStore(":memory:")
+        self.similarity = similarity_index
 
-        # 처리 완료한 질문 추적
-        self.processed_ids: Set[str] = set()
+        # 폴러 → 워커 작업 큐 (우선순위 + 에이징)
+        self.queue = QuestionScheduler(
+            aging_interval=aging_interval, fair_share=fair_share, hold=hold
+        )
+        self.reserved_high_slots = max(
+            0, min(reserved_high_slots, max_concurrent_tasks - 1)
+        )
+        self.in_flight = 0
+
+        # 워커 슬롯 없이 백그라운드에서 처리 중인 질문
+        self.offload = offload
+        self.max_offloaded = max_offloaded
+        self._offloaded: Set[asyncio.Task] = set()
 
         self.is_running = False
+        self._stop_event: Optional[asyncio.Event] = None
+
+        # 다음 폴링을 전체 조회로 강제할지 여부
+        self._needs_full_sync = False
 
     async def start(self, callback: Callable[[Question], Awaitable[None]]):
         """
         감시 시작
 
+        폴러는 새 질문을 큐에 넣기만 하고, max_concurrent_tasks 개의 상주 워커가
+        큐에서 우선순위가 가장 높은 질문을 하나씩 꺼내 처리합니다. 느린 질문이
+        있어도 폴링과 다른 워커는 멈추지 않습니다.
+
         Args:
             callback: 질문 발견시 호출할 비동기 함수
                      async def process(question: Question) -> None
         """
         self.is_running = True
-        logger.info(f"👀 Notion Watcher 시작 (간격: {self.polling_interval}초)")
+        self._stop_event = asyncio.Event()
+        logger.info(
+            f"👀 Notion Watcher 시작 (간격: {self.polling_interval}초, "
+            f"워커: {self.max_concurrent_tasks}개, "
+            f"HIGH 전용: {self.reserved_high_slots}개)"
+        )
 
-        while self.is_running:
-            try:
-                # 1. Pending 질문 조회
-                questions = await self.notion.query_pending_questions()
-
-                # 2. 새로운 질문만 필터링
-                new_questions = [
-                    q
-                    for q in questions
-                    if q.page_id not in self.processing_ids
-                    and q.page_id not in self.processed_ids
-                ]
-
-                if new_questions:
-                    logger.info(f"🆕 {len(new_questions)}개 새 질문 발견")
-
-                    # 3. 동시 처리 제한
-                    semaphore = asyncio.Semaphore(self.max_concurrent_tasks)
-
-                    async def process_with_semaphore(question: Question):
-                        async with semaphore:
-                            await self._process_question(question, callback)
-
-                    # 4. 병렬 처리
-                    await asyncio.gather(
-                        *[process_with_semaphore(q) for q in new_questions],
-                        return_exceptions=True,
+        # 이전 실행에서 끝나지 않은 작업 복구
+        for question in self.jobs.recover():
+            self.queue.put_nowait(question)
+        self.jobs.prune()
+        self._build_similarity_index()
+
+        workers = [
+            asyncio.create_task(self._worker(i, callback))
+            for i in range(self.max_concurrent_tasks)
+        ]
+
+        try:
+            while self.is_running:
+                try:
+                    await self.poll_once()
+                except Exception as e:
+                    logger.error(f"❌ Watcher 오류: {e}", exc_info=True)
+
+                # 다음 폴링까지 대기 (stop() 호출시 즉시 깨어남)
+                try:
+                    await asyncio.wait_for(
+                        self._stop_event.wait(), timeout=self.polling_interval
                     )
+                except asyncio.TimeoutError:
+                    pass
 
-                # 5. 다음 폴링까지 대기
-                await asyncio.sleep(self.polling_interval)
+        finally:
+            await self._shutdown_workers(workers)
+
+    async def poll_once(self) -> int:
+        """
+        Pending 질문을 조회하여 새 질문을 작업 큐에 추가
+
+        Returns:
+            큐에 추가된 질문 수
+        """
+        # 델타 조회는 수정되지 않은 pending 페이지를 다시 주지 않으므로,
+        # 받아 놓고 처리하지 못한 질문이 있으면 전체 조회로 되찾음
+        full = True if self._needs_full_sync else None
+        questions = await self.notion.query_pending_questions(full=full)
+        self._needs_full_sync = False
+
+        # 새로운 질문만 큐에 추가 (대기/처리 중 또는 완료된 질문 제외)
+        new_questions = [q for q in questions if self.jobs.enqueue(q)]
 
+        for question in new_questions:
+            self.queue.put_nowait(question)
+
+        if new_questions:
+            logger.info(
+                f"🆕 {len(new_questions)}개 새 질문 발견 "
+                f"(대기: {self.queue.qsize()}, 처리 중: {self.in_flight})"
+            )
+
+        return len(new_questions)
+
+    async def _worker(
+        self, worker_id: int, callback: Callable[[Question], Awaitable[None]]
+    ):
+        """작업 큐에서 질문을 꺼내 처리하는 상주 워커 (앞번호 워커는 HIGH 전용)"""
+        high_only = worker_id < self.reserved_high_slots
+        while True:
+            question = await self.queue.get(high_only=high_only)
+            if question is None:
+                return
+
+            if (
+                self.offload
+                and len(self._offloaded) < self.max_offloaded
+                and self.offload(question)
+            ):
+                # 배치 결과를 기다리는 동안 워커는 다음 질문으로
+                task = asyncio.create_task(self._process_question(question, callback))
+                self._offloaded.add(task)
+                task.add_done_callback(self._offloaded.discard)
+                continue
+
+            self.in_flight += 1
+            try:
+                await self._process_question(question, callback)
             except Exception as e:
-                logger.error(f"❌ Watcher 오류: {e}", exc_info=True)
-                await asyncio.sleep(self.polling_interval)
+                logger.error(f"❌ 워커 {worker_id} 오류: {e}", exc_info=True)
+            finally:
+                self.in_flight -= 1
+
+    async def _shutdown_workers(self, workers: List[asyncio.Task]):
+        """대기 중인 질문은 버리고, 처리 중인 질문이 끝나면 워커 종료"""
+        # 아직 시작하지 않은 질문(예산 때문에 붙잡아 둔 질문 포함)은 원장에
+        # QUEUED로 남아 다음 시작시 복구되고, Notion에서도 pending 상태로 남음
+        if self.queue.clear():
+            self._needs_full_sync = True
+
+        for _ in workers:
+            self.queue.put_nowait(None)
+
+        await asyncio.gather(*workers, return_exceptions=True)
+
+        # 배치 결과를 기다리던 질문은 취소 (원장에 PROCESSING으로 남아 다음
+        # 시작시 복구되고, 완료된 단계는 저장된 결과를 재사용)
+        offloaded = list(self._offloaded)
+        for task in offloaded:
+            task.cancel()
+        await asyncio.gather(*offloaded, return_exceptions=True)
+        logger.info("🛑 워커 종료 완료")
+
+    def queue_stats(self) -> Dict[str, Dict[str, float]]:
+        """우선순위별 대기 현황 및 대기 시간"""
+        return self.queue.stats()
+
+    def fair_share_stats(self) -> Dict[str, Dict[str, float]]:
+        """공정 분배 키별 처리/대기 현황"""
+        return self.queue.fair_stats()
+
+    def stats(self) -> Dict[str, int]:
+        """작업 큐 / 워커 현황"""
+        return {
+            "workers": self.max_concurrent_tasks,
+            "queued": self.queue.qsize(),
+            "in_flight": self.in_flight,
+            "offloaded": len(self._offloaded),
+            "processed": self.jobs.count(JobState.COMPLETED),
+        }
 
     async def _process_question(
         self, question: Question, callback: Callable[[Question], Awaitable[None]]
@@ -94,44 +234,70 @@ class NotionWatcher:
         page_id = question.page_id
 
         try:
-            # 처리 중 표시
-            self.processing_ids.add(page_id)
+            attempt = self.jobs.start_attempt(page_id)
+            if attempt > self.max_attempts:
+                raise RuntimeError(f"최대 시도 횟수 초과 ({self.max_attempts}회)")
 
             # 상태 업데이트: pending → processing
-            await self.notion.update_question_status(
+            await self.writer.update_question_status(
                 page_id=page_id, status=QuestionStatus.PROCESSING
             )
 
-            logger.info(f"🔄 처리 시작: {question.text[:50]}...")
+            logger.info(f"🔄 처리 시작 (시도 {attempt}): {question.text[:50]}...")
+            self._mark_duplicate(question)
 
             # 실제 처리 (Orchestrator)
             await callback(question)
 
-            # 처리 완료
-            self.processed_ids.add(page_id)
+            # 처리 완료 (콜백이 이미 완료/실패 처리했거나, 결과가 Notion 반영을
+            # 기다리는 중(SYNTHESIZED)이면 그대로 둠)
+            if self.jobs.get_state(page_id) == JobState.PROCESSING:
+                self.jobs.complete(page_id)
+            if self.similarity is not None:
+                self.similarity.add(page_id, question.text, question.category)
             logger.info(f"✅ 처리 완료: {page_id}")
 
         except Exception as e:
             logger.error(f"❌ 처리 실패 ({page_id}): {e}", exc_info=True)
+            self.jobs.transition(page_id, JobState.FAILED)
 
             # 상태 업데이트: processing → failed
             try:
-                await self.notion.update_question_status(
+                await self.writer.update_question_status(
                     page_id=page_id, status=QuestionStatus.FAILED
                 )
             except Exception:
-                pass
+                # Notion에 pending으로 남았을 수 있음 → 다음 폴링은 전체 조회
+                self._needs_full_sync = True
 
-        finally:
-            # 처리 중 표시 제거
-            self.processing_ids.discard(page_id)
+    def _build_similarity_index(self):
+        """완료된 과거 질문으로 유사도 인덱스 구성"""
+        if self.similarity is None or len(self.similarity):
+            return
+        for page_id, text, category in self.jobs.iter_completed():
+            self.similarity.add(page_id, text, category)
+        logger.info(f"🔎 유사 질문 인덱스 구성: {len(self.similarity)}개")
+
+    def _mark_duplicate(self, question: Question):
+        """유사한 과거 질문이 있으면 question.metadata['duplicate_of']에 기록"""
+        if self.similarity is None:
+            return
+        match, score = self.similarity.search(question.text, question.category)
+        if match and match != question.page_id:
+            logger.info(f"🔁 유사 질문 발견: {match} (유사도 {score:.3f})")
+            question.metadata = {
+                **(question.metadata or {}),
+                "duplicate_of": {"page_id": match, "score": round(score, 4)},
+            }
 
     def stop(self):
         """감시 중지"""
         logger.info("🛑 Notion Watcher 중지 요청")
         self.is_running = False
+        if self._stop_event:
+            self._stop_event.set()
 
     def reset_processed(self):
         """처리 완료 기록 초기화"""
-        self.processed_ids.clear()
+        self.jobs.forget_completed()
         logger.info("🔄 처리 기록 초기화")
@@ -0,0 +1,192 @@
+"""
+Write-behind Notion writer backed by the job ledger outbox
+"""
+
+import asyncio
+from typing import Dict, Optional
+
+from core.job_store import JobStore, WRITE_RESULT, WRITE_STATUS
+from integrations.notion_client import NotionClient
+from models.question import Question, QuestionPriority, QuestionStatus
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 실패한 쓰기의 최대 재시도 간격 (초)
+MAX_RETRY_DELAY = 60.0
+
+
+class NotionWriter:
+    """
+    Notion 쓰기 전담 백그라운드 작성기
+
+    워커는 상태 변경과 결과 생성을 작업 원장의 notion_outbox에 기록만 하고
+    바로 다음 질문으로 넘어갑니다. 작성기는 대기열에서 최대 batch_size개씩
+    꺼내 동시에 반영하며(모두 Notion 레이트 리미터를 거침), 결과 생성을 상태
+    변경보다 먼저 처리합니다. 아직 반영되지 않은 같은 페이지의 상태 변경은
+    최신 값으로 대체되고, 대기열은 SQLite에 있으므로 재시작 후에도 이어서
+    반영됩니다.
+    """
+
+    def __init__(
+        self,
+        notion_client: NotionClient,
+        job_store: JobStore,
+        batch_size: int = 10,
+        idle_interval: float = 1.0,
+    ):
+        """
+        Args:
+            notion_client: NotionClient 인스턴스
+            job_store: 작업 원장 (대기열 저장소)
+            batch_size: 한 번에 동시 반영할 최대 쓰기 수 (notion.update_batch_size)
+            idle_interval: 대기열이 비었을 때 재확인 간격 (초)
+        """
+        self.notion = notion_client
+        self.jobs = job_store
+        self.batch_size = max(1, batch_size)
+        self.idle_interval = idle_interval
+
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+
+        # 통계
+        self.written = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    def start(self):
+        """백그라운드 작성 시작"""
+        self._stopping = False
+        self._task = asyncio.create_task(self.run())
+        pending = self.jobs.count_writes()
+        if pending:
+            logger.info(f"♻️  미반영 Notion 쓰기 {pending}개 재개")
+
+    async def close(self):
+        """작성 중지 (반영 중인 묶음은 끝까지 기다리고, 나머지는 대기열에 남김)"""
+        self._stopping = True
+        self._wakeup.set()
+        if self._task:
+            await self._task
+            self._task = None
+
+    async def update_question_status(
+        self, page_id: str, status: QuestionStatus, result_url: Optional[str] = None
+    ):
+        """
+        Inbox 상태 변경 예약 (NotionClient.update_question_status와 같은 형태)
+
+        Args:
+            page_id: Notion 페이지 ID
+            status: 새 상태
+            result_url: 결과 페이지 URL (optional)
+        """
+        if self.jobs.put_write(page_id, WRITE_STATUS, status.value, result_url):
+            self.coalesced += 1
+        self._wakeup.set()
+
+    def submit_result(self, page_id: str):
+        """
+        결과 페이지 생성 예약 (작업 원장에 저장된 결과 사용)
+
+        생성되면 Inbox 상태를 completed로 바꾸고 작업을 완료 처리합니다.
+        이미 결과 페이지가 만들어진 작업이면 상태 변경만 예약합니다.
+        """
+        job = self.jobs.get_job(page_id)
+        if job and job["result_url"]:
+            self.jobs.put_write(
+                page_id, WRITE_STATUS, QuestionStatus.COMPLETED.value, job["result_url"]
+            )
+        else:
+            self.jobs.put_write(page_id, WRITE_RESULT)
+        self._wakeup.set()
+
+    def stats(self) -> Dict[str, int]:
+        """쓰기 현황"""
+        return {
+            "pending": self.jobs.count_writes(),
+            "written": self.written,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+        }
+
+    async def flush(self):
+        """지금 시도할 수 있는 쓰기를 모두 반영 (재시도 대기 중인 항목 제외)"""
+        while await self._write_batch():
+            pass
+
+    async def run(self):
+        """대기열 반영 루프"""
+        while not self._stopping:
+            if await self._write_batch():
+                continue
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.idle_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _write_batch(self) -> int:
+        """대기열에서 한 묶음을 꺼내 동시에 반영, 꺼낸 수 반환"""
+        batch = self.jobs.pending_writes(self.batch_size)
+        if batch:
+            await asyncio.gather(*(self._write(item) for item in batch))
+        return len(batch)
+
+    async def _write(self, item: Dict):
+        """쓰기 하나 반영 (실패하면 지수 백오프로 재시도 예약)"""
+        page_id = item["page_id"]
+        try:
+            if item["kind"] == WRITE_RESULT:
+                await self._create_result_page(page_id)
+            else:
+                status = QuestionStatus(item["status"])
+                await self.notion.update_question_status(
+                    page_id=page_id, status=status, result_url=item["result_url"]
+                )
+                if status == QuestionStatus.COMPLETED:
+                    self.jobs.complete(page_id, result_url=item["result_url"])
+                    logger.info(f"✅ 완료: {item['result_url']}")
+
+            self.jobs.finish_write(item["id"])
+            self.written += 1
+
+        except Exception as e:
+            self.failed += 1
+            delay = min(MAX_RETRY_DELAY, 2.0 ** item["attempts"])
+            logger.error(
+                f"Notion 쓰기 실패 ({item['kind']}, page_id={page_id}), "
+                f"{delay:.0f}초 후 재시도: {e}"
+            )
+            self.jobs.retry_write(item["id"], delay)
+
+    async def _create_result_page(self, page_id: str):
+        """저장된 결과로 결과 페이지 생성 후 완료 상태 변경 예약"""
+        job = self.jobs.get_job(page_id)
+        result = self.jobs.load_result(page_id)
+        if not job or not result:
+            logger.warning(f"결과 없음, 결과 페이지 생성 생략: {page_id}")
+            return
+
+        question = Question(
+            page_id=page_id,
+            text=job["question"],
+            status=QuestionStatus.PROCESSING,
+            priority=QuestionPriority(job["priority"]),
+            category=job["category"],
+        )
+        result_page = await self.notion.create_result_page(
+            question=question,
+            responses=result["responses"],
+            synthesis=result["synthesis"],
+            metadata=result["metadata"],
+        )
+
+        self.jobs.set_result_url(page_id, result_page["url"])
+        if self.jobs.put_write(
+            page_id, WRITE_STATUS, QuestionStatus.COMPLETED.value, result_page["url"]
+        ):
+            self.coalesced += 1
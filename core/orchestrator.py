@@ -2,7 +2,9 @@
 Central AI Orchestrator
 """
 
-from typing import Dict, List
+import asyncio
+from dataclasses import replace
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 
 from agents.base import AIAgent
@@ -11,22 +13,41 @@ from agents.chatgpt_agent import ChatGPTAgent
 from agents.claude_agent import ClaudeAgent
 from models.agent_response import AgentResponse
 from core.synthesis_engine import SynthesisEngine
+from core.batch import AnthropicBatchBackend, BatchRunner, OpenAIBatchBackend
+from core.context_packer import ContextPacker
+from core.pipeline import EarlyStart, PipelineRegistry, PipelineStage
+from core.job_store import JobStore
+from core.hedging import Hedger
+from utils.cache import (
+    ResponseCache,
+    make_cache_key,
+    normalize_question,
+    prompt_fingerprint,
+)
+from utils.circuit_breaker import CircuitBreaker, circuit_states, get_circuit_breaker
+from utils.cost import cost_tracker
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 호출이 기한 이만큼 전(초)부터 끝났으면 기한 때문에 중단된 것으로 봄
+# (SDK 타임아웃도 남은 기한으로 설정하므로 wait_for와 거의 같은 시각에 끝남)
+DEADLINE_SLACK = 0.5
+
 
 class Orchestrator:
     """
     중앙 조율자 - 모든 AI 에이전트를 조율
     """
 
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, job_store: Optional[JobStore] = None):
         """
         Args:
             config: 설정 딕셔너리
+            job_store: 작업 원장 (있으면 단계 결과를 기록하고 재시작시 재사용)
         """
         self.config = config
+        self.jobs = job_store
 
         # AI 에이전트 초기화
         self.agents: List[AIAgent] = [
@@ -41,17 +62,87 @@ class Orchestrator:
                 config=config["agents"]["claude"],
             ),
         ]
+        self.agents_by_name: Dict[str, AIAgent] = {a.name: a for a in self.agents}
+
+        # 헤지 요청 (agents.<이름>.hedge.enabled인 에이전트만)
+        self.hedgers: Dict[str, Hedger] = {}
+        for agent in self.agents:
+            hedger = Hedger.from_agent(agent)
+            if hedger:
+                self.hedgers[agent.name] = hedger
+
+        # 파이프라인 정의 (config.yaml의 pipeline 섹션)
+        self.pipelines = PipelineRegistry.from_config(config.get("pipeline"))
+        for pipeline in self.pipelines.all():
+            unknown = [n for n in pipeline.agent_names if n not in self.agents_by_name]
+            if unknown:
+                raise ValueError(
+                    f"파이프라인 '{pipeline.name}': 알 수 없는 에이전트 {unknown}"
+                )
+
+        # 파이프라이닝: 업스트림 출력 앞부분으로 다운스트림 조기 시작
+        # (pipelining.enabled가 false면 None, refine_models의 모델로 보정)
+        pipelining = config.get("pipelining") or {}
+        self.early_start = EarlyStart.from_config(
+            pipelining, refiner=self._refine_stage
+        )
+        self.refiners: Dict[str, AIAgent] = {
+            name: type(agent)(agent.api_key, {**agent.config, "model": model})
+            for name, model in (pipelining.get("refine_models") or {}).items()
+            for agent in [self.agents_by_name.get(name)]
+            if agent
+        }
+
+        # 일일 예산이 downgrade_at을 넘으면 LOW 질문에 쓸 저렴한 모델
+        # (budget.downgrade_models, 없는 에이전트는 원래 모델 유지)
+        self.downgrades: Dict[str, AIAgent] = {
+            name: type(agent)(agent.api_key, {**agent.config, "model": model})
+            for name, model in (
+                (config.get("budget") or {}).get("downgrade_models") or {}
+            ).items()
+            for agent in [self.agents_by_name.get(name)]
+            if agent
+        }
+
+        # 업스트림 결과 압축 (context_packing.enabled가 false면 원문 그대로 전달)
+        self.packer = ContextPacker.from_config(config.get("context_packing"))
 
         # 통합 엔진
         self.synthesis = SynthesisEngine(api_key=config["api_keys"]["anthropic"])
 
-    async def process_question(self, question: str, context: Dict = None) -> Dict:
+        # LOW 질문용 배치 API 실행 (batch.enabled가 false면 None)
+        # Gemini SDK에는 배치 엔드포인트가 없어 Gemini 단계는 실시간으로 호출
+        self.batch = BatchRunner.from_config(
+            config.get("batch"),
+            {
+                "anthropic": AnthropicBatchBackend(
+                    self.agents_by_name["claude"].client
+                ),
+                "openai": OpenAIBatchBackend(self.agents_by_name["chatgpt"].client),
+            },
+        )
+
+        # 응답 캐시 (cache.enabled가 false면 None)
+        self.cache = ResponseCache.from_config(config.get("cache"))
+
+        # 우선순위별 질문 처리 기한 (deadlines 섹션, 없으면 무제한)
+        self.deadlines = config.get("deadlines") or {}
+
+    async def process_question(
+        self,
+        question: str,
+        context: Dict = None,
+        responses: Optional[List[AgentResponse]] = None,
+    ) -> Dict:
         """
         질문 처리 메인 파이프라인
 
         Args:
             question: 사용자 질문
-            context: 추가 컨텍스트
+            context: 추가 컨텍스트 (job_id가 있으면 작업 원장에 단계 결과 기록,
+                     result_stream이 있으면 에이전트/통합 출력을 스트리밍)
+            responses: 재사용할 에이전트 응답 (있으면 파이프라인을 건너뛰고
+                       합성만 실행)
 
         Returns:
             {
@@ -66,10 +157,55 @@ class Orchestrator:
         start_time = datetime.now()
         errors = []
 
+        context = context or {}
+        pipeline = self.pipelines.get(context.get("category"))
+
+        # 배치 대상 질문은 프로바이더 배치 API로 처리 (완료까지 수 시간 걸릴 수
+        # 있으므로 질문 기한을 두지 않음)
+        batch = (
+            self.batch
+            if self.batch and self.batch.applies(context.get("priority"))
+            else None
+        )
+        if batch:
+            logger.info("📦 배치 모드로 처리")
+            context["batch"] = batch
+
+        # 질문 기한: 합성용 시간을 남기고 나머지를 파이프라인 단계들에 분배
+        loop = asyncio.get_running_loop()
+        budget = None if batch else self._deadline_budget(context.get("priority"))
+        deadline = loop.time() + budget if budget else None
+        pipeline_deadline = (
+            deadline - self.deadlines.get("synthesis_reserve", 0) if deadline else None
+        )
+        cut_short: List[str] = []
+
+        # 일일 예산이 거의 찼으면 LOW 질문은 저렴한 모델로 처리
+        downgraded = bool(self.downgrades) and cost_tracker.should_downgrade(
+            context.get("priority")
+        )
+        if downgraded:
+            logger.info("💸 예산 절약: 저렴한 모델로 처리")
+            context["downgrade"] = True
+
         try:
-            # STEP 1: AI 에이전트 순차 실행
-            logger.info("🔄 Step 1: AI 에이전트 순차 실행...")
-            responses = await self._dispatch_sequential(question, context or {})
+            if responses is None:
+                # STEP 1: 파이프라인 실행 (입력이 준비된 단계부터 병렬 실행)
+                logger.info(f"🔄 Step 1: 파이프라인 '{pipeline.name}' 실행...")
+                responses = await pipeline.run(
+                    question,
+                    context,
+                    self._run_stage,
+                    deadline=pipeline_deadline,
+                    early_start=self.early_start,
+                )
+                cut_short = [
+                    r.metadata.get("stage", r.agent_name)
+                    for r in responses
+                    if r.metadata.get("cut_short")
+                ]
+            else:
+                logger.info("♻️  Step 1: 저장된 에이전트 응답 재사용")
 
             # STEP 2: 응답 검증
             successful = [r for r in responses if r.success]
@@ -80,8 +216,21 @@ class Orchestrator:
 
             # STEP 3: 합성 (통합)
             logger.info("🔄 Step 2: 응답 통합 중...")
+            synthesis_metadata: Dict = {}
             try:
-                synthesis = await self.synthesis.synthesize(question, responses)
+                timeout = deadline - loop.time() if deadline else None
+                if timeout is not None and timeout <= 0:
+                    raise asyncio.TimeoutError("질문 처리 기한 초과")
+                synthesis_response = await self._synthesize(
+                    question, context, responses, timeout=timeout
+                )
+                synthesis = synthesis_response.content
+                synthesis_metadata = synthesis_response.metadata
+            except asyncio.TimeoutError:
+                logger.warning("⏰ 기한 초과: 통합 생략, 기본 포맷 사용")
+                errors.append("synthesis: 기한 초과")
+                cut_short.append("synthesis")
+                synthesis = self._create_fallback_synthesis(responses)
             except Exception as e:
                 logger.error(f"통합 실패: {e}")
                 errors.append(f"synthesis: {str(e)}")
@@ -95,7 +244,8 @@ class Orchestrator:
                 "success": True,
                 "question": question,
                 "responses": {
-                    r.agent_name: {
+                    self._response_key(r, responses): {
+                        "agent": r.agent_name,
                         "content": r.content,
                         "success": r.success,
                         "error": r.error,
@@ -104,11 +254,32 @@ class Orchestrator:
                     for r in responses
                 },
                 "synthesis": synthesis,
+                "synthesis_metadata": synthesis_metadata,
                 "metadata": {
                     "total_duration": duration,
                     "timestamp": datetime.now().isoformat(),
                     "successful_agents": len(successful),
                     "total_agents": len(responses),
+                    "pipeline": pipeline.name,
+                    "duplicate_of": context.get("duplicate_of"),
+                    "deadline": budget,
+                    "cut_short": cut_short,
+                    "pipelined": {
+                        r.metadata.get("stage", r.agent_name): r.metadata["pipelined"]
+                        for r in responses
+                        if "pipelined" in r.metadata
+                    },
+                    "cache_hits": sum(
+                        1 for r in responses if r.metadata.get("cache") == "hit"
+                    )
+                    + (1 if synthesis_metadata.get("cache") == "hit" else 0),
+                    "context_packing": self._packing_summary(
+                        responses, synthesis_metadata
+                    ),
+                    "downgraded": downgraded,
+                    "batch": batch is not None,
+                    "usage": self._question_usage(responses, synthesis_metadata),
+                    "daily_cost": cost_tracker.daily_total(),
                     "errors": errors,
                 },
             }
@@ -127,47 +298,400 @@ class Orchestrator:
                 },
             }
 
-    async def _dispatch_sequential(
-        self, question: str, context: Dict
-    ) -> List[AgentResponse]:
+    async def _run_stage(
+        self, stage: PipelineStage, question: str, context: Dict
+    ) -> AgentResponse:
         """
-        AI 에이전트를 순차적으로 호출 (각 AI가 이전 결과를 받음)
-        Gemini → ChatGPT → Claude
+        파이프라인 단계 하나 실행
+
+        Args:
+            stage: 실행할 단계
+            question: 사용자 질문
+            context: 업스트림 결과가 포함된 단계 컨텍스트
         """
-        responses = []
+        job_id = context.get("job_id")
+        if self.jobs and job_id:
+            # 이전 시도에서 성공한 단계는 다시 호출하지 않음
+            stored = self.jobs.load_stage(job_id, stage.name)
+            if stored and stored.success:
+                logger.info(f"♻️  저장된 단계 결과 재사용: {stage.name}")
+                stored.metadata["resumed"] = True
+                return stored
+
+        agent = self.agents_by_name[stage.agent]
+        if context.get("downgrade"):
+            agent = self.downgrades.get(stage.agent, agent)
+
+        # 업스트림 결과를 단계 토큰 예산에 맞게 압축 (캐시 키도 압축본 기준)
+        context, packing = self._pack_context(stage.name, question, context)
 
+        cache_key = None
+        if self.cache:
+            cache_key = make_cache_key(
+                question=normalize_question(question),
+                category=context.get("category"),
+                agent=agent.name,
+                model=agent.model_name,
+                template=agent.prompt_fingerprint(),
+                upstream={
+                    k: v for k, v in sorted(context.items()) if k.endswith("_result")
+                },
+            )
+            cached = self.cache.get(cache_key)
+            if cached:
+                logger.info(f"💾 캐시 적중: {stage.name}")
+                response = AgentResponse.from_dict(cached)
+                response.metadata["cache"] = "hit"
+                return self._save_stage(job_id, stage, response)
+
+        # 기한이 이미 지났으면 호출하지 않고 건너뜀
+        timeout = self._stage_timeout(agent, context)
+        if timeout is not None and timeout <= 0:
+            logger.warning(f"⏰ {stage.name} 건너뜀: 기한 초과")
+            return self._cut_short_response(agent, 0.0)
+
+        # 장애 중인 에이전트는 타임아웃까지 기다리지 않고 즉시 건너뜀
+        breaker = get_circuit_breaker(agent.name)
+        if not breaker.allow():
+            logger.warning(f"🔌 {stage.name} 건너뜀: {agent.name} 서킷 차단 중")
+            return AgentResponse(
+                agent_name=agent.name,
+                content="",
+                metadata={"circuit": breaker.state.value},
+                timestamp=datetime.now(),
+                success=False,
+                error=f"{agent.name} 서킷 차단 중",
+            )
+
+        # 남은 단계 기한을 SDK 타임아웃으로 전달하고, 넘기면 취소
+        context["timeout"] = timeout
+        # 다운그레이드한 모델과 배치 호출은 헤지하지 않음 (헤저는 원래 모델의
+        # 실시간 호출용)
+        hedger = None
+        if agent is self.agents_by_name[stage.agent] and not self._batched(
+            agent, context
+        ):
+            hedger = self.hedgers.get(agent.name)
+
+        # 스트리밍 결과 페이지 섹션과 조기 시작을 기다리는 다운스트림에
+        # 생성되는 대로 전달 (헤지 요청은 두 응답이 섞이므로 스트리밍하지 않음)
+        listeners = []
+        stream = context.get("result_stream")
+        if stream:
+            listeners.append(stream.writer(stage.name))
+        if context.get("on_partial"):
+            listeners.append(context["on_partial"])
+        if listeners and not hedger:
+            context["on_chunk"] = self._fan_out(listeners)
+        call = (hedger or agent).query(question, context)
         try:
-            # 1. Gemini (정보 수집)
-            gemini_response = await self.agents[0].query(question, context)
-            responses.append(gemini_response)
-
-            # 2. ChatGPT (분석) - Gemini 결과 활용
-            chatgpt_context = {
-                **context,
-                "gemini_result": (
-                    gemini_response.content if gemini_response.success else ""
-                ),
-            }
-            chatgpt_response = await self.agents[1].query(question, chatgpt_context)
-            responses.append(chatgpt_response)
-
-            # 3. Claude (실행) - Gemini + ChatGPT 결과 활용
-            claude_context = {
-                **context,
-                "gemini_result": (
-                    gemini_response.content if gemini_response.success else ""
+            response = await asyncio.wait_for(call, timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⏰ {stage.name} 시간 초과 ({timeout:.1f}초): 취소")
+            self._record_outcome(breaker, False, self._deadline_hit(agent, context))
+            return self._cut_short_response(agent, timeout)
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+
+        self._record_outcome(
+            breaker, response.success, self._deadline_hit(agent, context)
+        )
+        if packing:
+            response.metadata["context_packing"] = packing
+
+        if cache_key:
+            response.metadata["cache"] = "miss"
+            if response.success:
+                self.cache.set(cache_key, response.to_dict())
+
+        return self._save_stage(job_id, stage, response)
+
+    async def _refine_stage(
+        self,
+        stage: PipelineStage,
+        question: str,
+        context: Dict,
+        draft: AgentResponse,
+    ) -> AgentResponse:
+        """
+        조기 시작한 단계의 보정 실행 (파이프라이닝)
+
+        초안과 최종 업스트림 결과를 함께 넘겨 refine_models의 모델(없으면 같은
+        에이전트)로 최종본을 받습니다. 단계 기한이 지났거나 서킷이 차단 중이거나
+        보정이 실패/시간 초과하면 초안을 그대로 반환합니다.
+        """
+        agent = self.refiners.get(stage.agent) or self.agents_by_name[stage.agent]
+
+        timeout = self._stage_timeout(agent, context)
+        if timeout is not None and timeout <= 0:
+            logger.warning(f"⏰ {stage.name} 보정 생략: 기한 초과")
+            return draft
+        breaker = get_circuit_breaker(agent.name)
+        if not breaker.allow():
+            return draft
+
+        context, packing = self._pack_context(stage.name, question, context)
+        refine_context = {**context, "draft": draft.content, "timeout": timeout}
+        try:
+            response = await asyncio.wait_for(
+                agent.query(question, refine_context), timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"⏰ {stage.name} 보정 시간 초과: 초안 사용")
+            self._record_outcome(breaker, False, self._deadline_hit(agent, context))
+            return draft
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+
+        self._record_outcome(
+            breaker, response.success, self._deadline_hit(agent, context)
+        )
+        if not response.success:
+            logger.warning(f"{stage.name} 보정 실패: 초안 사용 ({response.error})")
+            return draft
+        if packing:
+            response.metadata["context_packing"] = packing
+        response.metadata["draft"] = {
+            "input_tokens": draft.metadata.get("input_tokens"),
+            "output_tokens": draft.metadata.get("output_tokens"),
+            "cost": draft.metadata.get("cost"),
+            "duration": draft.metadata.get("duration"),
+        }
+        return self._save_stage(context.get("job_id"), stage, response)
+
+    def _pack_context(
+        self, stage_name: str, question: str, context: Dict
+    ) -> Tuple[Dict, Optional[Dict]]:
+        """
+        단계 컨텍스트의 업스트림 결과("<agent>_result") 압축
+
+        Returns:
+            (압축본을 넣은 새 컨텍스트, 압축 통계 또는 None)
+        """
+        inputs = {k: v for k, v in context.items() if k.endswith("_result") and v}
+        if not self.packer or not inputs:
+            return context, None
+        packed, stats = self.packer.pack(
+            inputs, self.packer.budget(stage_name), question
+        )
+        return {**context, **packed}, stats
+
+    @staticmethod
+    def _fan_out(listeners: List[Callable[[str], None]]) -> Callable[[str], None]:
+        """텍스트 조각을 여러 콜백에 전달"""
+        if len(listeners) == 1:
+            return listeners[0]
+
+        def on_chunk(text: str):
+            for listener in listeners:
+                listener(text)
+
+        return on_chunk
+
+    def _deadline_budget(self, priority: Optional[str]) -> Optional[float]:
+        """우선순위별 질문 처리 기한 (초, 설정이 없으면 None)"""
+        return self.deadlines.get(priority or "medium")
+
+    @staticmethod
+    def _batched(agent: AIAgent, context: Dict) -> bool:
+        """이 단계 호출이 배치 API로 처리되는지"""
+        batch = context.get("batch")
+        return bool(batch) and batch.supports(agent.provider)
+
+    def _stage_timeout(self, agent: AIAgent, context: Dict) -> Optional[float]:
+        """에이전트 timeout 설정과 단계 기한 중 작은 값 (초, 배치 호출은 None)"""
+        if self._batched(agent, context):
+            return None
+        timeout = agent.config.get("timeout")
+        deadline = context.get("deadline")
+        if deadline is not None:
+            remaining = deadline - asyncio.get_running_loop().time()
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        return timeout
+
+    def _deadline_hit(self, agent: AIAgent, context: Dict) -> bool:
+        """
+        단계 기한 때문에 호출이 끝났는지 (에이전트 timeout보다 기한이 먼저 옴)
+
+        기한 직전에 실패했다면 SDK 타임아웃(남은 기한으로 설정)이나 wait_for가
+        끊은 것이므로 프로바이더 장애가 아닙니다.
+        """
+        deadline = context.get("deadline")
+        if deadline is None or self._batched(agent, context):
+            return False
+        agent_timeout = agent.config.get("timeout")
+        now = asyncio.get_running_loop().time()
+        return now >= deadline - DEADLINE_SLACK and (
+            agent_timeout is None or deadline - now < agent_timeout
+        )
+
+    @staticmethod
+    def _record_outcome(breaker: CircuitBreaker, success: bool, deadline_hit: bool):
+        """
+        호출 결과를 서킷 브레이커에 반영
+
+        질문 기한 때문에 중단된 호출은 실패로 세지 않고 HALF_OPEN 시험 요청
+        자리만 돌려줍니다 (기한이 짧은 질문이 정상 프로바이더를 차단하지 않도록).
+        """
+        if success:
+            breaker.record_success()
+        elif deadline_hit:
+            breaker.release()
+        else:
+            breaker.record_failure()
+
+    def _cut_short_response(self, agent: AIAgent, timeout: float) -> AgentResponse:
+        """기한 초과로 중단된 단계 응답"""
+        return AgentResponse(
+            agent_name=agent.name,
+            content="",
+            metadata={"cut_short": True, "timeout": round(timeout, 3)},
+            timestamp=datetime.now(),
+            success=False,
+            error="시간 초과",
+        )
+
+    def _save_stage(
+        self, job_id: Optional[str], stage: PipelineStage, response: AgentResponse
+    ) -> AgentResponse:
+        """성공한 단계 결과를 작업 원장에 기록"""
+        if self.jobs and job_id and response.success:
+            self.jobs.save_stage(job_id, stage.name, response)
+        return response
+
+    async def _synthesize(
+        self,
+        question: str,
+        context: Dict,
+        responses: List[AgentResponse],
+        timeout: Optional[float] = None,
+    ) -> AgentResponse:
+        """응답 통합 (캐시 적용, timeout초 안에 끝나지 않으면 asyncio.TimeoutError)"""
+        packing = None
+        if self.packer:
+            inputs = {str(i): r.content for i, r in enumerate(responses) if r.success}
+            packed, packing = self.packer.pack(
+                inputs, self.packer.budget("synthesis"), question
+            )
+            responses = [
+                replace(r, content=packed[str(i)]) if str(i) in packed else r
+                for i, r in enumerate(responses)
+            ]
+
+        cache_key = None
+        if self.cache:
+            cache_key = make_cache_key(
+                question=normalize_question(question),
+                category=context.get("category"),
+                agent="synthesis",
+                model=self.synthesis.model,
+                template=prompt_fingerprint(
+                    SynthesisEngine._build_synthesis_prompt,
+                    SynthesisEngine.system_prompt,
                 ),
-                "chatgpt_result": (
-                    chatgpt_response.content if chatgpt_response.success else ""
+                upstream=[
+                    (r.agent_name, r.content if r.success else None) for r in responses
+                ],
+            )
+            cached = self.cache.get(cache_key)
+            if cached:
+                logger.info("💾 캐시 적중: synthesis")
+                response = AgentResponse.from_dict(cached)
+                response.metadata["cache"] = "hit"
+                return response
+
+        # 차단 중이면 CircuitOpenError → 기본 포맷으로 대체
+        breaker = get_circuit_breaker("synthesis")
+        breaker.check()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+        try:
+            stream = context.get("result_stream")
+            response = await asyncio.wait_for(
+                self.synthesis.synthesize(
+                    question,
+                    responses,
+                    timeout=timeout,
+                    on_chunk=stream.writer("synthesis") if stream else None,
+                    batch=context.get("batch"),
                 ),
-            }
-            claude_response = await self.agents[2].query(question, claude_context)
-            responses.append(claude_response)
+                timeout,
+            )
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception:
+            deadline_hit = (
+                deadline is not None and loop.time() >= deadline - DEADLINE_SLACK
+            )
+            self._record_outcome(breaker, False, deadline_hit)
+            raise
+        breaker.record_success()
+        if packing:
+            response.metadata["context_packing"] = packing
 
-        except Exception as e:
-            logger.error(f"에이전트 실행 오류: {e}", exc_info=True)
+        if cache_key:
+            response.metadata["cache"] = "miss"
+            self.cache.set(cache_key, response.to_dict())
+        return response
+
+    @staticmethod
+    def _question_usage(
+        responses: List[AgentResponse], synthesis_metadata: Dict
+    ) -> Dict:
+        """
+        질문 하나에 든 토큰/비용 합계
+
+        이번 처리에서 실제로 호출한 것만 셉니다(캐시 적중, 중복 질문에서
+        재사용한 응답 제외). 재시작 전에 끝낸 단계와 파이프라이닝 초안은
+        같은 질문에 쓴 비용이므로 포함합니다.
+        """
+        usages = [
+            r.metadata
+            for r in responses
+            if r.metadata.get("cache") != "hit" and not r.metadata.get("reused")
+        ]
+        usages += [r.metadata["draft"] for r in responses if "draft" in r.metadata]
+        if synthesis_metadata.get("cache") != "hit":
+            usages.append(synthesis_metadata)
+
+        return {
+            "input_tokens": sum(u.get("input_tokens") or 0 for u in usages),
+            "output_tokens": sum(u.get("output_tokens") or 0 for u in usages),
+            "cache_read_tokens": sum(u.get("cache_read_tokens") or 0 for u in usages),
+            "cache_savings": round(
+                sum(u.get("cache_savings") or 0.0 for u in usages), 6
+            ),
+            "cost": round(sum(u.get("cost") or 0.0 for u in usages), 6),
+        }
+
+    @staticmethod
+    def _packing_summary(
+        responses: List[AgentResponse], synthesis_metadata: Dict
+    ) -> Dict:
+        """단계별 컨텍스트 압축 통계와 절감 토큰 합계"""
+        stages = {
+            r.metadata.get("stage", r.agent_name): r.metadata["context_packing"]
+            for r in responses
+            if "context_packing" in r.metadata
+        }
+        if "context_packing" in synthesis_metadata:
+            stages["synthesis"] = synthesis_metadata["context_packing"]
+        return {
+            "saved_tokens": sum(s["saved_tokens"] for s in stages.values()),
+            "stages": stages,
+        }
 
-        return responses
+    def _response_key(
+        self, response: AgentResponse, responses: List[AgentResponse]
+    ) -> str:
+        """결과 딕셔너리 키 (같은 에이전트가 여러 단계면 단계 이름 사용)"""
+        same_agent = [r for r in responses if r.agent_name == response.agent_name]
+        if len(same_agent) > 1:
+            return response.metadata.get("stage", response.agent_name)
+        return response.agent_name
 
     def _create_fallback_synthesis(self, responses: List[AgentResponse]) -> str:
         """통합 실패시 기본 포맷 생성"""
@@ -185,6 +709,26 @@ class Orchestrator:
 
         return "".join(parts)
 
+    def circuit_states(self) -> Dict[str, Dict]:
+        """에이전트/통합/Notion 서킷 브레이커 상태"""
+        return circuit_states()
+
+    def all_agents(self) -> List[AIAgent]:
+        """
+        SDK 클라이언트를 가진 모든 에이전트 인스턴스
+
+        파이프라인 에이전트와 다운그레이드/보정/헤지 대체 모델용 인스턴스를
+        모두 포함합니다 (클라이언트를 바꾸거나 감쌀 때 사용).
+        """
+        agents = [
+            *self.agents,
+            *self.downgrades.values(),
+            *self.refiners.values(),
+            *(hedger.fallback_agent for hedger in self.hedgers.values()),
+        ]
+        unique = {id(agent): agent for agent in agents}
+        return list(unique.values())
+
     async def health_check_all(self) -> Dict[str, bool]:
         """모든 에이전트 상태 확인"""
         results = {}
@@ -0,0 +1,409 @@
+"""
+Declarative DAG pipeline scheduler
+"""
+
+import asyncio
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from difflib import SequenceMatcher
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from models.agent_response import AgentResponse
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# config.yaml에 pipeline 섹션이 없을 때 사용하는 기존 순차 체인
+DEFAULT_PIPELINE = [
+    {"agent": "gemini"},
+    {"agent": "chatgpt", "inputs": ["gemini"]},
+    {"agent": "claude", "inputs": ["gemini", "chatgpt"]},
+]
+
+StageRunner = Callable[["PipelineStage", str, Dict], Awaitable[AgentResponse]]
+
+# 보정 실행 함수: (단계, 질문, 전체 업스트림이 담긴 컨텍스트, 초안) -> 보정된 응답
+StageRefiner = Callable[
+    ["PipelineStage", str, Dict, AgentResponse], Awaitable[AgentResponse]
+]
+
+# 마크다운 섹션 제목 (# ~ ###)
+_SECTION_HEADING = re.compile(r"^#{1,3}\s", re.MULTILINE)
+
+# 미리 받은 부분과 최종 출력의 같은 구간이 이보다 덜 비슷하면 출력이 바뀐 것으로 봄
+PREFIX_SIMILARITY = 0.9
+
+
+@dataclass
+class PipelineStage:
+    """
+    파이프라인 단계 정의
+
+    Attributes:
+        name: 단계 이름 (업스트림 참조 및 결과 키로 사용)
+        agent: 실행할 에이전트 이름 ("gemini" | "chatgpt" | "claude")
+        inputs: 결과를 입력으로 받을 업스트림 단계 이름들
+                (결과는 업스트림 에이전트 기준 "<agent>_result" 키로 전달)
+    """
+
+    name: str
+    agent: str
+    inputs: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_config(cls, spec: Dict) -> "PipelineStage":
+        """설정 딕셔너리에서 단계 생성"""
+        agent = spec["agent"]
+        return cls(
+            name=spec.get("name", agent),
+            agent=agent,
+            inputs=list(spec.get("inputs") or []),
+        )
+
+
+@dataclass
+class EarlyStart:
+    """
+    다운스트림 조기 시작(파이프라이닝) 설정
+
+    Attributes:
+        prefix_sections: 업스트림 스트리밍 출력에서 마크다운 섹션이 이만큼
+                         완성되면(다음 섹션 제목이 나오면) 다운스트림 시작
+        max_unseen: 최종 업스트림 출력 중 다운스트림이 보지 못한 비율이 이보다
+                    크면 보정 대상
+        refiner: 보정 실행 함수 (None이면 보정 없이 초안 사용)
+    """
+
+    prefix_sections: int = 2
+    max_unseen: float = 0.5
+    refiner: Optional[StageRefiner] = None
+
+    @classmethod
+    def from_config(
+        cls, config: Optional[Dict], refiner: Optional[StageRefiner] = None
+    ) -> Optional["EarlyStart"]:
+        """pipelining 설정 섹션에서 생성 (비활성화면 None)"""
+        config = config or {}
+        if not config.get("enabled", False):
+            return None
+        return cls(
+            prefix_sections=config.get("prefix_sections", 2),
+            max_unseen=config.get("max_unseen", 0.5),
+            refiner=refiner if config.get("refine", True) else None,
+        )
+
+    def needs_refinement(self, prefix: str, final: str) -> bool:
+        """다운스트림이 본 부분(prefix)과 최종 업스트림 출력이 크게 다른지"""
+        if not final:
+            # 업스트림이 실패하면 더 나은 입력이 없음
+            return False
+        overlap = final[: len(prefix)]
+        if SequenceMatcher(None, prefix, overlap).ratio() < PREFIX_SIMILARITY:
+            return True
+        return (len(final) - len(prefix)) / len(final) > self.max_unseen
+
+
+class PartialOutput:
+    """업스트림 단계의 스트리밍 출력 누적 (섹션 prefix가 완성되면 ready)"""
+
+    def __init__(self, sections: int):
+        """
+        Args:
+            sections: 다운스트림을 시작시킬 완성 섹션 수
+        """
+        self.sections = sections
+        self.text = ""
+        self.prefix: Optional[str] = None
+        self.ready = asyncio.Event()
+
+    def write(self, chunk: str):
+        """텍스트 조각 추가 (에이전트 on_chunk)"""
+        self.text += chunk
+        if self.ready.is_set():
+            return
+        starts = [m.start() for m in _SECTION_HEADING.finditer(self.text)]
+        # 첫 제목 앞의 서론은 섹션으로 세지 않음, N+1번째 제목이 나오면 N개 완성
+        if len(starts) > self.sections:
+            self.prefix = self.text[: starts[self.sections]].rstrip()
+            self.ready.set()
+
+
+class Pipeline:
+    """
+    의존성 그래프(DAG) 기반 에이전트 파이프라인
+
+    각 단계는 입력으로 선언한 업스트림 단계가 모두 끝나는 즉시 시작되며,
+    서로 의존하지 않는 단계는 병렬로 실행됩니다.
+    """
+
+    def __init__(self, name: str, stages: List[PipelineStage]):
+        """
+        Args:
+            name: 파이프라인 이름
+            stages: 단계 목록
+        """
+        self.name = name
+        self.stages = self._sort_stages(stages)
+        self._depths = self._tail_depths(self.stages)
+
+    @classmethod
+    def from_config(cls, name: str, specs: List[Dict]) -> "Pipeline":
+        """설정 목록에서 파이프라인 생성"""
+        return cls(name, [PipelineStage.from_config(spec) for spec in specs])
+
+    def _sort_stages(self, stages: List[PipelineStage]) -> List[PipelineStage]:
+        """단계 검증 및 위상 정렬 (선언 순서 유지)"""
+        by_name: Dict[str, PipelineStage] = {}
+        for stage in stages:
+            if stage.name in by_name:
+                raise ValueError(
+                    f"파이프라인 '{self.name}': 중복 단계 이름 '{stage.name}'"
+                )
+            by_name[stage.name] = stage
+
+        for stage in stages:
+            unknown = [dep for dep in stage.inputs if dep not in by_name]
+            if unknown:
+                raise ValueError(
+                    f"파이프라인 '{self.name}': 단계 '{stage.name}'의 "
+                    f"알 수 없는 입력 {unknown}"
+                )
+
+            # 업스트림 결과는 에이전트가 읽는 "<agent>_result" 키로 전달되므로
+            # 같은 에이전트의 결과를 두 번 받으면 하나가 덮어써짐
+            input_agents = [by_name[dep].agent for dep in stage.inputs]
+            if len(set(input_agents)) != len(input_agents):
+                raise ValueError(
+                    f"파이프라인 '{self.name}': 단계 '{stage.name}'가 같은 "
+                    f"에이전트의 결과를 여러 번 입력으로 받음 {stage.inputs}"
+                )
+
+        ordered: List[PipelineStage] = []
+        done = set()
+        remaining = list(stages)
+        while remaining:
+            ready = [s for s in remaining if all(d in done for d in s.inputs)]
+            if not ready:
+                cycle = [s.name for s in remaining]
+                raise ValueError(f"파이프라인 '{self.name}': 순환 의존성 {cycle}")
+            for stage in ready:
+                ordered.append(stage)
+                done.add(stage.name)
+                remaining.remove(stage)
+
+        return ordered
+
+    @staticmethod
+    def _tail_depths(stages: List[PipelineStage]) -> Dict[str, int]:
+        """단계별로 자신부터 파이프라인 끝까지 가장 긴 경로의 단계 수"""
+        depths: Dict[str, int] = {}
+        for stage in reversed(stages):
+            downstream = [depths[s.name] for s in stages if stage.name in s.inputs]
+            depths[stage.name] = 1 + max(downstream, default=0)
+        return depths
+
+    def remaining_stages(self, name: str) -> int:
+        """해당 단계를 포함해 끝까지 남은 (가장 긴 경로의) 단계 수"""
+        return self._depths[name]
+
+    @property
+    def agent_names(self) -> List[str]:
+        """파이프라인이 사용하는 에이전트 이름들"""
+        return sorted({stage.agent for stage in self.stages})
+
+    async def run(
+        self,
+        question: str,
+        context: Dict,
+        runner: StageRunner,
+        deadline: Optional[float] = None,
+        early_start: Optional[EarlyStart] = None,
+    ) -> List[AgentResponse]:
+        """
+        파이프라인 실행
+
+        Args:
+            question: 사용자 질문
+            context: 공통 컨텍스트
+            runner: 단계 실행 함수
+                    async (stage, question, stage_context) -> AgentResponse
+            deadline: 파이프라인 전체 기한 (이벤트 루프 시각). 각 단계가 시작될 때
+                      남은 시간을 끝까지 남은 단계 수로 나눠 stage_context["deadline"]에
+                      단계 기한으로 전달
+            early_start: 있으면 다운스트림 단계가 업스트림 출력의 앞부분
+                         (stage_context["on_partial"]로 받은 스트리밍 텍스트)만으로
+                         먼저 시작하고, 최종 업스트림 출력이 크게 다르면 보정
+                         (결과는 metadata["pipelined"]에 기록)
+
+        Returns:
+            단계 순서대로 정렬된 AgentResponse 리스트
+            (단계 이름은 metadata["stage"]에 기록)
+        """
+        tasks: Dict[str, asyncio.Task] = {}
+        by_name = {stage.name: stage for stage in self.stages}
+        loop = asyncio.get_running_loop()
+        finished: Dict[str, float] = {}
+
+        # 다운스트림이 있는 단계의 스트리밍 출력 (조기 시작용)
+        partials: Dict[str, PartialOutput] = {}
+        if early_start:
+            for stage in self.stages:
+                for dep in stage.inputs:
+                    partials.setdefault(dep, PartialOutput(early_start.prefix_sections))
+
+        async def reconcile(
+            stage: PipelineStage,
+            stage_context: Dict,
+            response: AgentResponse,
+            early: Dict[str, str],
+            started: float,
+        ) -> AgentResponse:
+            """조기 시작한 단계: 업스트림이 끝나길 기다려 크게 다르면 보정"""
+            full_context = {
+                k: v
+                for k, v in stage_context.items()
+                if k not in ("on_chunk", "on_partial", "timeout")
+            }
+            inputs = {}
+            refine = False
+            for dep, prefix in early.items():
+                upstream = await tasks[dep]
+                final = upstream.content if upstream.success else ""
+                full_context[f"{by_name[dep].agent}_result"] = final
+                inputs[dep] = {"seen": len(prefix), "total": len(final)}
+                refine = refine or early_start.needs_refinement(prefix, final)
+
+            pipelined = {
+                "inputs": inputs,
+                # 업스트림 완료를 기다렸다면 더 늦게 시작했을 시간
+                "head_start": round(max(finished[d] for d in early) - started, 3),
+                "refined": False,
+            }
+            if refine and response.success and early_start.refiner:
+                logger.info(f"🔧 단계 '{stage.name}' 보정 (업스트림 최종 출력 반영)")
+                try:
+                    refined = await early_start.refiner(
+                        stage, question, full_context, response
+                    )
+                except Exception as e:
+                    logger.error(f"단계 '{stage.name}' 보정 오류: {e}", exc_info=True)
+                    refined = None
+                if refined is not None and refined.success:
+                    response = refined
+                    pipelined["refined"] = True
+
+            response.metadata["pipelined"] = pipelined
+            return response
+
+        async def run_stage(stage: PipelineStage) -> AgentResponse:
+            stage_context = dict(context)
+            if stage.name in partials:
+                stage_context["on_partial"] = partials[stage.name].write
+
+            early: Dict[str, str] = {}
+            for dep in stage.inputs:
+                # 에이전트는 단계 이름이 아니라 "<agent>_result" 키를 읽음
+                key = f"{by_name[dep].agent}_result"
+                prefix = await self._wait_input(tasks[dep], partials.get(dep))
+                if prefix is not None:
+                    early[dep] = prefix
+                    stage_context[key] = prefix
+                else:
+                    upstream = tasks[dep].result()
+                    stage_context[key] = upstream.content if upstream.success else ""
+            started = loop.time()
+
+            if deadline is not None:
+                now = asyncio.get_running_loop().time()
+                share = (deadline - now) / self.remaining_stages(stage.name)
+                stage_context["deadline"] = now + max(0.0, share)
+
+            try:
+                response = await runner(stage, question, stage_context)
+            except Exception as e:
+                logger.error(f"단계 '{stage.name}' 실행 오류: {e}", exc_info=True)
+                response = AgentResponse(
+                    agent_name=stage.agent,
+                    content="",
+                    metadata={},
+                    timestamp=datetime.now(),
+                    success=False,
+                    error=str(e),
+                )
+
+            if early:
+                response = await reconcile(
+                    stage, stage_context, response, early, started
+                )
+
+            response.metadata["stage"] = stage.name
+            finished[stage.name] = loop.time()
+            return response
+
+        for stage in self.stages:
+            tasks[stage.name] = asyncio.create_task(run_stage(stage))
+
+        try:
+            return list(await asyncio.gather(*tasks.values()))
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+    @staticmethod
+    async def _wait_input(
+        upstream: asyncio.Task, partial: Optional[PartialOutput]
+    ) -> Optional[str]:
+        """
+        업스트림 입력 대기
+
+        Returns:
+            업스트림이 끝나기 전에 앞부분이 준비되면 그 텍스트, 끝났으면 None
+        """
+        if partial is None:
+            await asyncio.wait([upstream])
+            return None
+
+        ready = asyncio.ensure_future(partial.ready.wait())
+        try:
+            await asyncio.wait([upstream, ready], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            ready.cancel()
+        return None if upstream.done() else partial.prefix
+
+
+class PipelineRegistry:
+    """
+    카테고리별 파이프라인 조회
+
+    config.yaml 형식:
+        pipeline:
+          default: [...]
+          categories:
+            <카테고리>: [...]
+    """
+
+    def __init__(self, default: Pipeline, categories: Dict[str, Pipeline]):
+        self.default = default
+        self.categories = categories
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> "PipelineRegistry":
+        """pipeline 설정 섹션에서 생성"""
+        config = config or {}
+        default = Pipeline.from_config(
+            "default", config.get("default") or DEFAULT_PIPELINE
+        )
+        categories = {
+            category: Pipeline.from_config(category, specs)
+            for category, specs in (config.get("categories") or {}).items()
+        }
+        return cls(default, categories)
+
+    def get(self, category: Optional[str]) -> Pipeline:
+        """카테고리에 맞는 파이프라인 반환 (없으면 기본)"""
+        return self.categories.get(category, self.default)
+
+    def all(self) -> List[Pipeline]:
+        """등록된 모든 파이프라인"""
+        return [self.default, *self.categories.values()]
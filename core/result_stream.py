@@ -0,0 +1,266 @@
+"""
+Progressive result page updates from streaming agent output
+"""
+
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional
+
+from integrations.notion_blocks import markdown_to_blocks, text_blocks
+from integrations.notion_client import NotionClient
+from models.question import Question
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 최종 응답이 이미 올린 내용과 이어지지 않을 때 덧붙이는 안내
+MISMATCH_NOTE = "⚠️ 스트리밍 중 올라간 내용과 최종 응답이 다릅니다. 최종 응답:"
+
+
+class _Section:
+    """섹션 하나의 스트리밍 버퍼"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.text = ""  # 지금까지 받은 전체 텍스트
+        self.flushed = 0  # 페이지에 올린 길이
+        self.lock = asyncio.Lock()
+        self.task: Optional[asyncio.Task] = None
+
+
+class ResultStream:
+    """
+    스트리밍 결과 페이지
+
+    첫 에이전트가 토큰을 내기 시작하면 결과 페이지 뼈대(원본 질문, 통합 분석
+    제목, 단계별 토글)를 만들고, 각 섹션에 쌓인 텍스트를 완결된 문단 단위로
+    flush_chars자 또는 flush_interval초마다 이어 붙입니다(모두 Notion 레이트
+    리미터를 거침). 처리가 끝나면 finish로 남은 내용과 처리 정보를 붙입니다.
+
+    Notion 쓰기가 실패하면 스트리밍을 멈추고 만들던 페이지를 보관 처리하며,
+    finish가 None을 반환하므로 호출자는 기존처럼 결과 페이지를 한 번에
+    만들면 됩니다.
+    """
+
+    def __init__(
+        self,
+        notion_client: NotionClient,
+        question: Question,
+        sections: List[str],
+        flush_chars: int = 1500,
+        flush_interval: float = 3.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            notion_client: NotionClient 인스턴스
+            question: 원본 질문
+            sections: 파이프라인 단계 이름 목록
+            flush_chars: 이만큼 쌓이면 바로 이어 붙임 (자)
+            flush_interval: 마지막으로 붙인 뒤 이만큼 지나면 쌓인 만큼 이어 붙임 (초)
+            clock: 시계 함수 (테스트용)
+        """
+        self.notion = notion_client
+        self.question = question
+        self.flush_chars = flush_chars
+        self.flush_interval = flush_interval
+        self.clock = clock
+
+        self.sections: Dict[str, _Section] = {
+            name: _Section(name) for name in ["synthesis", *sections]
+        }
+        self.page: Optional[Dict] = None
+        self.failed = False
+        self.api_calls = 0
+
+        self._started = clock()
+        self._last_flush = self._started
+        self._page_task: Optional[asyncio.Task] = None
+
+        # 질문 처리 시작부터 페이지에 첫 내용이 보일 때까지 걸린 시간 (초)
+        self.time_to_first_content: Optional[float] = None
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Optional[Dict],
+        notion_client: NotionClient,
+        question: Question,
+        sections: List[str],
+    ) -> Optional["ResultStream"]:
+        """streaming 설정으로 생성 (비활성화면 None)"""
+        config = config or {}
+        if not config.get("enabled", False):
+            return None
+        return cls(
+            notion_client,
+            question,
+            sections,
+            flush_chars=config.get("flush_chars", 1500),
+            flush_interval=config.get("flush_interval", 3.0),
+        )
+
+    def writer(self, section: str) -> Callable[[str], None]:
+        """섹션의 텍스트 조각 콜백 (에이전트의 on_chunk)"""
+        state = self.sections.setdefault(section, _Section(section))
+
+        def write(text: str):
+            if self.failed:
+                return
+            state.text += text
+            if self._page_task is None:
+                self._page_task = asyncio.create_task(self._create_page())
+            if self._flush_due(state) and not (state.task and not state.task.done()):
+                state.task = asyncio.create_task(self._flush(state))
+
+        return write
+
+    async def finish(self, result: Dict) -> Optional[Dict]:
+        """
+        남은 내용과 처리 정보를 붙여 페이지 완성
+
+        Args:
+            result: Orchestrator.process_question 결과 (성공)
+
+        Returns:
+            {'id': '...', 'url': '...'} (스트리밍한 적이 없거나 실패했으면 None)
+        """
+        if self._page_task is None:
+            return None
+
+        await self._page_task
+        await asyncio.gather(
+            *(s.task for s in self.sections.values() if s.task),
+            return_exceptions=True,
+        )
+        if self.failed:
+            return None
+
+        final = {"synthesis": {"success": True, "content": result["synthesis"]}}
+        for key, response in result["responses"].items():
+            final[(response.get("metadata") or {}).get("stage", key)] = response
+
+        try:
+            for name, response in final.items():
+                state = self.sections.get(name)
+                if state is None or name not in self.page["sections"]:
+                    continue
+                await self._finish_section(state, response)
+
+            metadata = result["metadata"]
+            metadata["time_to_first_content"] = self.time_to_first_content
+            await self.notion.finish_result_page(self.page["id"], metadata)
+            self.api_calls += 2
+
+        except Exception as e:
+            logger.error(f"스트리밍 결과 페이지 마무리 실패: {e}")
+            result["metadata"].pop("time_to_first_content", None)
+            await self.abort()
+            return None
+
+        logger.info(
+            f"✅ 스트리밍 결과 페이지 완료: {self.page['url']} "
+            f"(API 호출 약 {self.api_calls}회)"
+        )
+        return {"id": self.page["id"], "url": self.page["url"]}
+
+    async def abort(self):
+        """스트리밍 중단 (만든 페이지는 보관 처리)"""
+        self.failed = True
+        if self._page_task is None:
+            return
+        try:
+            await self._page_task
+        except Exception:
+            pass
+        await asyncio.gather(
+            *(s.task for s in self.sections.values() if s.task),
+            return_exceptions=True,
+        )
+        if self.page:
+            await self.notion.archive_page(self.page["id"])
+            self.page = None
+
+    def _flush_due(self, state: _Section) -> bool:
+        """섹션을 지금 이어 붙일지 여부"""
+        pending = len(state.text) - state.flushed
+        if pending >= self.flush_chars:
+            return True
+        return pending > 0 and self.clock() - self._last_flush >= self.flush_interval
+
+    async def _create_page(self):
+        """결과 페이지 뼈대 생성"""
+        try:
+            sections = [name for name in self.sections if name != "synthesis"]
+            self.page = await self.notion.create_result_shell(self.question, sections)
+            self.api_calls += 2
+            logger.info(f"📄 스트리밍 결과 페이지 생성: {self.page['url']}")
+        except Exception as e:
+            logger.error(f"스트리밍 결과 페이지 생성 실패, 일괄 생성으로 전환: {e}")
+            self.failed = True
+
+    async def _flush(self, state: _Section):
+        """섹션에 쌓인 완결된 문단들을 이어 붙임"""
+        await self._page_task
+        if self.failed or state.name not in self.page["sections"]:
+            return
+
+        async with state.lock:
+            end = self._complete_prefix(state.text, state.flushed)
+            if end <= state.flushed:
+                return
+            await self._append(state, state.text[state.flushed : end], end)
+
+    async def _finish_section(self, state: _Section, response: Dict):
+        """최종 응답 중 아직 올리지 않은 부분을 이어 붙임"""
+        async with state.lock:
+            content = response["content"] if response.get("success") else ""
+            streamed = state.text[: state.flushed]
+
+            if response.get("success") and content.startswith(streamed):
+                await self._append(state, content[state.flushed :], len(content))
+                return
+
+            blocks = []
+            if state.flushed:
+                blocks.extend(text_blocks("callout", MISMATCH_NOTE, markdown=False))
+            blocks.extend(NotionClient._response_blocks(response))
+            self.api_calls += await self.notion.append_blocks(
+                self.page["sections"][state.name], blocks
+            )
+
+    async def _append(self, state: _Section, text: str, end: int):
+        """마크다운 텍스트를 섹션 블록 아래에 이어 붙임"""
+        blocks = markdown_to_blocks(text)
+        if blocks:
+            try:
+                self.api_calls += await self.notion.append_blocks(
+                    self.page["sections"][state.name], blocks
+                )
+            except Exception as e:
+                logger.error(f"스트리밍 내용 추가 실패 ({state.name}): {e}")
+                self.failed = True
+                raise
+
+            if self.time_to_first_content is None:
+                self.time_to_first_content = round(self.clock() - self._started, 3)
+                logger.info(
+                    f"⚡ 첫 내용 표시: {self.time_to_first_content:.1f}초 ({state.name})"
+                )
+
+        state.flushed = end
+        self._last_flush = self.clock()
+
+    @staticmethod
+    def _complete_prefix(text: str, start: int) -> int:
+        """
+        start 이후에서 안전하게 자를 수 있는 마지막 위치
+
+        빈 줄(문단 경계) 직후이면서 코드 블록(```) 밖인 위치만 사용합니다.
+        """
+        end = text.rfind("\n\n", start)
+        while end >= start:
+            if text.count("```", 0, end) % 2 == 0:
+                return end + 2
+            end = text.rfind("\n\n", start, end)
+        return start
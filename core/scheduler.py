@@ -0,0 +1,403 @@
+"""
+Priority scheduler with aging for inbox questions
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from core.hedging import LatencyTracker
+from models.question import Question, QuestionPriority
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _Entry:
+    """대기 중인 질문"""
+
+    question: Question
+    enqueued_at: float
+    seq: int
+    key: str = ""  # 공정 분배 키 (공정 분배가 꺼져 있으면 "")
+    level: int = 0  # 현재 유효 우선순위 (에이징으로 낮아짐)
+    taken: bool = False
+    held: bool = False
+
+
+# 키별 대기 힙: (들어온 순서, 항목). 에이징/붙잡기로 자리를 옮긴 항목은 힙에서
+# 바로 지우지 않고 맨 앞에 올라왔을 때 버림
+_Heap = List[Tuple[int, _Entry]]
+
+# 유효 우선순위 단계 수 (HIGH=0 … LOW)
+_LEVELS = max(priority.rank for priority in QuestionPriority) + 1
+
+
+class QuestionScheduler:
+    """
+    워커에 질문을 공급하는 우선순위 큐
+
+    QuestionPriority 순(HIGH → MEDIUM → LOW)으로 꺼내고, 같은 우선순위는
+    들어온 순서를 지킵니다. aging_interval초 기다릴 때마다 한 단계씩 올려 주므로
+    LOW 질문도 무한정 밀리지 않습니다. high_only로 꺼내는 워커(HIGH 전용 슬롯)는
+    원래 우선순위가 HIGH인 질문만 받습니다.
+
+    fair_share가 켜져 있으면 같은 유효 우선순위 안에서는 공정 분배 키(카테고리,
+    작성자가 있으면 "카테고리/작성자")별 가중 공정 큐잉(start-time fair queuing)
+    으로 고릅니다. 키마다 받은 처리 수 / 가중치를 가상 시간으로 쌓아 가장 적게
+    받은 키부터 꺼내므로, 한 팀이 질문 수백 개를 넣어도 다른 키의 질문이 사이사이
+    처리됩니다. 대기 중인 키가 하나뿐이면 그 키가 모든 워커를 씁니다.
+
+    hold가 주어지면 hold(question)이 참인 질문(예: 일일 예산이 찼을 때의 LOW
+    질문)은 꺼내지 않고 별도 목록에 남겨 두며, recheck_interval초마다(꺼낼
+    질문이 없으면 바로) 다시 확인합니다.
+
+    유효 우선순위 단계마다 키별 힙을 두고, 에이징은 원래 우선순위/현재 단계별
+    도착순 큐의 앞쪽(가장 오래 기다린 질문)만 다음 단계로 옮기므로 질문 수천
+    개가 밀려 있어도 꺼낼 때마다 전체를 훑지 않습니다 (O(log n + 키 수)).
+
+    watcher의 asyncio.Queue 자리에 그대로 쓸 수 있도록 put_nowait/get/get_nowait/
+    qsize/empty(와 종료용 clear)를 제공하며, None을 넣으면 꺼낸 워커가 종료
+    신호로 받습니다.
+
+    config.yaml 형식 (fair_share):
+        enabled: true
+        default_weight: 1.0
+        weights:
+          마케팅: 2.0            # 카테고리 전체
+          "법무/user-id": 0.5    # 카테고리 + 작성자
+    """
+
+    def __init__(
+        self,
+        aging_interval: Optional[float] = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        fair_share: Optional[Dict] = None,
+        hold: Optional[Callable[[Question], bool]] = None,
+        recheck_interval: float = 60.0,
+    ):
+        """
+        Args:
+            aging_interval: 이만큼 기다릴 때마다 우선순위 한 단계 상승 (초, None이면 없음)
+            clock: 시계 함수 (테스트용)
+            fair_share: 공정 분배 설정 섹션 (없거나 enabled가 false면 FIFO)
+            hold: 참이면 그 질문을 꺼내지 않음 (예산 소진시 LOW 질문 대기)
+            recheck_interval: 붙잡아 둔 질문만 남았을 때 hold 재확인 간격 (초)
+        """
+        self.aging_interval = aging_interval
+        self.clock = clock
+        self.hold = hold
+        self.recheck_interval = recheck_interval
+
+        fair_share = fair_share or {}
+        self.fair = fair_share.get("enabled", False)
+        self.weights: Dict[str, float] = dict(fair_share.get("weights") or {})
+        self.default_weight = fair_share.get("default_weight", 1.0)
+
+        # 키별 가상 완료 시간과 시스템 가상 시간 (마지막으로 꺼낸 질문의 시작 태그)
+        self._finish: Dict[str, float] = {}
+        self._virtual_time = 0.0
+        self._dispatched: Dict[str, int] = {}
+
+        self._seq = itertools.count()
+        self._changed = asyncio.Event()
+        self._reset()
+
+        # 우선순위별 대기 시간 (꺼낼 때 기록)
+        self._waits: Dict[QuestionPriority, LatencyTracker] = {
+            priority: LatencyTracker() for priority in QuestionPriority
+        }
+        self._dequeued: Dict[QuestionPriority, int] = {p: 0 for p in QuestionPriority}
+        self._total_wait: Dict[QuestionPriority, float] = {
+            p: 0.0 for p in QuestionPriority
+        }
+
+    def _reset(self):
+        """대기열 초기화 (통계와 공정 분배 상태는 유지)"""
+        self._entries: Dict[int, _Entry] = {}
+        self._stops = 0
+        # 유효 우선순위 단계별 → 키별 힙
+        self._levels: List[Dict[str, _Heap]] = [{} for _ in range(_LEVELS)]
+        # HIGH 전용 슬롯용 원래 우선순위가 HIGH인 질문 (키별 힙)
+        self._high: Dict[str, _Heap] = {}
+        # 에이징 대상: (원래 우선순위, 현재 단계)별 도착순 큐
+        self._aging: Dict[Tuple[int, int], Deque[_Entry]] = {}
+        self._held_entries: List[_Entry] = []
+        self._held_checked = self.clock()
+
+    def put_nowait(self, question: Optional[Question]):
+        """질문 추가 (None이면 워커 종료 신호)"""
+        if question is None:
+            self._stops += 1
+        else:
+            rank = question.priority.rank
+            entry = _Entry(
+                question,
+                self.clock(),
+                next(self._seq),
+                key=self.fair_key(question) if self.fair else "",
+                level=rank,
+            )
+            self._entries[entry.seq] = entry
+            self._push(entry)
+            if rank > 0 and self.aging_interval:
+                self._aging.setdefault((rank, rank), deque()).append(entry)
+        self._changed.set()
+
+    async def get(self, high_only: bool = False) -> Optional[Question]:
+        """
+        다음 질문 대기
+
+        Args:
+            high_only: True면 HIGH 질문만 (HIGH 전용 슬롯)
+        """
+        while True:
+            if self._stops:
+                self._stops -= 1
+                return None
+            entry = self._pick(high_only)
+            if entry:
+                return self._take(entry)
+            self._changed.clear()
+            if self._held_entries:
+                # 붙잡아 둔 질문은 조건(예산 등)이 풀리면 꺼낼 수 있도록 주기적으로 재확인
+                try:
+                    await asyncio.wait_for(
+                        self._changed.wait(), timeout=self.recheck_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await self._changed.wait()
+
+    def get_nowait(self) -> Optional[Question]:
+        """다음 질문 즉시 꺼내기 (없으면 asyncio.QueueEmpty)"""
+        if self._stops:
+            self._stops -= 1
+            return None
+        entry = self._pick(high_only=False)
+        if entry is None:
+            raise asyncio.QueueEmpty
+        return self._take(entry)
+
+    def clear(self) -> int:
+        """
+        대기 중인 질문과 종료 신호를 모두 버림 (붙잡아 둔 질문 포함)
+
+        Returns:
+            버린 질문 수
+        """
+        dropped = len(self._entries)
+        self._reset()
+        return dropped
+
+    def qsize(self) -> int:
+        return len(self._entries) + self._stops
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def effective_rank(self, entry: _Entry, now: float) -> int:
+        """대기 시간을 반영한 우선순위 (0이 가장 높음)"""
+        rank = entry.question.priority.rank
+        if self.aging_interval:
+            rank -= int((now - entry.enqueued_at) // self.aging_interval)
+        return max(0, rank)
+
+    @staticmethod
+    def fair_key(question: Question) -> str:
+        """공정 분배 키 (카테고리, 작성자가 있으면 "카테고리/작성자")"""
+        category = question.category or "기타"
+        if question.created_by:
+            return f"{category}/{question.created_by}"
+        return category
+
+    def weight(self, key: str) -> float:
+        """키 가중치 (키 전체 → 카테고리 → 기본값 순으로 조회)"""
+        if key in self.weights:
+            return self.weights[key]
+        category = key.split("/", 1)[0]
+        return self.weights.get(category, self.default_weight)
+
+    def fair_stats(self) -> Dict[str, Dict[str, float]]:
+        """공정 분배 키별 처리/대기 현황"""
+        entries = list(self._entries.values())
+        keys = set(self._dispatched) | {self.fair_key(e.question) for e in entries}
+        return {
+            key: {
+                "weight": self.weight(key),
+                "dispatched": self._dispatched.get(key, 0),
+                "queued": sum(1 for e in entries if self.fair_key(e.question) == key),
+                "virtual_finish": round(self._finish.get(key, 0.0), 3),
+            }
+            for key in sorted(keys)
+        }
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """우선순위별 대기 현황 및 대기 시간"""
+        now = self.clock()
+        entries = list(self._entries.values())
+        result = {}
+        for priority in QuestionPriority:
+            count = self._dequeued[priority]
+            tracker = self._waits[priority]
+            result[priority.value] = {
+                "queued": sum(1 for e in entries if e.question.priority == priority),
+                "held": sum(
+                    1
+                    for e in entries
+                    if e.question.priority == priority and self._held(e)
+                ),
+                "oldest": max(
+                    (
+                        now - e.enqueued_at
+                        for e in entries
+                        if e.question.priority == priority
+                    ),
+                    default=0.0,
+                ),
+                "dequeued": count,
+                "avg_wait": self._total_wait[priority] / count if count else 0.0,
+                "p95_wait": tracker.percentile(95) or 0.0,
+            }
+        return result
+
+    def _pick(self, high_only: bool) -> Optional[_Entry]:
+        """꺼낼 질문 선택 (유효 우선순위, 들어온 순서)"""
+        now = self.clock()
+        self._age(now)
+        if now - self._held_checked >= self.recheck_interval:
+            self._release_held(now)
+
+        released = False
+        while True:
+            heads = self._heads(high_only)
+            if not heads:
+                # 꺼낼 질문이 없으면 붙잡아 둔 질문을 바로 재확인
+                if released or not self._held_entries:
+                    return None
+                self._release_held(now)
+                released = True
+                continue
+
+            oldest = min(heads, key=lambda e: e.seq)
+            entry = oldest
+            if self.fair:
+                # 가장 높은 유효 우선순위 안에서 가상 시작 시간이 가장 이른 키의 첫 질문
+                entry = min(heads, key=lambda e: (self._start_tag(e), e.seq))
+            if self._held(entry):
+                entry.held = True
+                self._held_entries.append(entry)
+                continue
+
+            if entry is not oldest:
+                logger.info(
+                    f"⚖️  공정 분배: {entry.key} 선택 "
+                    f"({oldest.key}의 더 오래된 질문보다 먼저)"
+                )
+            return entry
+
+    def _heads(self, high_only: bool) -> List[_Entry]:
+        """가장 높은 유효 우선순위 단계에서 키별 첫 질문"""
+        levels = [self._high] if high_only else self._levels
+        for level, heaps in enumerate(levels):
+            heads = []
+            for key in list(heaps):
+                heap = heaps[key]
+                while heap and self._stale(heap[0][1], None if high_only else level):
+                    heapq.heappop(heap)
+                if heap:
+                    heads.append(heap[0][1])
+                else:
+                    del heaps[key]
+            if heads:
+                return heads
+        return []
+
+    @staticmethod
+    def _stale(entry: _Entry, level: Optional[int]) -> bool:
+        """힙에 남은 옛 자리 (꺼냈거나, 붙잡았거나, 다른 단계로 옮긴 항목)"""
+        return entry.taken or entry.held or (level is not None and entry.level != level)
+
+    def _push(self, entry: _Entry):
+        """현재 유효 우선순위 단계 힙에 넣기"""
+        item = (entry.seq, entry)
+        heapq.heappush(self._levels[entry.level].setdefault(entry.key, []), item)
+        if entry.question.priority == QuestionPriority.HIGH:
+            heapq.heappush(self._high.setdefault(entry.key, []), item)
+
+    def _age(self, now: float):
+        """오래 기다린 질문을 다음 유효 우선순위 단계로 이동"""
+        if not self.aging_interval:
+            return
+        # 같은 원래 우선순위 안에서는 먼저 들어온 질문이 항상 먼저 올라가므로
+        # 각 큐의 앞쪽만 확인 (옮긴 질문은 다음 단계 큐의 뒤에 붙여도 도착순 유지)
+        for rank, level in sorted(self._aging, reverse=True):
+            queue = self._aging[(rank, level)]
+            while queue:
+                entry = queue[0]
+                if entry.taken:
+                    queue.popleft()
+                    continue
+                target = self.effective_rank(entry, now)
+                if target >= level:
+                    break
+                queue.popleft()
+                entry.level = target
+                if not entry.held:
+                    self._push(entry)
+                if target > 0:
+                    self._aging.setdefault((rank, target), deque()).append(entry)
+
+    def _release_held(self, now: float):
+        """붙잡아 둔 질문 중 조건이 풀린 질문을 다시 대기열로"""
+        self._held_checked = now
+        still_held = []
+        for entry in self._held_entries:
+            if entry.taken:
+                continue
+            if self._held(entry):
+                still_held.append(entry)
+            else:
+                entry.held = False
+                self._push(entry)
+        self._held_entries = still_held
+
+    def _held(self, entry: _Entry) -> bool:
+        return bool(self.hold and self.hold(entry.question))
+
+    def _start_tag(self, entry: _Entry) -> float:
+        """키의 다음 질문 가상 시작 시간 (쉬던 키는 현재 가상 시간부터 시작)"""
+        return max(self._finish.get(entry.key, 0.0), self._virtual_time)
+
+    def _take(self, entry: _Entry) -> Question:
+        """질문을 큐에서 빼고 대기 시간 기록"""
+        if self.fair:
+            key = entry.key
+            start = self._start_tag(entry)
+            self._finish[key] = start + 1.0 / self.weight(key)
+            self._virtual_time = start
+            self._dispatched[key] = self._dispatched.get(key, 0) + 1
+
+        # 힙/에이징 큐의 자리는 맨 앞에 올라왔을 때 버림
+        entry.taken = True
+        del self._entries[entry.seq]
+        now = self.clock()
+        waited = now - entry.enqueued_at
+        priority = entry.question.priority
+        self._waits[priority].record(waited)
+        self._dequeued[priority] += 1
+        self._total_wait[priority] += waited
+
+        rank = self.effective_rank(entry, now)
+        if rank < priority.rank:
+            logger.info(
+                f"⏫ 대기 {waited:.0f}초로 우선순위 상승: "
+                f"{entry.question.page_id} ({priority.value})"
+            )
+        return entry.question
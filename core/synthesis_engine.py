@@ -3,9 +3,14 @@ Synthesis Engine for merging AI responses
 """
 
 import anthropic
-from typing import List
+from datetime import datetime
+from typing import Callable, List, Optional
+from agents.claude_agent import cached_system, send_message
+from core.batch import BatchRunner
 from models.agent_response import AgentResponse
+from utils.cost import cost_tracker
 from utils.logger import get_logger
+from utils.rate_limiter import estimate_tokens, rate_limiters
 
 logger = get_logger(__name__)
 
@@ -15,50 +20,151 @@ class SynthesisEngine:
     3개 AI 응답을 통합하여 지능형 합의 생성
     """
 
+    # 고정 지시문 (프롬프트 캐시 접두사). 질문과 전문가 답변은 사용자 메시지로
+    system_prompt = """
+당신은 최고의 비즈니스 의사결정 컨설턴트입니다.
+
+사용자 메시지에 질문과, 3명의 전문가(정보 수집, 전략 분석, 실행 계획)가
+각자의 관점에서 작성한 답변이 주어집니다.
+
+당신의 임무:
+1. 3명의 의견을 **종합**하여 하나의 일관된 분석 생성
+2. 의견이 일치하는 부분과 **상충하는 부분** 명확히 구분
+3. 상충시 **가장 타당한 의견** 선택하고 이유 설명
+4. 누락된 중요 사항이 있다면 **보완**
+5. 최종적으로 **실행 가능한 단일 권고안** 제시
+
+**출력 구조:**
+# 종합 분석
+## 핵심 발견사항 (3-5개)
+## 전문가 의견 일치 영역
+## 의견 상충 및 해결
+## 보완 사항
+## 최종 권고사항
+## Next Steps (우선순위별)
+
+**명확하고 실행 가능하게 작성하세요.**
+""".strip()
+
     def __init__(self, api_key: str):
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.client = anthropic.AsyncAnthropic(api_key=api_key)
         self.model = "claude-sonnet-4-5-20250929"
+        self.max_tokens = 5000
 
-    async def synthesize(self, question: str, responses: List[AgentResponse]) -> str:
+    async def synthesize(
+        self,
+        question: str,
+        responses: List[AgentResponse],
+        timeout: Optional[float] = None,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        batch: Optional[BatchRunner] = None,
+    ) -> AgentResponse:
         """
         3개 응답을 통합
 
         Args:
             question: 원본 질문
-            responses: [gemini_response, chatgpt_response, claude_response]
+            responses: 에이전트 응답 (같은 에이전트가 여러 단계를 맡았으면 모두)
+            timeout: SDK 요청 타임아웃 (초, 남은 질문 기한)
+            on_chunk: 있으면 스트리밍으로 호출하고 텍스트 조각마다 호출
+            batch: 있으면 실시간 호출 대신 Anthropic 배치 API로 처리
 
         Returns:
-            통합된 최종 분석
+            통합된 최종 분석 (agent_name="synthesis")
         """
+        start_time = datetime.now()
 
         # 응답 정리
-        gemini = next((r for r in responses if r.agent_name == "gemini"), None)
-        chatgpt = next((r for r in responses if r.agent_name == "chatgpt"), None)
-        claude = next((r for r in responses if r.agent_name == "claude"), None)
-
-        if not all([gemini, chatgpt, claude]):
+        names = {r.agent_name for r in responses}
+        if not {"gemini", "chatgpt", "claude"} <= names:
             logger.warning("일부 에이전트 응답 누락")
 
         prompt = self._build_synthesis_prompt(
             question,
-            gemini.content if gemini and gemini.success else "정보 없음",
-            chatgpt.content if chatgpt and chatgpt.success else "분석 없음",
-            claude.content if claude and claude.success else "계획 없음",
+            self._agent_content(responses, "gemini", "정보 없음"),
+            self._agent_content(responses, "chatgpt", "분석 없음"),
+            self._agent_content(responses, "claude", "계획 없음"),
         )
 
+        request = dict(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            system=cached_system(self.system_prompt),
+            messages=[{"role": "user", "content": prompt}],
+        )
+        price_factor = 1.0
+
         try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=5000,
-                messages=[{"role": "user", "content": prompt}],
+            if batch and batch.supports("anthropic"):
+                # 배치 API: 실시간 레이트 리미터를 거치지 않고 완료까지 대기
+                reply = await batch.call("anthropic", request)
+                metadata = {"batch": True}
+                price_factor = batch.price_factor
+            else:
+                limiter = rate_limiters["anthropic"]
+                estimate = (
+                    estimate_tokens(self.system_prompt + prompt) + self.max_tokens
+                )
+                await limiter.acquire(tokens=estimate)
+                reply = await send_message(
+                    self.client,
+                    on_chunk,
+                    **request,
+                    **({"timeout": timeout} if timeout else {}),
+                )
+                limiter.reconcile(
+                    estimate, reply["input_tokens"] + reply["output_tokens"]
+                )
+                limiter.observe()
+                metadata = {"first_token": reply["first_token"]}
+            content = reply["text"]
+            metadata.update(
+                cost_tracker.record(
+                    self.model,
+                    reply["input_tokens"],
+                    reply["output_tokens"],
+                    cache_read_tokens=reply["cache_read_tokens"],
+                    cache_write_tokens=reply["cache_write_tokens"],
+                    price_factor=price_factor,
+                )
             )
 
-            return message.content[0].text
+            return AgentResponse(
+                agent_name="synthesis",
+                content=content,
+                metadata={
+                    "duration": (datetime.now() - start_time).total_seconds(),
+                    "model": self.model,
+                    **metadata,
+                },
+                timestamp=datetime.now(),
+                success=True,
+            )
 
         except Exception as e:
+            rate_limiters["anthropic"].observe(e)
             logger.error(f"통합 엔진 오류: {e}", exc_info=True)
             raise
 
+    @staticmethod
+    def _agent_content(
+        responses: List[AgentResponse], agent_name: str, missing: str
+    ) -> str:
+        """
+        에이전트의 성공한 응답 내용
+
+        파이프라인에서 같은 에이전트가 여러 단계를 맡았으면 단계 이름을 붙여
+        모두 이어 붙입니다. 성공한 응답이 없으면 missing.
+        """
+        found = [r for r in responses if r.agent_name == agent_name and r.success]
+        if not found:
+            return missing
+        if len(found) == 1:
+            return found[0].content
+        return "\n\n".join(
+            f"### {r.metadata.get('stage', agent_name)}\n{r.content}" for r in found
+        )
+
     def _build_synthesis_prompt(
         self,
         question: str,
@@ -66,13 +172,9 @@ class SynthesisEngine:
         chatgpt_content: str,
         claude_content: str,
     ) -> str:
-        """통합 프롬프트 생성"""
+        """통합 프롬프트 생성 (가변 부분, 고정 지시문은 system_prompt)"""
 
         prompt = f"""
-당신은 최고의 비즈니스 의사결정 컨설턴트입니다.
-
-3명의 전문가가 다음 질문에 대해 각자의 관점에서 답변했습니다:
-
 **질문:** {question}
 
 ---
@@ -89,25 +191,5 @@ class SynthesisEngine:
 
 **전문가 3 (실행 계획):**
 {claude_content}
-
----
-
-당신의 임무:
-1. 3명의 의견을 **종합**하여 하나의 일관된 분석 생성
-2. 의견이 일치하는 부분과 **상충하는 부분** 명확히 구분
-3. 상충시 **가장 타당한 의견** 선택하고 이유 설명
-4. 누락된 중요 사항이 있다면 **보완**
-5. 최종적으로 **실행 가능한 단일 권고안** 제시
-
-**출력 구조:**
-# 종합 분석
-## 핵심 발견사항 (3-5개)
-## 전문가 의견 일치 영역
-## 의견 상충 및 해결
-## 보완 사항
-## 최종 권고사항
-## Next Steps (우선순위별)
-
-**명확하고 실행 가능하게 작성하세요.**
 """
         return prompt.strip()
@@ -0,0 +1,277 @@
+"""
+Markdown to Notion block conversion and request batching
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Notion API 제한
+MAX_TEXT_LENGTH = 2000  # rich_text 객체 하나의 content 길이 (UTF-16 기준)
+MAX_RICH_TEXT_ITEMS = 100  # rich_text 배열 길이
+MAX_CHILDREN = 100  # 요청 하나의 children 배열 길이
+MAX_BLOCKS_PER_REQUEST = 1000  # 요청 하나의 전체 블록 수 (중첩 포함)
+
+# Notion 코드 블록이 지원하는 주요 언어 (그 외는 plain text)
+CODE_LANGUAGES = {
+    "bash": "bash",
+    "sh": "shell",
+    "shell": "shell",
+    "c": "c",
+    "cpp": "c++",
+    "c++": "c++",
+    "css": "css",
+    "go": "go",
+    "html": "html",
+    "java": "java",
+    "javascript": "javascript",
+    "js": "javascript",
+    "json": "json",
+    "kotlin": "kotlin",
+    "markdown": "markdown",
+    "md": "markdown",
+    "python": "python",
+    "py": "python",
+    "ruby": "ruby",
+    "rust": "rust",
+    "sql": "sql",
+    "swift": "swift",
+    "typescript": "typescript",
+    "ts": "typescript",
+    "yaml": "yaml",
+    "yml": "yaml",
+}
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*)$")
+_BULLET = re.compile(r"^\s*[-*+]\s+(.*)$")
+_TODO = re.compile(r"^\s*[-*+]\s+\[([ xX])\]\s+(.*)$")
+_NUMBERED = re.compile(r"^\s*\d+[.)]\s+(.*)$")
+_QUOTE = re.compile(r"^>\s?(.*)$")
+_DIVIDER = re.compile(r"^\s*(?:-{3,}|\*{3,}|_{3,})\s*$")
+_FENCE = re.compile(r"^\s*```\s*([\w+#-]*)\s*$")
+_TABLE = re.compile(r"^\s*\|.*\|\s*$")
+
+# **굵게**, *기울임*, `코드`, [링크](url)
+_INLINE = re.compile(
+    r"\*\*(?P<bold>.+?)\*\*"
+    r"|(?<![*\w])\*(?P<italic>[^*\n]+?)\*(?!\*)"
+    r"|`(?P<code>[^`\n]+)`"
+    r"|\[(?P<label>[^\]\n]+)\]\((?P<url>https?://[^)\s]+)\)"
+)
+
+
+def _utf16_len(text: str) -> int:
+    """Notion이 세는 방식(UTF-16 코드 단위)의 길이"""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def split_text(text: str, limit: int = MAX_TEXT_LENGTH) -> List[str]:
+    """
+    텍스트를 limit 이하 조각으로 분할
+
+    가능하면 줄바꿈이나 공백에서 자르고, 없으면 글자 단위로 자릅니다.
+    """
+    chunks = []
+    while _utf16_len(text) > limit:
+        cut = limit
+        while _utf16_len(text[:cut]) > limit:
+            cut -= 1
+        boundary = max(text.rfind("\n", 0, cut), text.rfind(" ", 0, cut))
+        if boundary > cut // 2:
+            cut = boundary + 1
+        chunks.append(text[:cut])
+        text = text[cut:]
+    if text or not chunks:
+        chunks.append(text)
+    return chunks
+
+
+def _text_object(content: str, annotations: Dict, url: Optional[str]) -> Dict:
+    item: Dict = {"type": "text", "text": {"content": content}}
+    if url:
+        item["text"]["link"] = {"url": url}
+    if annotations:
+        item["annotations"] = dict(annotations)
+    return item
+
+
+def rich_text(text: str, markdown: bool = True) -> List[Dict]:
+    """
+    텍스트를 rich_text 배열로 변환 (인라인 서식 해석, 2000자 단위 분할)
+
+    Args:
+        text: 변환할 텍스트
+        markdown: 인라인 마크다운(**굵게**, *기울임*, `코드`, [링크](url)) 해석 여부
+    """
+    segments: List[Tuple[str, Dict, Optional[str]]] = []
+    if markdown:
+        position = 0
+        for match in _INLINE.finditer(text):
+            if match.start() > position:
+                segments.append((text[position : match.start()], {}, None))
+            if match.group("bold"):
+                segments.append((match.group("bold"), {"bold": True}, None))
+            elif match.group("italic"):
+                segments.append((match.group("italic"), {"italic": True}, None))
+            elif match.group("code"):
+                segments.append((match.group("code"), {"code": True}, None))
+            else:
+                segments.append((match.group("label"), {}, match.group("url")))
+            position = match.end()
+        if position < len(text):
+            segments.append((text[position:], {}, None))
+    else:
+        segments.append((text, {}, None))
+
+    return [
+        _text_object(chunk, annotations, url)
+        for content, annotations, url in segments
+        if content
+        for chunk in split_text(content)
+    ]
+
+
+def text_blocks(
+    block_type: str, text: str, markdown: bool = True, **extra
+) -> List[Dict]:
+    """
+    텍스트 블록 생성 (rich_text가 100개를 넘으면 같은 종류의 블록 여러 개로 분할)
+
+    Args:
+        block_type: paragraph, heading_1, quote 등
+        text: 블록 텍스트
+        markdown: 인라인 마크다운 해석 여부
+        extra: 블록 속성 추가 항목 (color, language 등)
+    """
+    items = rich_text(text, markdown) or [_text_object("", {}, None)]
+    return [
+        {
+            "object": "block",
+            "type": block_type,
+            block_type: {"rich_text": items[i : i + MAX_RICH_TEXT_ITEMS], **extra},
+        }
+        for i in range(0, len(items), MAX_RICH_TEXT_ITEMS)
+    ]
+
+
+def divider() -> Dict:
+    """구분선 블록"""
+    return {"object": "block", "type": "divider", "divider": {}}
+
+
+def markdown_to_blocks(markdown: str) -> List[Dict]:
+    """
+    마크다운을 Notion 블록 목록으로 변환 (잘림 없음)
+
+    제목(# ~ ######, 4단계 이하는 heading_3), 글머리/번호 목록, 체크리스트,
+    인용, 구분선, 코드 블록을 지원합니다. 표는 정렬을 유지하도록 코드 블록으로
+    넣고, 빈 줄로 구분된 나머지 줄은 문단이 됩니다.
+    """
+    blocks: List[Dict] = []
+    paragraph: List[str] = []
+    lines = markdown.splitlines()
+
+    def flush_paragraph():
+        if paragraph:
+            blocks.extend(text_blocks("paragraph", "\n".join(paragraph)))
+            paragraph.clear()
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        i += 1
+
+        fence = _FENCE.match(line)
+        if fence:
+            flush_paragraph()
+            code = []
+            while i < len(lines) and not _FENCE.match(lines[i]):
+                code.append(lines[i])
+                i += 1
+            i += 1  # 닫는 ```
+            language = CODE_LANGUAGES.get(fence.group(1).lower(), "plain text")
+            blocks.extend(
+                text_blocks("code", "\n".join(code), markdown=False, language=language)
+            )
+            continue
+
+        if _TABLE.match(line):
+            flush_paragraph()
+            table = [line]
+            while i < len(lines) and _TABLE.match(lines[i]):
+                table.append(lines[i])
+                i += 1
+            blocks.extend(
+                text_blocks(
+                    "code", "\n".join(table), markdown=False, language="plain text"
+                )
+            )
+            continue
+
+        if not line.strip():
+            flush_paragraph()
+            continue
+
+        if _DIVIDER.match(line):
+            flush_paragraph()
+            blocks.append(divider())
+            continue
+
+        heading = _HEADING.match(line)
+        if heading:
+            flush_paragraph()
+            level = min(len(heading.group(1)), 3)
+            blocks.extend(text_blocks(f"heading_{level}", heading.group(2)))
+            continue
+
+        todo = _TODO.match(line)
+        if todo:
+            flush_paragraph()
+            blocks.extend(
+                text_blocks("to_do", todo.group(2), checked=todo.group(1) != " ")
+            )
+            continue
+
+        for pattern, block_type in (
+            (_BULLET, "bulleted_list_item"),
+            (_NUMBERED, "numbered_list_item"),
+            (_QUOTE, "quote"),
+        ):
+            match = pattern.match(line)
+            if match:
+                flush_paragraph()
+                blocks.extend(text_blocks(block_type, match.group(1)))
+                break
+        else:
+            paragraph.append(line)
+
+    flush_paragraph()
+    return blocks
+
+
+def count_blocks(block: Dict) -> int:
+    """블록 수 (중첩 children 포함)"""
+    children = block[block["type"]].get("children") or []
+    return 1 + sum(count_blocks(child) for child in children)
+
+
+def batch_blocks(blocks: List[Dict]) -> List[List[Dict]]:
+    """
+    요청 하나에 넣을 수 있는 최대 크기의 묶음으로 분할
+
+    children 100개, 중첩 포함 전체 블록 1000개 제한을 지킵니다.
+    """
+    batches: List[List[Dict]] = []
+    batch: List[Dict] = []
+    size = 0
+    for block in blocks:
+        block_size = count_blocks(block)
+        if batch and (
+            len(batch) == MAX_CHILDREN or size + block_size > MAX_BLOCKS_PER_REQUEST
+        ):
+            batches.append(batch)
+            batch, size = [], 0
+        batch.append(block)
+        size += block_size
+    if batch:
+        batches.append(batch)
+    return batches
@@ -2,68 +2,184 @@
 Notion API Client
 """
 
-from typing import List, Optional, Dict, Any
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
 from notion_client import AsyncClient
 from notion_client.errors import APIResponseError
 
+from integrations.notion_blocks import (
+    MAX_CHILDREN,
+    batch_blocks,
+    count_blocks,
+    divider,
+    markdown_to_blocks,
+    text_blocks,
+)
 from models.question import Question, QuestionStatus
 from utils.logger import get_logger
 from utils.retry import async_retry
-from utils.rate_limiter import rate_limiters
+from utils.circuit_breaker import CircuitOpenError, get_circuit_breaker
+from utils.rate_limiter import is_rate_limit_error, rate_limiters
 
 logger = get_logger(__name__)
 
+# Notion API 페이지 크기 상한
+MAX_PAGE_SIZE = 100
+
+# last_edited_time은 분 단위로 기록되므로 델타 커서를 이만큼 앞당겨 누락 방지
+CURSOR_OVERLAP = timedelta(minutes=1)
+
 
 class NotionClient:
     """
     Notion API 통합 클라이언트
     """
 
-    def __init__(self, api_key: str, inbox_db_id: str, results_db_id: str):
+    def __init__(
+        self,
+        api_key: str,
+        inbox_db_id: str,
+        results_db_id: str,
+        page_size: int = MAX_PAGE_SIZE,
+        full_resync_interval: float = 600,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         """
         Args:
             api_key: Notion API 키
             inbox_db_id: Inbox 데이터베이스 ID
             results_db_id: Results 데이터베이스 ID
+            page_size: 쿼리 한 번에 가져올 페이지 수 (최대 100)
+            full_resync_interval: 전체 재동기화 간격 (초, 0이면 항상 전체 조회)
+            clock: 시각 함수 (테스트/시뮬레이션용)
         """
         self.client = AsyncClient(auth=api_key)
         self.inbox_db_id = inbox_db_id
         self.results_db_id = results_db_id
+        self.page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        self.full_resync_interval = full_resync_interval
+        self.clock = clock
+
+        # 델타 폴링 커서 (마지막 성공한 폴링 시작 시각)
+        self._edited_since: Optional[datetime] = None
+        self._last_full_sync: Optional[float] = None
 
     @async_retry(max_attempts=3, delay=1.0)
-    async def query_pending_questions(self) -> List[Question]:
+    async def query_pending_questions(
+        self, full: Optional[bool] = None
+    ) -> List[Question]:
         """
         Inbox에서 status='pending' 질문 조회
 
+        기본적으로 마지막 성공한 폴링 이후 수정된 페이지만 조회하고(델타),
+        full_resync_interval마다 전체 pending 목록을 다시 조회합니다.
+        has_more/next_cursor를 따라 모든 페이지를 가져옵니다.
+
+        델타 조회는 커서 이후 수정되지 않은 pending 페이지를 다시 돌려주지 않습니다.
+        따라서 호출자가 받아 놓고 처리하지 못한 질문(종료시 버려진 질문, 상태
+        업데이트 실패 등)은 다음 전체 조회 전까지 보이지 않습니다. 이런 경우
+        호출자는 full=True로 다음 조회를 요청해야 합니다.
+
+        Args:
+            full: True면 전체 조회, False면 델타 조회, None이면 자동 선택
+                  (델타 커서가 없으면 항상 전체 조회)
+
         Returns:
             Question 객체 리스트
         """
-        await rate_limiters["notion"].acquire()
+        if full is None:
+            full = self._needs_full_sync()
+        elif self._edited_since is None:
+            # 델타 커서가 없으면 델타 조회 불가
+            full = True
+
+        poll_started = datetime.now(timezone.utc)
+
+        status_filter = {"property": "상태", "status": {"equals": "pending"}}
+        if full:
+            query_filter = status_filter
+        else:
+            query_filter = {
+                "and": [
+                    status_filter,
+                    {
+                        "timestamp": "last_edited_time",
+                        "last_edited_time": {
+                            "on_or_after": self._edited_since.isoformat()
+                        },
+                    },
+                ]
+            }
+
+        pages = await self._query_all(
+            database_id=self.inbox_db_id,
+            filter=query_filter,
+            sorts=[{"timestamp": "created_time", "direction": "ascending"}],
+        )
+
+        questions = []
+        for page in pages:
+            try:
+                question = Question.from_notion_page(page)
+                questions.append(question)
+            except Exception as e:
+                logger.error(f"질문 파싱 실패 (page_id={page['id']}): {e}")
+
+        # Notion 정렬은 select 이름의 알파벳순이라 high/low/medium이 되므로
+        # QuestionPriority 순서로 다시 정렬 (같은 우선순위는 생성 순서 유지)
+        questions.sort(key=lambda q: q.priority.rank)
+
+        # 성공한 경우에만 커서 전진
+        self._edited_since = poll_started - CURSOR_OVERLAP
+        if full:
+            self._last_full_sync = self.clock()
+
+        mode = "전체" if full else "델타"
+        logger.info(f"📥 {len(questions)}개 pending 질문 발견 ({mode} 조회)")
+        return questions
+
+    def _needs_full_sync(self) -> bool:
+        """전체 재동기화가 필요한지 여부"""
+        if self._edited_since is None or self._last_full_sync is None:
+            return True
+        return self.clock() - self._last_full_sync >= self.full_resync_interval
+
+    async def _query_all(self, **query) -> List[Dict]:
+        """데이터베이스 쿼리 결과를 모든 페이지에 걸쳐 수집"""
+        pages: List[Dict] = []
+        start_cursor = None
 
         try:
-            response = await self.client.databases.query(
-                database_id=self.inbox_db_id,
-                filter={"property": "상태", "status": {"equals": "pending"}},
-                sorts=[
-                    {"property": "우선순위", "direction": "ascending"},
-                    {"timestamp": "created_time", "direction": "ascending"},
-                ],
-            )
+            while True:
+                get_circuit_breaker("notion").check()
+                kwargs = dict(query, page_size=self.page_size)
+                if start_cursor:
+                    kwargs["start_cursor"] = start_cursor
 
-            questions = []
-            for page in response["results"]:
                 try:
-                    question = Question.from_notion_page(page)
-                    questions.append(question)
-                except Exception as e:
-                    logger.error(f"질문 파싱 실패 (page_id={page['id']}): {e}")
-
-            logger.info(f"📥 {len(questions)}개 pending 질문 발견")
-            return questions
+                    await rate_limiters["notion"].acquire()
+                    response = await self.client.databases.query(**kwargs)
+                except asyncio.CancelledError:
+                    get_circuit_breaker("notion").release()
+                    raise
+                self._record_result()
+                pages.extend(response["results"])
+
+                start_cursor = response.get("next_cursor")
+                if not response.get("has_more") or not start_cursor:
+                    return pages
 
         except APIResponseError as e:
+            self._record_result(e)
             logger.error(f"Notion API 오류: {e}")
             raise
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            self._record_result(e)
+            raise
 
     @async_retry(max_attempts=3, delay=1.0)
     async def update_question_status(
@@ -77,33 +193,45 @@ class NotionClient:
             status: 새 상태
             result_url: 결과 페이지 URL (optional)
         """
-        await rate_limiters["notion"].acquire()
-
         properties = {"상태": {"status": {"name": status.value}}}
 
         # 결과 링크 추가
         if result_url:
             properties["결과링크"] = {"url": result_url}
 
+        get_circuit_breaker("notion").check()
         try:
+            await rate_limiters["notion"].acquire()
             await self.client.pages.update(page_id=page_id, properties=properties)
+            self._record_result()
             logger.info(f"✅ 상태 업데이트: {page_id} → {status.value}")
 
+        except asyncio.CancelledError:
+            get_circuit_breaker("notion").release()
+            raise
         except APIResponseError as e:
+            self._record_result(e)
             logger.error(f"상태 업데이트 실패 (page_id={page_id}): {e}")
             raise
+        except Exception as e:
+            self._record_result(e)
+            raise
 
-    @async_retry(max_attempts=3, delay=2.0)
     async def create_result_page(
         self,
         question: Question,
         responses: Dict[str, Dict],
         synthesis: str,
         metadata: Dict[str, Any],
-    ) -> Dict[str, str]:
+    ) -> Dict[str, Any]:
         """
         Results 데이터베이스에 결과 페이지 생성
 
+        내용은 잘라내지 않습니다. pages.create에 넣을 수 있는 만큼 첫 묶음으로
+        보내고, 나머지는 append_blocks로 이어 붙입니다. 호출마다 Notion 레이트
+        리미터와 서킷 브레이커를 거치고 개별적으로 재시도하며, 중간에 실패하면
+        만들다 만 페이지를 보관 처리하고 예외를 다시 발생시킵니다.
+
         Args:
             question: 원본 질문
             responses: AI 에이전트 응답들
@@ -111,39 +239,193 @@ class NotionClient:
             metadata: 메타데이터
 
         Returns:
-            {'id': '...', 'url': '...'}
+            {'id': '...', 'url': '...', 'api_calls': n}
         """
-        await rate_limiters["notion"].acquire()
+        blocks = self._create_result_blocks(question, responses, synthesis, metadata)
 
-        try:
-            # Properties
-            properties = {
-                "제목": {"title": [{"text": {"content": question.text[:100]}}]},
-                "카테고리": {"select": {"name": question.category or "기타"}},
-                "처리시간": {"number": metadata.get("total_duration", 0)},
-                "성공 에이전트": {"number": metadata.get("successful_agents", 0)},
-            }
+        # pages.create 응답에는 블록 ID가 없으므로 첫 묶음은 children이 한도를
+        # 넘는 블록(부모 ID를 받아 이어 붙여야 함) 앞에서 끊음
+        head = blocks
+        for index, block in enumerate(blocks):
+            if len(block[block["type"]].get("children") or []) > MAX_CHILDREN:
+                head = blocks[:index]
+                break
+        first = batch_blocks(head)[0] if head else []
 
-            # Page content (blocks)
-            children = self._create_result_blocks(
-                question, responses, synthesis, metadata
+        try:
+            page = await self._request(
+                self.client.pages.create,
+                parent={"database_id": self.results_db_id},
+                properties=self._result_properties(question, metadata),
+                children=first,
             )
+        except Exception as e:
+            logger.error(f"결과 페이지 생성 실패: {e}")
+            raise
 
-            # 페이지 생성
-            page = await self.client.pages.create(
-                parent={"database_id": self.results_db_id},
-                properties=properties,
-                children=children,
+        try:
+            api_calls = 1 + await self.append_blocks(page["id"], blocks[len(first) :])
+        except Exception as e:
+            logger.error(f"결과 페이지 내용 추가 실패, 페이지 보관 처리: {e}")
+            await self.archive_page(page["id"])
+            raise
+
+        result = {"id": page["id"], "url": page["url"], "api_calls": api_calls}
+
+        logger.info(
+            f"✅ 결과 페이지 생성: {result['url']} "
+            f"(블록 {sum(count_blocks(b) for b in blocks)}개, API 호출 {api_calls}회)"
+        )
+        return result
+
+    async def create_result_shell(
+        self, question: Question, sections: List[str]
+    ) -> Dict[str, Any]:
+        """
+        스트리밍용 빈 결과 페이지 생성 (원본 질문과 섹션 제목만)
+
+        통합 분석 제목(펼침 가능)과 섹션별 토글을 만들어 각 블록 ID를
+        돌려줍니다. 이후 append_blocks로 섹션 내용을 채우고
+        finish_result_page로 마무리합니다.
+
+        Args:
+            question: 원본 질문
+            sections: 에이전트 단계 이름 목록
+
+        Returns:
+            {'id': '...', 'url': '...', 'sections': {섹션 이름: 블록 ID}}
+            (통합 분석 섹션 이름은 "synthesis")
+        """
+        page = await self._request(
+            self.client.pages.create,
+            parent={"database_id": self.results_db_id},
+            properties=self._result_properties(question, {}),
+            children=self._question_blocks(question),
+        )
+
+        names = ["synthesis", None, None] + list(sections)
+        skeleton = (
+            text_blocks("heading_1", "🎯 통합 분석", markdown=False, is_toggleable=True)
+            + [divider()]
+            + text_blocks("heading_2", "🤖 개별 AI 응답", markdown=False)
+            + [
+                text_blocks("toggle", self._section_title(name), markdown=False)[0]
+                for name in sections
+            ]
+        )
+        try:
+            appended = await self._request(
+                self.client.blocks.children.append,
+                block_id=page["id"],
+                children=skeleton,
             )
+        except Exception:
+            await self.archive_page(page["id"])
+            raise
+
+        return {
+            "id": page["id"],
+            "url": page["url"],
+            "sections": {
+                name: created["id"]
+                for name, created in zip(names, appended["results"])
+                if name
+            },
+        }
+
+    async def finish_result_page(self, page_id: str, metadata: Dict[str, Any]):
+        """스트리밍 결과 페이지 마무리 (처리 정보 추가, 속성 갱신)"""
+        await self.append_blocks(page_id, self._metadata_blocks(metadata))
+        properties = self._result_properties(None, metadata)
+        await self._request(
+            self.client.pages.update, page_id=page_id, properties=properties
+        )
 
-            result = {"id": page["id"], "url": page["url"]}
+    async def append_blocks(self, block_id: str, blocks: List[Dict]) -> int:
+        """
+        블록 아래에 children을 최대 크기 묶음으로 이어 붙임
 
-            logger.info(f"✅ 결과 페이지 생성: {result['url']}")
-            return result
+        children이 한도를 넘는 블록은 생성된 블록 ID 아래에 나머지를 다시
+        이어 붙입니다.
 
-        except APIResponseError as e:
-            logger.error(f"결과 페이지 생성 실패: {e}")
+        Returns:
+            API 호출 수
+        """
+        overflow: Dict[int, List[Dict]] = {}
+        for index, block in enumerate(blocks):
+            children = block[block["type"]].get("children") or []
+            if len(children) > MAX_CHILDREN:
+                block[block["type"]]["children"] = children[:MAX_CHILDREN]
+                overflow[index] = children[MAX_CHILDREN:]
+
+        api_calls = 0
+        offset = 0
+        for batch in batch_blocks(blocks):
+            appended = await self._request(
+                self.client.blocks.children.append, block_id=block_id, children=batch
+            )
+            api_calls += 1
+            for index, created in enumerate(appended["results"], start=offset):
+                if index in overflow:
+                    api_calls += await self.append_blocks(
+                        created["id"], overflow[index]
+                    )
+            offset += len(batch)
+        return api_calls
+
+    async def archive_page(self, page_id: str):
+        """만들다 만 페이지 보관 처리 (실패해도 예외를 올리지 않음)"""
+        try:
+            await self._request(
+                self.client.pages.update, page_id=page_id, archived=True
+            )
+        except Exception as e:
+            logger.warning(f"미완성 결과 페이지 보관 실패 ({page_id}): {e}")
+
+    @async_retry(max_attempts=3, delay=2.0)
+    async def _request(self, method, **kwargs) -> Dict:
+        """Notion 쓰기 호출 하나 (서킷 브레이커 → 레이트 리미터 → 호출)"""
+        get_circuit_breaker("notion").check()
+        try:
+            await rate_limiters["notion"].acquire()
+            response = await method(**kwargs)
+            self._record_result()
+            return response
+        except asyncio.CancelledError:
+            get_circuit_breaker("notion").release()
             raise
+        except Exception as e:
+            self._record_result(e)
+            raise
+
+    def _record_result(self, error: Optional[Exception] = None):
+        """
+        API 호출 결과를 레이트 리미터와 서킷 브레이커에 반영
+
+        429는 속도 조정으로 처리하므로 장애로 세지 않고, HALF_OPEN 시험 요청
+        자리만 돌려줍니다.
+        """
+        rate_limiters["notion"].observe(error)
+        breaker = get_circuit_breaker("notion")
+        if error is None:
+            breaker.record_success()
+        elif is_rate_limit_error(error):
+            breaker.release()
+        else:
+            breaker.record_failure()
+
+    def _result_properties(
+        self, question: Optional[Question], metadata: Dict[str, Any]
+    ) -> Dict[str, Dict]:
+        """결과 페이지 속성 (question이 None이면 처리 정보만)"""
+        properties = {
+            "처리시간": {"number": metadata.get("total_duration", 0)},
+            "성공 에이전트": {"number": metadata.get("successful_agents", 0)},
+        }
+        if question:
+            properties["제목"] = {"title": [{"text": {"content": question.text[:100]}}]}
+            properties["카테고리"] = {"select": {"name": question.category or "기타"}}
+        return properties
 
     def _create_result_blocks(
         self,
@@ -152,162 +434,94 @@ class NotionClient:
         synthesis: str,
         metadata: Dict[str, Any],
     ) -> List[Dict]:
-        """Notion 페이지 블록 생성"""
-        blocks = []
-
+        """Notion 페이지 블록 생성 (마크다운 응답은 서식 블록으로 변환)"""
         # 1. 원본 질문
-        blocks.extend(
-            [
-                {
-                    "object": "block",
-                    "type": "heading_1",
-                    "heading_1": {
-                        "rich_text": [
-                            {"type": "text", "text": {"content": "📝 원본 질문"}}
-                        ]
-                    },
-                },
-                {
-                    "object": "block",
-                    "type": "quote",
-                    "quote": {
-                        "rich_text": [
-                            {"type": "text", "text": {"content": question.text}}
-                        ],
-                        "color": "blue_background",
-                    },
-                },
-                {"object": "block", "type": "divider", "divider": {}},
-            ]
-        )
+        blocks = self._question_blocks(question)
 
         # 2. 통합 분석 (주요 섹션)
-        blocks.extend(
-            [
-                {
-                    "object": "block",
-                    "type": "heading_1",
-                    "heading_1": {
-                        "rich_text": [
-                            {"type": "text", "text": {"content": "🎯 통합 분석"}}
-                        ]
-                    },
-                },
-                {
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [
-                            {"type": "text", "text": {"content": synthesis[:2000]}}
-                        ]
-                    },
-                },
-            ]
-        )
+        blocks.extend(text_blocks("heading_1", "🎯 통합 분석", markdown=False))
+        blocks.extend(markdown_to_blocks(synthesis))
 
         # 구분선
-        blocks.append({"object": "block", "type": "divider", "divider": {}})
+        blocks.append(divider())
 
         # 3. 개별 AI 응답
-        blocks.append(
-            {
-                "object": "block",
-                "type": "heading_2",
-                "heading_2": {
-                    "rich_text": [
-                        {"type": "text", "text": {"content": "🤖 개별 AI 응답"}}
-                    ]
-                },
-            }
-        )
-
-        agent_emojis = {"gemini": "🔍", "chatgpt": "💡", "claude": "✅"}
+        blocks.extend(text_blocks("heading_2", "🤖 개별 AI 응답", markdown=False))
 
         for agent_name, response in responses.items():
-            emoji = agent_emojis.get(agent_name, "🤖")
             status_emoji = "✅" if response["success"] else "❌"
+            if (response.get("metadata") or {}).get("cache") == "hit":
+                status_emoji += " 💾 캐시"
+
+            toggle = text_blocks(
+                "toggle",
+                f"{self._section_title(agent_name)} {status_emoji}",
+                markdown=False,
+            )[0]
+            children = self._response_blocks(response)
+            if children:
+                toggle["toggle"]["children"] = children
+            blocks.append(toggle)
 
-            blocks.append(
-                {
-                    "object": "block",
-                    "type": "toggle",
-                    "toggle": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": f"{emoji} {agent_name.upper()} {status_emoji}"
-                                },
-                            }
-                        ],
-                        "children": [
-                            {
-                                "object": "block",
-                                "type": "paragraph",
-                                "paragraph": {
-                                    "rich_text": [
-                                        {
-                                            "type": "text",
-                                            "text": {
-                                                "content": (
-                                                    response["content"][:2000]
-                                                    if response["success"]
-                                                    else f"오류: {response.get('error', '알 수 없음')}"
-                                                )
-                                            },
-                                        }
-                                    ]
-                                },
-                            }
-                        ],
-                    },
-                }
+        # 4. 메타데이터
+        blocks.extend(self._metadata_blocks(metadata))
+        return blocks
+
+    def _question_blocks(self, question: Question) -> List[Dict]:
+        """원본 질문 섹션"""
+        return (
+            text_blocks("heading_1", "📝 원본 질문", markdown=False)
+            + text_blocks(
+                "quote", question.text, markdown=False, color="blue_background"
             )
+            + [divider()]
+        )
 
-        # 4. 메타데이터
-        blocks.extend(
-            [
-                {"object": "block", "type": "divider", "divider": {}},
-                {
-                    "object": "block",
-                    "type": "heading_3",
-                    "heading_3": {
-                        "rich_text": [
-                            {"type": "text", "text": {"content": "📊 처리 정보"}}
-                        ]
-                    },
-                },
-                {
-                    "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": f"처리 시간: {metadata.get('total_duration', 0):.1f}초"
-                                },
-                            }
-                        ]
-                    },
-                },
-                {
-                    "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {
-                                    "content": f"성공 에이전트: {metadata.get('successful_agents', 0)}/{metadata.get('total_agents', 3)}"
-                                },
-                            }
-                        ]
-                    },
-                },
-            ]
+    @staticmethod
+    def _section_title(name: str) -> str:
+        """에이전트 응답 토글 제목"""
+        agent_emojis = {"gemini": "🔍", "chatgpt": "💡", "claude": "✅"}
+        return f"{agent_emojis.get(name, '🤖')} {name.upper()}"
+
+    @staticmethod
+    def _response_blocks(response: Dict) -> List[Dict]:
+        """에이전트 응답 본문 (실패면 오류 문단)"""
+        if response["success"]:
+            return markdown_to_blocks(response["content"])
+        return text_blocks(
+            "paragraph", f"오류: {response.get('error', '알 수 없음')}", markdown=False
         )
 
+    def _metadata_blocks(self, metadata: Dict[str, Any]) -> List[Dict]:
+        """처리 정보 섹션"""
+        info = [
+            f"처리 시간: {metadata.get('total_duration', 0):.1f}초",
+            f"성공 에이전트: {metadata.get('successful_agents', 0)}/{metadata.get('total_agents', 3)}",
+        ]
+        if metadata.get("time_to_first_content") is not None:
+            info.append(f"첫 내용 표시: {metadata['time_to_first_content']:.1f}초")
+        if metadata.get("cache_hits"):
+            info.append(f"캐시 적중: {metadata['cache_hits']}회")
+        if metadata.get("cut_short"):
+            info.append("기한 초과로 중단: " + ", ".join(metadata["cut_short"]))
+        usage = metadata.get("usage")
+        if usage:
+            info.append(
+                f"토큰: 입력 {usage['input_tokens']:,} / 출력 {usage['output_tokens']:,}"
+                f", 비용 ${usage['cost']:.4f} (오늘 누적 ${metadata.get('daily_cost', 0):.2f})"
+            )
+            if usage.get("cache_read_tokens"):
+                info.append(
+                    f"프롬프트 캐시: 입력 {usage['cache_read_tokens']:,} 토큰 재사용 "
+                    f"(${usage.get('cache_savings', 0):.4f} 절감)"
+                )
+        if metadata.get("downgraded"):
+            info.append("예산 절약: 저렴한 모델로 처리")
+
+        blocks = [divider()]
+        blocks.extend(text_blocks("heading_3", "📊 처리 정보", markdown=False))
+        for line in info:
+            blocks.extend(text_blocks("bulleted_list_item", line, markdown=False))
         return blocks
 
     async def health_check(self) -> bool:
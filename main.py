@@ -4,12 +4,24 @@ Universal AI Orchestrator - Main Entry Point
 
 import asyncio
 import signal
+from datetime import datetime
+from typing import Dict, List, Optional
 from config.settings import ConfigManager
+from core.cassette import Cassette
+from core.hedging import LatencyTracker
 from core.orchestrator import Orchestrator
+from core.job_store import JobStore, JobState
 from core.notion_watcher import NotionWatcher
+from core.notion_writer import NotionWriter
+from core.result_stream import ResultStream
+from core.similarity_index import SimilarityIndex
 from integrations.notion_client import NotionClient
+from models.agent_response import AgentResponse
 from models.question import Question, QuestionStatus
 from utils.logger import get_logger
+from utils.circuit_breaker import circuit_states, configure_circuit_breakers
+from utils.cost import configure_cost_tracker, cost_tracker, start_of_today
+from utils.rate_limiter import configure_rate_limiters
 
 logger = get_logger(__name__)
 
@@ -19,25 +31,89 @@ class Application:
     메인 애플리케이션
     """
 
-    def __init__(self):
+    def __init__(self, config_path: str = "config.yaml"):
+        """
+        Args:
+            config_path: YAML 설정 파일 경로
+        """
         # 설정 로드
-        self.config = ConfigManager()
+        self.config = ConfigManager(config_path)
+
+        # 프로바이더별 레이트 리미터 (rate_limits 설정)
+        configure_rate_limiters(self.config.config.get("rate_limits"))
+
+        # 에이전트/통합/Notion 서킷 브레이커 (circuit_breakers 설정)
+        configure_circuit_breakers(self.config.config.get("circuit_breakers"))
+
+        # 모델 가격표와 일일 예산 (pricing/budget 설정)
+        configure_cost_tracker(
+            self.config.config.get("pricing"), self.config.config.get("budget")
+        )
 
-        # Notion 클라이언트
+        # Notion 클라이언트 (0 같은 falsy 값도 그대로 사용하도록 직접 조회)
+        notion_config = self.config.config.get("notion") or {}
         self.notion = NotionClient(
             api_key=self.config["api_keys"]["notion"],
             inbox_db_id=self.config["notion_db_ids"]["inbox"],
             results_db_id=self.config["notion_db_ids"]["results"],
+            page_size=notion_config.get("page_size", 100),
+            full_resync_interval=notion_config.get("full_resync_interval", 600),
+        )
+
+        # 작업 원장 (재시작 복구 및 중복 방지)
+        storage_config = self.config.config.get("storage") or {}
+        self.jobs = JobStore(
+            path=storage_config.get("job_db", "data/jobs.db"),
+            retention_days=storage_config.get("retention_days", 30),
+        )
+        # 재시작 전 오늘 쓴 비용도 일일 예산에 반영
+        cost_tracker.seed(self.jobs.cost_since(start_of_today()))
+
+        # Notion 쓰기 작성기 (상태 변경/결과 생성을 백그라운드에서 반영)
+        self.writer = NotionWriter(
+            self.notion,
+            self.jobs,
+            batch_size=notion_config.get("update_batch_size", 10),
         )
 
         # Orchestrator
-        self.orchestrator = Orchestrator(self.config.config)
+        self.orchestrator = Orchestrator(self.config.config, job_store=self.jobs)
+
+        # 트래픽 녹화/재생 (cassette.mode가 off면 None)
+        self.cassette = Cassette.from_config(self.config.config.get("cassette"))
+        if self.cassette:
+            self.cassette.install(self.orchestrator, self.notion)
+
+        # 스트리밍 결과 페이지 (streaming.enabled가 false면 완료 후 한 번에 생성)
+        self.streaming_config = self.config.config.get("streaming") or {}
+        self.time_to_first_content = LatencyTracker()
+
+        # 유사 질문 재사용 (dedup.enabled가 false면 비활성)
+        self.dedup_config = self.config.config.get("dedup") or {}
+        similarity_index = None
+        if self.dedup_config.get("enabled", False):
+            similarity_index = SimilarityIndex(
+                threshold=self.dedup_config.get("threshold", 0.9),
+                dim=self.dedup_config.get("dim", 256),
+            )
 
         # Watcher
         self.watcher = NotionWatcher(
             notion_client=self.notion,
             polling_interval=self.config.get("system.polling_interval", 30),
             max_concurrent_tasks=self.config.get("system.max_concurrent_tasks", 5),
+            job_store=self.jobs,
+            max_attempts=self.config.get("system.max_attempts", 3),
+            similarity_index=similarity_index,
+            writer=self.writer,
+            aging_interval=self.config.get("system.aging_interval", 300),
+            reserved_high_slots=self.config.get("system.reserved_high_slots", 0),
+            fair_share=self.config.config.get("fair_share"),
+            hold=cost_tracker.should_hold,
+            offload=self._offload,
+            max_offloaded=(
+                self.orchestrator.batch.max_offloaded if self.orchestrator.batch else 0
+            ),
         )
 
     async def start(self):
@@ -58,52 +134,146 @@ class Application:
             loop.add_signal_handler(sig, lambda: asyncio.create_task(self.shutdown()))
 
         # Watcher 시작
+        self.writer.start()
         try:
             await self.watcher.start(callback=self.process_question)
         except Exception as e:
             logger.error(f"❌ Watcher 오류: {e}", exc_info=True)
+        finally:
+            # 처리 중이던 질문이 모두 끝난 뒤 작성기/원장 닫기
+            # (반영하지 못한 쓰기는 원장에 남아 다음 시작시 이어서 반영)
+            if self.orchestrator.batch:
+                await self.orchestrator.batch.close()
+            await self.writer.close()
+            self.jobs.close()
+            if self.cassette:
+                self.cassette.close()
+
+    def _offload(self, question: Question) -> bool:
+        """배치 API로 처리할 질문인지 (워커 슬롯 없이 백그라운드 처리)"""
+        batch = self.orchestrator.batch
+        return batch is not None and batch.applies(question.priority.value)
 
     async def process_question(self, question: Question):
         """
         질문 처리 콜백
         """
+        stream = None
         try:
-            # Orchestrator로 처리
-            result = await self.orchestrator.process_question(
-                question=question.text,
-                context={
+            # 이전 시도에서 이미 만든 결과가 있으면 재사용 (Notion 반영만 남은 경우)
+            result = self.jobs.load_result(question.page_id)
+
+            duplicate = (question.metadata or {}).get("duplicate_of")
+            if result is None and duplicate:
+                if await self._link_duplicate(question, duplicate):
+                    return
+
+            if result is None:
+                context = {
                     "category": question.category,
                     "priority": question.priority.value,
-                },
-            )
+                    "job_id": question.page_id,
+                }
+                reused = self._load_duplicate_responses(duplicate)
+                if reused:
+                    context["duplicate_of"] = duplicate
 
-            if result["success"]:
-                # 결과 페이지 생성
-                result_page = await self.notion.create_result_page(
-                    question=question,
-                    responses=result["responses"],
-                    synthesis=result["synthesis"],
-                    metadata=result["metadata"],
-                )
+                stream = self._start_stream(question)
+                if stream:
+                    context["result_stream"] = stream
 
-                # Inbox 상태 업데이트
-                await self.notion.update_question_status(
-                    page_id=question.page_id,
-                    status=QuestionStatus.COMPLETED,
-                    result_url=result_page["url"],
+                # Orchestrator로 처리 (유사 질문 응답이 있으면 합성만 실행)
+                result = await self.orchestrator.process_question(
+                    question=question.text, context=context, responses=reused
                 )
+                if result["success"]:
+                    # 스트리밍한 페이지를 마무리 (실패하면 아래에서 한 번에 생성)
+                    page = await stream.finish(result) if stream else None
+                    self.jobs.save_result(question.page_id, result)
+                    if page:
+                        self.jobs.set_result_url(question.page_id, page["url"])
+                        # 내용이 하나도 스트리밍되지 않았으면 None
+                        first = result["metadata"].get("time_to_first_content")
+                        if first is not None:
+                            self.time_to_first_content.record(first)
+                elif stream:
+                    await stream.abort()
+            else:
+                logger.info(f"♻️  저장된 결과 재사용: {question.page_id}")
 
-                logger.info(f"✅ 완료: {result_page['url']}")
+            if result["success"]:
+                # 결과 페이지 생성 → Inbox 상태 completed (백그라운드 작성기가 반영)
+                self.writer.submit_result(question.page_id)
             else:
                 # 실패 처리
-                await self.notion.update_question_status(
+                self.jobs.transition(question.page_id, JobState.FAILED)
+                await self.writer.update_question_status(
                     page_id=question.page_id, status=QuestionStatus.FAILED
                 )
 
         except Exception as e:
             logger.error(f"질문 처리 오류: {e}", exc_info=True)
+            if stream:
+                await stream.abort()
             raise
 
+    def _start_stream(self, question: Question) -> Optional[ResultStream]:
+        """streaming 설정에 따라 스트리밍 결과 페이지 준비"""
+        pipeline = self.orchestrator.pipelines.get(question.category)
+        return ResultStream.from_config(
+            self.streaming_config,
+            self.notion,
+            question,
+            [stage.name for stage in pipeline.stages],
+        )
+
+    async def _link_duplicate(self, question: Question, duplicate: Dict) -> bool:
+        """
+        dedup.mode=link: 유사 질문의 기존 결과 페이지를 그대로 연결
+
+        Returns:
+            연결했으면 True
+        """
+        if self.dedup_config.get("mode", "resynthesize") != "link":
+            return False
+
+        original = self.jobs.get_job(duplicate["page_id"])
+        if not original or not original["result_url"]:
+            return False
+
+        self.jobs.complete(question.page_id, result_url=original["result_url"])
+        await self.writer.update_question_status(
+            page_id=question.page_id,
+            status=QuestionStatus.COMPLETED,
+            result_url=original["result_url"],
+        )
+        logger.info(f"🔗 유사 질문 결과 연결: {original['result_url']}")
+        return True
+
+    def _load_duplicate_responses(
+        self, duplicate: Optional[Dict]
+    ) -> Optional[List[AgentResponse]]:
+        """dedup.mode=resynthesize: 유사 질문의 저장된 에이전트 응답 로드"""
+        if not duplicate:
+            return None
+
+        stored = self.jobs.load_result(duplicate["page_id"])
+        if not stored or not stored.get("success"):
+            return None
+
+        # 같은 에이전트가 여러 단계면 키가 단계 이름이므로 에이전트는 "agent"에서
+        return [
+            AgentResponse(
+                agent_name=response.get("agent", name),
+                content=response["content"],
+                timestamp=datetime.now(),
+                success=response["success"],
+                metadata={**response.get("metadata", {}), "reused": True},
+                error=response.get("error"),
+            )
+            for name, response in stored["responses"].items()
+        ]
+
     async def _health_check(self) -> bool:
         """시스템 헬스 체크"""
         checks = []
@@ -126,7 +296,50 @@ class Application:
 
     async def shutdown(self):
         """Graceful shutdown"""
-        logger.info("🛑 종료 중...")
+        stats = self.watcher.stats()
+        logger.info(
+            f"🛑 종료 중... (처리 중: {stats['in_flight']}, "
+            f"대기 중: {stats['queued']}, 완료: {stats['processed']})"
+        )
+        for priority, queue in self.watcher.queue_stats().items():
+            if queue["dequeued"] or queue["queued"]:
+                logger.info(
+                    f"⏳ {priority} 대기 시간: 평균 {queue['avg_wait']:.1f}초, "
+                    f"p95 {queue['p95_wait']:.1f}초 "
+                    f"(처리 {queue['dequeued']}, 대기 {queue['queued']})"
+                )
+        for key, share in self.watcher.fair_share_stats().items():
+            logger.info(
+                f"⚖️  {key} (가중치 {share['weight']}): "
+                f"처리 {share['dispatched']}, 대기 {share['queued']}"
+            )
+        writes = self.writer.stats()
+        logger.info(
+            f"📝 Notion 쓰기: 반영 {writes['written']}, 대기 {writes['pending']}, "
+            f"병합 {writes['coalesced']}"
+        )
+        if len(self.time_to_first_content):
+            logger.info(
+                f"⚡ 첫 내용 표시: p50 "
+                f"{self.time_to_first_content.percentile(50):.1f}초, p90 "
+                f"{self.time_to_first_content.percentile(90):.1f}초"
+            )
+        spend = cost_tracker.stats()
+        logger.info(
+            f"💸 오늘 지출: ${spend['cost']:.4f} "
+            f"(입력 {spend['input_tokens']:,} / 출력 {spend['output_tokens']:,} 토큰)"
+        )
+        if self.orchestrator.batch:
+            batch = self.orchestrator.batch.stats()
+            logger.info(
+                f"📦 배치: 요청 {batch['requests']}, 제출 {batch['batches']}, "
+                f"완료 {batch['completed']}, 실패 {batch['failed']}, "
+                f"대기 {batch['pending']}"
+            )
+        for name, state in circuit_states().items():
+            logger.info(
+                f"🔌 {name} 서킷: {state['state']} (연속 실패 {state['failures']}회)"
+            )
         self.watcher.stop()
         await asyncio.sleep(2)  # 진행 중인 작업 완료 대기
         logger.info("👋 종료 완료")
@@ -35,10 +35,22 @@ class AgentResponse:
             "content": self.content,
             "timestamp": self.timestamp.isoformat(),
             "success": self.success,
-            "metadata": self.metadata,
+            "metadata": dict(self.metadata),
             "error": self.error,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "AgentResponse":
+        """to_dict() 결과에서 복원"""
+        return cls(
+            agent_name=data["agent_name"],
+            content=data["content"],
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+            success=data["success"],
+            metadata=dict(data.get("metadata") or {}),
+            error=data.get("error"),
+        )
+
     def __str__(self) -> str:
         """문자열 표현"""
         status = "✅" if self.success else "❌"
@@ -24,6 +24,11 @@ class QuestionPriority(Enum):
     MEDIUM = "medium"
     LOW = "low"
 
+    @property
+    def rank(self) -> int:
+        """정렬 순위 (0이 가장 높음)"""
+        return list(QuestionPriority).index(self)
+
 
 @dataclass
 class Question:
@@ -37,6 +42,7 @@ class Question:
         priority: 우선순위
         category: 카테고리 (optional)
         created_at: 생성 시각
+        created_by: 작성자 Notion 사용자 ID (optional)
         metadata: 추가 메타데이터
     """
 
@@ -47,6 +53,7 @@ class Question:
     category: Optional[str] = None
     created_at: Optional[datetime] = None
     metadata: Optional[dict] = None
+    created_by: Optional[str] = None
 
     def to_dict(self) -> dict:
         """딕셔너리로 변환"""
@@ -58,6 +65,7 @@ class Question:
             "category": self.category,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "metadata": self.metadata,
+            "created_by": self.created_by,
         }
 
     @classmethod
@@ -99,6 +107,9 @@ class Question:
             else None
         )
 
+        # 작성자
+        created_by = (page.get("created_by") or {}).get("id")
+
         return cls(
             page_id=page["id"],
             text=text,
@@ -107,4 +118,5 @@ class Question:
             category=category,
             created_at=created_at,
             metadata={},
+            created_by=created_by,
         )
@@ -0,0 +1,41 @@
+"""
+Shared test fixtures
+"""
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def app_config() -> dict:
+    """config.yaml + 더미 API 키"""
+    with open(ROOT / "config.yaml", "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+
+    config["api_keys"] = {
+        "anthropic": "test-anthropic",
+        "openai": "test-openai",
+        "gemini": "test-gemini",
+        "notion": "test-notion",
+    }
+    config["notion_db_ids"] = {"inbox": "inbox-db", "results": "results-db"}
+    # 테스트에서는 디스크 캐시를 쓰지 않음
+    config["cache"]["path"] = None
+    return config
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limiters():
+    """테스트 간 전역 레이트 리미터 / 서킷 브레이커 / 비용 집계 초기화"""
+    from utils.circuit_breaker import configure_circuit_breakers
+    from utils.cost import configure_cost_tracker
+    from utils.rate_limiter import configure_rate_limiters
+
+    configure_rate_limiters(None)
+    configure_circuit_breakers(None)
+    configure_cost_tracker(None, None)
+    yield
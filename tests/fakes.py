@@ -0,0 +1,368 @@
+"""
+Fake SDK clients for tests
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+from models.question import Question, QuestionPriority, QuestionStatus
+
+
+# 가짜 프롬프트 캐시가 캐시하는 system 토큰 수
+CACHED_TOKENS = 5
+
+
+class FakeAnthropicClient:
+    """
+    anthropic.AsyncAnthropic 대체 (지연과 프롬프트 캐시 흉내)
+
+    cache_control이 붙은 system 블록은 처음 보면 캐시 쓰기, 다시 보면 캐시
+    읽기로 usage에 CACHED_TOKENS를 보고합니다.
+    """
+
+    def __init__(self, latency: float = 0.0, text: str = "claude answer"):
+        self.latency = latency
+        self.text = text
+        self.error = None  # 설정하면 호출마다 이 예외 발생
+        self.calls = []
+        self.cached = set()
+        self.batches = FakeAnthropicBatches(self)
+        self.messages = SimpleNamespace(create=self._create, batches=self.batches)
+
+    async def _create(self, stream=False, **kwargs):
+        self.calls.append(kwargs)
+        await asyncio.sleep(self.latency)
+        if self.error:
+            raise self.error
+        usage = self._usage(kwargs.get("system"))
+        if stream:
+            return self._events(usage)
+        usage.output_tokens = 20
+        return SimpleNamespace(content=[SimpleNamespace(text=self.text)], usage=usage)
+
+    def _usage(self, system) -> SimpleNamespace:
+        """입력 사용량 (캐시 표시가 있는 system 블록은 캐시 쓰기/읽기)"""
+        usage = SimpleNamespace(
+            input_tokens=10, cache_read_input_tokens=0, cache_creation_input_tokens=0
+        )
+        for block in system if isinstance(system, list) else []:
+            if "cache_control" in block:
+                if block["text"] in self.cached:
+                    usage.cache_read_input_tokens = CACHED_TOKENS
+                else:
+                    self.cached.add(block["text"])
+                    usage.cache_creation_input_tokens = CACHED_TOKENS
+        return usage
+
+    async def _events(self, usage):
+        """스트리밍 이벤트 (단어 단위 text_delta)"""
+        yield SimpleNamespace(
+            type="message_start", message=SimpleNamespace(usage=usage)
+        )
+        for piece in _pieces(self.text):
+            await asyncio.sleep(0)
+            yield SimpleNamespace(
+                type="content_block_delta",
+                delta=SimpleNamespace(type="text_delta", text=piece),
+            )
+        yield SimpleNamespace(
+            type="message_delta", usage=SimpleNamespace(output_tokens=20)
+        )
+
+
+class FakeOpenAIClient:
+    """openai.AsyncOpenAI 대체 (같은 system 메시지로 시작하면 캐시 적중)"""
+
+    def __init__(self, latency: float = 0.0, text: str = "chatgpt answer"):
+        self.latency = latency
+        self.text = text
+        self.calls = []
+        self.prefixes = set()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self.batches = FakeOpenAIBatches(self)
+        self.files = self.batches.files
+
+    async def _create(self, stream=False, **kwargs):
+        self.calls.append(kwargs)
+        await asyncio.sleep(self.latency)
+        prefix = kwargs["messages"][0]["content"]
+        cached = CACHED_TOKENS if prefix in self.prefixes else 0
+        self.prefixes.add(prefix)
+        usage = SimpleNamespace(
+            prompt_tokens=10,
+            completion_tokens=20,
+            total_tokens=30,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=cached),
+        )
+        if stream:
+            return self._chunks(usage)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=self.text))],
+            usage=usage,
+        )
+
+    async def _chunks(self, usage):
+        """스트리밍 청크 (마지막 청크에 사용량)"""
+        for piece in _pieces(self.text):
+            await asyncio.sleep(0)
+            delta = SimpleNamespace(content=piece)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+        yield SimpleNamespace(choices=[], usage=usage)
+
+
+class FakeAnthropicBatches:
+    """
+    messages.batches 대체 (로컬 가짜 배치 서버)
+
+    ready가 False인 동안은 in_progress, True가 되면 제출된 요청을 클라이언트의
+    messages.create로 처리한 결과를 돌려줍니다.
+    """
+
+    def __init__(self, client: FakeAnthropicClient):
+        self.client = client
+        self.ready = True
+        self.submitted = {}  # batch_id → 요청 목록
+        self.retrieves = 0
+
+    async def create(self, requests):
+        batch_id = f"msgbatch_{len(self.submitted) + 1}"
+        self.submitted[batch_id] = requests
+        return SimpleNamespace(id=batch_id, processing_status="in_progress")
+
+    async def retrieve(self, batch_id):
+        self.retrieves += 1
+        status = "ended" if self.ready else "in_progress"
+        return SimpleNamespace(id=batch_id, processing_status=status)
+
+    async def results(self, batch_id):
+        return self._results(self.submitted[batch_id])
+
+    async def _results(self, requests):
+        for request in requests:
+            try:
+                message = await self.client._create(**request["params"])
+                result = SimpleNamespace(type="succeeded", message=message)
+            except Exception as e:
+                result = SimpleNamespace(type="errored", error=str(e))
+            yield SimpleNamespace(custom_id=request["custom_id"], result=result)
+
+
+class FakeOpenAIBatches:
+    """files/batches 대체 (로컬 가짜 배치 서버, JSONL 입출력)"""
+
+    def __init__(self, client: FakeOpenAIClient):
+        self.client = client
+        self.ready = True
+        self.submitted = {}  # batch_id → 입력 파일 ID
+        self.uploads = {}  # file_id → 내용
+        self.files = SimpleNamespace(create=self._upload, content=self._content)
+
+    async def _upload(self, file, purpose):
+        file_id = f"file-{len(self.uploads) + 1}"
+        self.uploads[file_id] = file[1].decode("utf-8")
+        return SimpleNamespace(id=file_id, purpose=purpose)
+
+    async def _content(self, file_id):
+        return SimpleNamespace(text=self.uploads[file_id])
+
+    async def create(self, input_file_id, endpoint, completion_window):
+        batch_id = f"batch_{len(self.submitted) + 1}"
+        self.submitted[batch_id] = input_file_id
+        return SimpleNamespace(id=batch_id, status="validating")
+
+    async def retrieve(self, batch_id):
+        if not self.ready:
+            return SimpleNamespace(id=batch_id, status="in_progress")
+
+        lines = []
+        for line in self.uploads[self.submitted[batch_id]].splitlines():
+            entry = json.loads(line)
+            completion = await self.client._create(**entry["body"])
+            usage = completion.usage
+            body = {
+                "choices": [
+                    {"message": {"content": completion.choices[0].message.content}}
+                ],
+                "usage": {
+                    "prompt_tokens": usage.prompt_tokens,
+                    "completion_tokens": usage.completion_tokens,
+                    "prompt_tokens_details": {
+                        "cached_tokens": usage.prompt_tokens_details.cached_tokens
+                    },
+                },
+            }
+            lines.append(
+                json.dumps(
+                    {
+                        "custom_id": entry["custom_id"],
+                        "response": {"status_code": 200, "body": body},
+                    }
+                )
+            )
+        output_id = f"file-{len(self.uploads) + 1}"
+        self.uploads[output_id] = "\n".join(lines)
+        return SimpleNamespace(
+            id=batch_id,
+            status="completed",
+            output_file_id=output_id,
+            error_file_id=None,
+        )
+
+
+class FakeGeminiModel:
+    """genai.GenerativeModel 대체"""
+
+    def __init__(self, latency: float = 0.0, text: str = "gemini answer"):
+        self.latency = latency
+        self.text = text
+        self.error = None  # 설정하면 호출마다 이 예외 발생
+        self.calls = []
+
+    async def generate_content_async(self, prompt, stream=False, **kwargs):
+        self.calls.append(prompt)
+        await asyncio.sleep(self.latency)
+        if self.error:
+            raise self.error
+        if stream:
+            return FakeGeminiStream(self.text)
+        return SimpleNamespace(text=self.text, usage_metadata=_gemini_usage())
+
+
+class FakeGeminiStream:
+    """AsyncGenerateContentResponse 대체 (스트림이 끝나면 usage_metadata 설정)"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.usage_metadata = None
+
+    async def __aiter__(self):
+        for piece in _pieces(self.text):
+            await asyncio.sleep(0)
+            yield SimpleNamespace(text=piece, parts=[piece])
+        self.usage_metadata = _gemini_usage()
+
+
+def _gemini_usage() -> SimpleNamespace:
+    return SimpleNamespace(
+        prompt_token_count=10, candidates_token_count=20, total_token_count=30
+    )
+
+
+def _pieces(text: str) -> list:
+    """스트리밍 조각 (공백 포함 단어 단위)"""
+    return [word + " " for word in text.split(" ")[:-1]] + [text.split(" ")[-1]]
+
+
+def install_fake_clients(orchestrator, latency: float = 0.0) -> dict:
+    """Orchestrator의 모든 SDK 클라이언트를 가짜 클라이언트로 교체"""
+    fakes = {
+        "gemini": FakeGeminiModel(latency),
+        "chatgpt": FakeOpenAIClient(latency),
+        "claude": FakeAnthropicClient(latency),
+        "synthesis": FakeAnthropicClient(latency, text="synthesis"),
+    }
+    for agent in orchestrator.agents:
+        if agent.name == "gemini":
+            agent.model = fakes["gemini"]
+        else:
+            agent.client = fakes[agent.name]
+    orchestrator.synthesis.client = fakes["synthesis"]
+    if orchestrator.batch:
+        orchestrator.batch.backends["anthropic"].client = fakes["claude"]
+        orchestrator.batch.backends["openai"].client = fakes["chatgpt"]
+    return fakes
+
+
+def make_notion_page(page_id: str, text: str, priority: str = "medium", **extra):
+    """Inbox 페이지 JSON 생성"""
+    page = {
+        "id": page_id,
+        "created_time": "2025-11-09T00:00:00.000Z",
+        "last_edited_time": "2025-11-09T00:00:00.000Z",
+        "properties": {
+            "제목": {"title": [{"text": {"content": text}}]},
+            "상태": {"status": {"name": "pending"}},
+            "우선순위": {"select": {"name": priority}},
+            "카테고리": {"select": None},
+        },
+    }
+    page.update(extra)
+    return page
+
+
+class FakeNotionAPI:
+    """notion_client.AsyncClient 대체 (메모리 데이터베이스)"""
+
+    def __init__(self):
+        self.inbox = []
+        self.queries = []
+        self.created_pages = []
+        self.updated_pages = []
+        self.appended = []
+        self.databases = SimpleNamespace(query=self._query)
+        self.pages = SimpleNamespace(create=self._create, update=self._update)
+        self.users = SimpleNamespace(me=self._me)
+        self.blocks = SimpleNamespace(children=SimpleNamespace(append=self._append))
+
+    async def _query(self, database_id, filter=None, sorts=None, **kwargs):
+        self.queries.append({"filter": filter, **kwargs})
+        page_size = kwargs.get("page_size", 100)
+        start = int(kwargs.get("start_cursor") or 0)
+        results = self.inbox[start : start + page_size]
+        has_more = start + page_size < len(self.inbox)
+        return {
+            "results": results,
+            "has_more": has_more,
+            "next_cursor": str(start + page_size) if has_more else None,
+        }
+
+    async def _create(self, **kwargs):
+        page_id = f"result-{len(self.created_pages)}"
+        self.created_pages.append(kwargs)
+        return {"id": page_id, "url": f"https://notion.so/{page_id}"}
+
+    async def _append(self, block_id, children, **kwargs):
+        self.appended.append((block_id, children))
+        start = sum(len(c) for _, c in self.appended[:-1])
+        return {
+            "results": [
+                {"id": f"block-{start + i}", "type": block["type"]}
+                for i, block in enumerate(children)
+            ]
+        }
+
+    async def _update(self, page_id, **kwargs):
+        self.updated_pages.append((page_id, kwargs))
+        return {"id": page_id}
+
+    async def _me(self):
+        return {"object": "user"}
+
+
+class FakeInbox:
+    """NotionClient 대체 - pending 질문 목록만 관리"""
+
+    def __init__(self):
+        self.pending = {}
+        self.polls = 0
+        self.full_flags = []
+        self.status_updates = []
+        self.broken = set()
+
+    def add(self, page_id: str, text: str = "q", priority=QuestionPriority.MEDIUM):
+        self.pending[page_id] = Question(
+            page_id=page_id, text=text, status=QuestionStatus.PENDING, priority=priority
+        )
+
+    async def query_pending_questions(self, full=None):
+        self.polls += 1
+        self.full_flags.append(full)
+        return list(self.pending.values())
+
+    async def update_question_status(self, page_id, status, result_url=None):
+        if page_id in self.broken:
+            raise RuntimeError("Notion 오류")
+        self.status_updates.append((page_id, status))
+        if status != QuestionStatus.PENDING:
+            self.pending.pop(page_id, None)
@@ -0,0 +1,182 @@
+"""
+Batch-API execution mode tests
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from core.batch import (
+    AnthropicBatchBackend,
+    BatchError,
+    BatchRunner,
+    OpenAIBatchBackend,
+)
+from core.notion_watcher import NotionWatcher
+from core.orchestrator import Orchestrator
+from models.question import QuestionPriority
+from tests.fakes import (
+    FakeAnthropicClient,
+    FakeInbox,
+    FakeOpenAIClient,
+    install_fake_clients,
+)
+from utils.cost import configure_cost_tracker
+from utils.rate_limiter import rate_limiters
+
+PRICING = {
+    "gpt-4": {"input": 30.0, "output": 60.0},
+    "claude-sonnet-4-5": {"input": 3.0, "output": 15.0},
+}
+
+
+def _request(text: str) -> dict:
+    return {
+        "model": "claude-sonnet-4-5",
+        "max_tokens": 100,
+        "messages": [{"role": "user", "content": text}],
+        "timeout": 30,
+    }
+
+
+@pytest.mark.asyncio
+async def test_requests_are_collected_into_one_batch_and_polled():
+    client = FakeAnthropicClient()
+    client.batches.ready = False
+    runner = BatchRunner(
+        {"anthropic": AnthropicBatchBackend(client)},
+        collect_window=0.01,
+        poll_interval=0.01,
+    )
+
+    calls = [
+        asyncio.create_task(runner.call("anthropic", _request(f"q{i}")))
+        for i in range(3)
+    ]
+    await asyncio.sleep(0.05)
+    assert not any(c.done() for c in calls)
+    client.batches.ready = True
+    replies = await asyncio.gather(*calls)
+
+    # 요청 3개가 배치 하나로, SDK 전용 인자(timeout) 없이 제출됨
+    assert len(client.batches.submitted) == 1
+    [requests] = client.batches.submitted.values()
+    assert [r["params"]["messages"][0]["content"] for r in requests] == [
+        "q0",
+        "q1",
+        "q2",
+    ]
+    assert "timeout" not in requests[0]["params"]
+    assert client.batches.retrieves >= 2
+    assert replies[0]["text"] == "claude answer"
+    assert replies[0]["output_tokens"] == 20
+    stats = runner.stats()
+    assert stats["batches"] == 1 and stats["completed"] == 3
+
+    # 개별 요청 오류는 그 호출자에게만 BatchError
+    client.error = RuntimeError("overloaded")
+    with pytest.raises(BatchError):
+        await runner.call("anthropic", _request("q3"))
+    assert runner.stats()["failed"] == 1
+    await runner.close()
+
+
+def test_sdk_without_batch_api_falls_back_to_realtime():
+    runner = BatchRunner(
+        {
+            "anthropic": AnthropicBatchBackend(FakeAnthropicClient()),
+            "openai": OpenAIBatchBackend(FakeOpenAIClient()),
+        }
+    )
+    assert runner.supports("anthropic") and runner.supports("openai")
+    assert not runner.supports("gemini")
+
+    # 배치 API가 없는 구버전 SDK 클라이언트
+    old_anthropic = SimpleNamespace(messages=SimpleNamespace(create=None))
+    old_openai = SimpleNamespace(chat=None, files=None)
+    runner = BatchRunner(
+        {
+            "anthropic": AnthropicBatchBackend(old_anthropic),
+            "openai": OpenAIBatchBackend(old_openai),
+        }
+    )
+    assert not runner.supports("anthropic")
+    assert not runner.supports("openai")
+
+
+@pytest.mark.asyncio
+async def test_low_priority_question_runs_through_batch_api(app_config):
+    app_config["batch"].update(enabled=True, collect_window=0.01, poll_interval=0.01)
+    configure_cost_tracker(PRICING)
+    orchestrator = Orchestrator(app_config)
+    orchestrator.cache = None
+    fakes = install_fake_clients(orchestrator)
+
+    result = await orchestrator.process_question("질문", {"priority": "low"})
+
+    assert result["success"] and result["metadata"]["batch"]
+    assert result["metadata"]["deadline"] is None
+    responses = result["responses"]
+    # ChatGPT/Claude/통합은 배치로, 배치 API가 없는 Gemini는 실시간
+    assert responses["chatgpt"]["metadata"]["batch"]
+    assert responses["claude"]["metadata"]["batch"]
+    assert result["synthesis_metadata"]["batch"]
+    assert "batch" not in responses["gemini"]["metadata"]
+    assert len(fakes["chatgpt"].batches.submitted) == 1
+    assert len(fakes["claude"].batches.submitted) == 2  # claude 단계 + 통합
+    assert fakes["synthesis"].calls == []
+
+    # 배치 요청은 실시간 한도를 쓰지 않고 할인 가격으로 기록
+    assert rate_limiters["openai"].stats()["acquired"] == 0
+    assert responses["chatgpt"]["metadata"]["cost"] == pytest.approx(
+        (10 * 30 + 20 * 60) / 1_000_000 * 0.5
+    )
+
+    result = await orchestrator.process_question("질문", {"priority": "high"})
+    assert not result["metadata"]["batch"]
+    assert "batch" not in result["responses"]["chatgpt"]["metadata"]
+    await orchestrator.batch.close()
+
+
+@pytest.mark.asyncio
+async def test_offloaded_questions_do_not_hold_worker_slots():
+    inbox = FakeInbox()
+    inbox.add("low-1", priority=QuestionPriority.LOW)
+    inbox.add("low-2", priority=QuestionPriority.LOW)
+    watcher = NotionWatcher(
+        inbox,
+        polling_interval=0.05,
+        max_concurrent_tasks=1,
+        offload=lambda q: q.priority == QuestionPriority.LOW,
+    )
+
+    done = []
+    batch_done = asyncio.Event()
+
+    async def callback(question):
+        if question.priority == QuestionPriority.LOW:
+            await batch_done.wait()
+        done.append(question.page_id)
+
+    task = asyncio.create_task(watcher.start(callback))
+    await asyncio.sleep(0.1)
+    inbox.add("high", priority=QuestionPriority.HIGH)
+    await asyncio.sleep(0.2)
+
+    # 배치 결과를 기다리는 LOW 질문이 있어도 하나뿐인 워커는 HIGH 질문 처리
+    assert done == ["high"]
+    assert watcher.stats()["offloaded"] == 2
+
+    batch_done.set()
+    await asyncio.sleep(0.05)
+    assert sorted(done) == ["high", "low-1", "low-2"]
+
+    # 종료시 아직 기다리던 배치 질문은 취소되어 원장에 남음
+    inbox.add("low-3", priority=QuestionPriority.LOW)
+    batch_done.clear()
+    await asyncio.sleep(0.2)
+    watcher.stop()
+    await asyncio.wait_for(task, timeout=1)
+    assert watcher.stats()["offloaded"] == 0
+    assert [q.page_id for q in watcher.jobs.recover()] == ["low-3"]
@@ -0,0 +1,45 @@
+"""
+Load benchmark harness tests
+"""
+
+import pytest
+
+from benchmarks.load import format_report, load_profile, run_benchmark
+from benchmarks.mocks import LatencyModel, MockOpenAI, ProviderProfile
+
+
+def _fast_profile() -> dict:
+    profile = load_profile()
+    for provider in profile["providers"].values():
+        provider["latency"] = {"median": 0.01, "p95": 0.03}
+        provider["error_rate"] = 0.0
+    profile["config"]["system"]["polling_interval"] = 0.05
+    profile["config"]["system"]["max_concurrent_tasks"] = 4
+    return profile
+
+
+def test_mock_latency_is_reproducible():
+    profile = ProviderProfile(latency=LatencyModel(median=1.0, p95=3.0))
+    first, second = MockOpenAI(profile, seed=7), MockOpenAI(profile, seed=7)
+
+    samples = [profile.latency.sample(first.rng) for _ in range(200)]
+    assert samples == [profile.latency.sample(second.rng) for _ in range(200)]
+    assert 0.8 < sorted(samples)[100] < 1.25
+
+
+@pytest.mark.asyncio
+async def test_benchmark_drives_questions_through_the_application():
+    profile = _fast_profile()
+    # 429 → 레이트 리미터가 Retry-After만큼 물러남 (ChatGPT 단계는 실패)
+    profile["providers"]["openai"].update(rate_limit_rate=0.3, retry_after=0.05)
+
+    report = await run_benchmark(profile, questions=8, seed=1, timeout=20)
+
+    assert report["completed"] == 8 and report["unfinished"] == 0
+    assert report["result_pages"] == 8
+    assert report["providers"]["anthropic"]["calls"] == 16  # claude + 통합
+    assert report["providers"]["openai"]["rate_limited"] > 0
+    assert report["rate_limiters"]["openai"]["rate_limited"] > 0
+    assert 0 < report["latency"]["p50"] <= report["latency"]["p99"]
+    assert 0 < report["worker_utilization"] <= 1
+    assert "기준 대비" in format_report(report, baseline=report)
@@ -0,0 +1,49 @@
+"""
+Response cache tests
+"""
+
+import pytest
+
+from core.orchestrator import Orchestrator
+from tests.fakes import install_fake_clients
+from utils.cache import ResponseCache
+
+
+def test_lru_eviction_and_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("utils.cache.time.time", lambda: now[0])
+    cache = ResponseCache(max_entries=2, ttl=10)
+
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    cache.get("a")
+    cache.set("c", {"v": 3})
+
+    assert cache.get("b") is None  # 가장 오래 사용되지 않은 항목 제거
+    assert cache.get("a") == {"v": 1}
+
+    now[0] += 11
+    assert cache.get("a") is None
+
+
+def test_disk_cache_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    ResponseCache(path=path).set("k", {"v": 1})
+
+    assert ResponseCache(path=path).get("k") == {"v": 1}
+
+
+@pytest.mark.asyncio
+async def test_reworded_question_hits_cache(app_config):
+    orchestrator = Orchestrator(app_config)
+    fakes = install_fake_clients(orchestrator)
+
+    first = await orchestrator.process_question("AI 시장 전망은?", {})
+    second = await orchestrator.process_question("  ai 시장   전망은 ", {})
+
+    assert first["responses"]["gemini"]["metadata"]["cache"] == "miss"
+    assert second["responses"]["gemini"]["metadata"]["cache"] == "hit"
+    assert second["synthesis_metadata"]["cache"] == "hit"
+    assert second["metadata"]["cache_hits"] == 4
+    assert len(fakes["claude"].calls) == 1
+    assert len(fakes["synthesis"].calls) == 1
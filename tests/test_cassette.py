@@ -0,0 +1,103 @@
+"""
+Record/replay cassette tests
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from agents.claude_agent import send_message
+from core.cassette import Cassette, ReplayedAPIError
+from core.orchestrator import Orchestrator
+from tests.fakes import FakeAnthropicClient, install_fake_clients
+from utils.rate_limiter import is_rate_limit_error, retry_after
+
+
+class RateLimited(Exception):
+    status_code = 429
+    response = SimpleNamespace(headers={"retry-after": "2", "x-request-id": "abc"})
+
+
+def _orchestrator(app_config):
+    orchestrator = Orchestrator(app_config)
+    orchestrator.cache = None
+    return orchestrator, install_fake_clients(orchestrator)
+
+
+@pytest.mark.asyncio
+async def test_recorded_run_is_replayed_without_calling_providers(app_config, tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    orchestrator, _ = _orchestrator(app_config)
+    recorder = Cassette(str(path), "record")
+    recorder.install(orchestrator)
+    await orchestrator.process_question("질문")
+    recorder.close()
+
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert sorted(e["provider"] for e in entries) == [
+        "anthropic",
+        "anthropic",
+        "gemini",
+        "openai",
+    ]
+    assert all(e["duration"] >= 0 for e in entries)
+
+    orchestrator, fakes = _orchestrator(app_config)
+    for fake in fakes.values():
+        fake.text = "live"
+    replay = Cassette(str(path), "replay", timing=0)
+    replay.install(orchestrator)
+
+    result = await orchestrator.process_question("질문")
+    assert result["responses"]["gemini"]["content"] == "gemini answer"
+    assert result["responses"]["claude"]["metadata"]["input_tokens"] == 15
+    assert result["synthesis"] == "synthesis"
+    assert all(not fake.calls for fake in fakes.values())
+    assert replay.stats()["exact"] == 4
+
+    # 프롬프트가 달라지면 같은 메서드의 녹화를 순서대로 사용
+    result = await orchestrator.process_question("다른 질문")
+    assert result["success"] and replay.stats()["sequential"] == 4
+
+
+@pytest.mark.asyncio
+async def test_stream_chunks_errors_and_timing_are_replayed(tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    request = dict(
+        model="m", max_tokens=10, messages=[{"role": "user", "content": "q"}]
+    )
+    client = FakeAnthropicClient(latency=0.05, text="하나 둘 셋")
+    recorder = Cassette(path, "record")
+    wrapped = recorder.wrap(client, "anthropic")
+
+    chunks = []
+    recorded = await send_message(wrapped, chunks.append, **request)
+    client.error = RateLimited()
+    with pytest.raises(RateLimited):
+        await send_message(wrapped, **request)
+    recorder.close()
+
+    replay = Cassette(path, "replay", timing=0).wrap(
+        FakeAnthropicClient(text="live"), "anthropic"
+    )
+    replayed_chunks = []
+    reply = await send_message(replay, replayed_chunks.append, **request)
+    assert replayed_chunks == chunks == ["하나 ", "둘 ", "셋"]
+    assert reply["text"] == recorded["text"]
+    assert reply["output_tokens"] == recorded["output_tokens"] == 20
+
+    # 429는 같은 상태 코드와 Retry-After로 재생
+    with pytest.raises(ReplayedAPIError) as error:
+        await send_message(replay, **request)
+    assert is_rate_limit_error(error.value)
+    assert retry_after(error.value) == 2.0
+    assert "x-request-id" not in error.value.headers
+
+    # timing=1이면 녹화된 지연 그대로
+    replay = Cassette(path, "replay", timing=1.0).wrap(client, "anthropic")
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await send_message(replay, lambda _: None, **request)
+    assert loop.time() - start >= 0.04
@@ -0,0 +1,189 @@
+"""
+Circuit breaker tests
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from core.orchestrator import Orchestrator
+from integrations.notion_client import NotionClient
+from models.agent_response import AgentResponse
+from models.question import QuestionStatus
+from tests.fakes import FakeNotionAPI, install_fake_clients
+from utils.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    configure_circuit_breakers,
+    get_circuit_breaker,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_opens_and_recovers_through_half_open():
+    """연속 실패 → OPEN, 복구 시간 후 시험 요청 하나만 허용"""
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        "gemini", failure_threshold=2, recovery_timeout=10, clock=clock
+    )
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow()
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    clock.now = 10
+    assert breaker.allow()  # 시험 요청
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow()  # 시험 요청이 끝날 때까지 나머지는 차단
+
+    breaker.record_failure()  # 시험 실패 → 다시 OPEN
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.snapshot()["retry_in"] == 10
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.failures == 0
+
+
+class NotionRateLimited(Exception):
+    code = "rate_limited"
+    status = 429
+    headers = {"retry-after": "0"}
+    retryable = False
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_or_cancelled_trial_releases_half_open():
+    """HALF_OPEN 시험 요청이 429/취소로 끝나도 다음 요청이 다시 시험 요청이 됨"""
+    clock = FakeClock()
+    configure_circuit_breakers(
+        {"failure_threshold": 1, "recovery_timeout": 10}, clock=clock
+    )
+    breaker = get_circuit_breaker("notion")
+    breaker.record_failure()
+    clock.now = 10
+
+    notion = NotionClient("test", "inbox", "results")
+    notion.client = FakeNotionAPI()
+
+    async def rate_limited(page_id, **kwargs):
+        raise NotionRateLimited()
+
+    notion.client.pages.update = rate_limited
+    with pytest.raises(NotionRateLimited):
+        await notion.update_question_status("p1", QuestionStatus.COMPLETED)
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.failures == 1  # 429는 장애로 세지 않음
+
+    started = asyncio.Event()
+
+    async def hang(page_id, **kwargs):
+        started.set()
+        await asyncio.Event().wait()
+
+    notion.client.pages.update = hang
+    task = asyncio.create_task(
+        notion.update_question_status("p1", QuestionStatus.COMPLETED)
+    )
+    await started.wait()
+    assert not breaker.allow()  # 시험 요청 진행 중
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_open_agent_is_skipped_and_synthesis_proceeds(app_config):
+    """차단된 에이전트는 호출 없이 즉시 실패, 나머지로 통합 진행"""
+    configure_circuit_breakers({"failure_threshold": 1, "recovery_timeout": 60})
+    orchestrator = Orchestrator(app_config)
+    orchestrator.cache = None
+    fakes = install_fake_clients(orchestrator)
+    fakes["gemini"].error = RuntimeError("gemini outage")
+
+    first = await orchestrator.process_question("질문 1", {})
+    assert first["success"]
+    assert get_circuit_breaker("gemini").state == CircuitState.OPEN
+
+    second = await orchestrator.process_question("질문 2", {})
+
+    assert len(fakes["gemini"].calls) == 1  # 두 번째 질문에서는 호출하지 않음
+    assert second["success"]
+    assert second["responses"]["gemini"]["metadata"]["circuit"] == "open"
+    assert second["synthesis"] == "synthesis"
+    assert orchestrator.circuit_states()["gemini"]["state"] == "open"
+
+
+@pytest.mark.asyncio
+async def test_open_synthesis_breaker_uses_fallback(app_config):
+    """통합 서킷이 차단되면 기본 포맷으로 대체"""
+    configure_circuit_breakers({"failure_threshold": 1, "recovery_timeout": 60})
+    orchestrator = Orchestrator(app_config)
+    orchestrator.cache = None
+    fakes = install_fake_clients(orchestrator)
+    fakes["synthesis"].error = RuntimeError("anthropic outage")
+
+    await orchestrator.process_question("질문 1", {})
+    result = await orchestrator.process_question("질문 2", {})
+
+    assert len(fakes["synthesis"].calls) == 1
+    assert result["success"]
+    assert result["synthesis"].startswith("# AI 협업 분석 결과")
+    assert "서킷 차단" in result["metadata"]["errors"][0]
+
+
+@pytest.mark.asyncio
+async def test_refinement_records_breaker_outcome(app_config):
+    """보정 호출도 시험 요청 결과를 기록 (기한 초과는 초안 반환 + 자리 반납)"""
+    clock = FakeClock()
+    configure_circuit_breakers(
+        {"failure_threshold": 1, "recovery_timeout": 10}, clock=clock
+    )
+    orchestrator = Orchestrator(app_config)
+    orchestrator.cache = None
+    fakes = install_fake_clients(orchestrator)
+    stage = next(
+        s for s in orchestrator.pipelines.get(None).stages if s.agent == "claude"
+    )
+    draft = AgentResponse(
+        agent_name="claude",
+        content="draft",
+        metadata={},
+        timestamp=datetime.now(),
+        success=True,
+    )
+    breaker = get_circuit_breaker("claude")
+    breaker.record_failure()
+    clock.now = 10
+
+    fakes["claude"].latency = 5.0
+    deadline = asyncio.get_running_loop().time() + 0.1
+    result = await orchestrator._refine_stage(
+        stage, "질문", {"deadline": deadline}, draft
+    )
+    assert result is draft
+    assert breaker.state == CircuitState.HALF_OPEN and breaker.failures == 1
+
+    fakes["claude"].latency = 0.0
+    result = await orchestrator._refine_stage(stage, "질문", {}, draft)
+    assert result.success and result.content != "draft"
+    assert breaker.state == CircuitState.CLOSED
@@ -0,0 +1,58 @@
+"""
+Event-loop concurrency tests
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from core.orchestrator import Orchestrator
+from tests.fakes import install_fake_clients
+
+LATENCY = 0.2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_questions_overlap(app_config):
+    """N개 질문이 동시에 진행되어야 함 (이벤트 루프 블로킹 없음)"""
+    orchestrator = Orchestrator(app_config)
+    install_fake_clients(orchestrator, latency=LATENCY)
+
+    n = 5
+    # 질문 하나 = 에이전트 3회 + 합성 1회
+    per_question = 4 * LATENCY
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *[orchestrator.process_question(f"질문 {i}", {}) for i in range(n)]
+    )
+    elapsed = time.perf_counter() - start
+
+    assert all(r["success"] for r in results)
+    assert all(r["synthesis"] == "synthesis" for r in results)
+    # 직렬이라면 n * per_question (4초) 소요
+    assert elapsed < per_question * 2
+
+
+@pytest.mark.asyncio
+async def test_agent_call_does_not_block_loop(app_config):
+    """LLM 호출 중에도 다른 코루틴이 진행되어야 함"""
+    orchestrator = Orchestrator(app_config)
+    install_fake_clients(orchestrator, latency=LATENCY)
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    try:
+        await orchestrator.process_question("질문", {})
+    finally:
+        task.cancel()
+
+    assert ticks > 10
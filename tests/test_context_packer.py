@@ -0,0 +1,89 @@
+"""
+Context packer tests
+"""
+
+import pytest
+
+from core.context_packer import ContextPacker
+from core.orchestrator import Orchestrator
+from tests.fakes import install_fake_clients
+from utils.rate_limiter import estimate_tokens
+
+RESEARCH = """# 시장 규모
+국내 전기차 충전 시장은 2024년 1조 원 규모입니다 ([보고서](https://example.com/report)).
+
+# 경쟁사
+경쟁사 A와 B가 급속 충전 시장의 60%를 차지합니다. 출처: https://example.com/share.
+
+# 기타
+""" + "\n\n".join(
+    f"관련 없는 배경 설명 문단 {i}번입니다. " * 5 for i in range(10)
+)
+
+
+def test_urls_become_references_and_duplicates_are_removed():
+    analysis = (
+        "경쟁사 A와 B가 급속 충전 시장의 60%를 차지합니다. 출처: [1].\n\n"
+        "새로운 분석 내용 https://example.com/report 참고"
+    )
+    packer = ContextPacker()
+    packed, stats = packer.pack(
+        {"gemini_result": RESEARCH, "chatgpt_result": RESEARCH + "\n\n" + analysis},
+        budget=None,
+    )
+
+    assert "https://" not in packed["gemini_result"].split("참고 링크:")[0]
+    assert "⟨1⟩ https://example.com/report" in packed["gemini_result"]
+    # 같은 URL은 같은 번호, 목록은 처음 나온 입력에만
+    assert "새로운 분석 내용 ⟨1⟩ 참고" in packed["chatgpt_result"]
+    assert "참고 링크" not in packed["chatgpt_result"]
+    # chatgpt_result에 반복된 리서치 본문은 제거
+    assert "국내 전기차" not in packed["chatgpt_result"]
+    assert stats["duplicates"] >= 10
+    assert stats["urls"] == 2
+    assert stats["saved_tokens"] == stats["original_tokens"] - stats["packed_tokens"]
+
+
+def test_model_citations_are_not_taken_for_url_references():
+    packed, _ = ContextPacker().pack(
+        {
+            "gemini_result": "시장 점유율 60% [1]",
+            "chatgpt_result": "분석 근거 https://example.com/report",
+        },
+        budget=None,
+    )
+
+    assert packed["gemini_result"] == "시장 점유율 60% [1]"
+    assert packed["chatgpt_result"].endswith("⟨1⟩ https://example.com/report")
+
+
+def test_budget_keeps_question_relevant_sections():
+    packer = ContextPacker(default_budget=150)
+    packed, stats = packer.pack(
+        {"gemini_result": RESEARCH}, packer.budget("chatgpt"), "전기차 충전 시장 규모"
+    )
+    text = packed["gemini_result"]
+
+    assert estimate_tokens(text) <= 150
+    assert "# 시장 규모" in text and "1조 원" in text
+    assert stats["dropped_blocks"] > 0
+    assert 0 < stats["term_recall"] < 1
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_records_packing_savings(app_config):
+    app_config["context_packing"]["default_budget"] = 150
+    orchestrator = Orchestrator(app_config)
+    orchestrator.cache = None
+    fakes = install_fake_clients(orchestrator)
+    fakes["gemini"].text = RESEARCH
+
+    result = await orchestrator.process_question("전기차 충전 시장 규모")
+
+    # ChatGPT 프롬프트에는 URL 대신 ⟨n⟩ 표시와 참고 링크 목록
+    prompt = fakes["chatgpt"].calls[0]["messages"][1]["content"]
+    assert "([보고서] ⟨1⟩)" not in prompt and "보고서 ⟨1⟩" in prompt
+    packing = result["metadata"]["context_packing"]
+    assert packing["stages"]["chatgpt"]["urls"] == 2
+    assert packing["stages"]["chatgpt"]["dropped_blocks"] > 0
+    assert packing["saved_tokens"] > 0
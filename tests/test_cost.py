@@ -0,0 +1,150 @@
+"""
+Token usage pricing and daily budget tests
+"""
+
+from datetime import date
+
+import pytest
+
+from core.orchestrator import Orchestrator
+from core.scheduler import QuestionScheduler
+from models.question import Question, QuestionPriority, QuestionStatus
+from tests.fakes import install_fake_clients
+from utils.cost import CostTracker, configure_cost_tracker, cost_tracker
+
+PRICING = {
+    "gpt-4": {"input": 30.0, "output": 60.0},
+    "claude-sonnet-4-5": {"input": 3.0, "output": 15.0},
+}
+
+
+def test_price_lookup_and_daily_budget_levels():
+    today = [date(2025, 11, 9)]
+    tracker = CostTracker(
+        PRICING,
+        {"daily_usd": 1.0, "downgrade_at": 0.5, "hold_at": 1.0},
+        today=lambda: today[0],
+    )
+
+    # 날짜가 붙은 모델 이름은 접두사로 가격 조회
+    usage = tracker.record("claude-sonnet-4-5-20250929", 100_000, 10_000)
+    assert usage == {
+        "input_tokens": 100_000,
+        "output_tokens": 10_000,
+        "tokens": 110_000,
+        "cost": 0.45,
+    }
+    assert tracker.record("unknown-model", 1000, 1000)["cost"] == 0.0
+    assert tracker.level() == "ok"
+
+    tracker.record("gpt-4", 10_000, 0)  # $0.30 → 누적 $0.75
+    assert tracker.level() == "downgrade"
+    assert tracker.should_downgrade("low")
+    assert not tracker.should_downgrade("high")
+
+    tracker.record("gpt-4", 0, 5_000)  # $0.30 → 누적 $1.05
+    low = Question(
+        page_id="p",
+        text="q",
+        status=QuestionStatus.PENDING,
+        priority=QuestionPriority.LOW,
+    )
+    assert tracker.should_hold(low)
+
+    # 날짜가 바뀌면 일일 집계 초기화
+    today[0] = date(2025, 11, 10)
+    assert tracker.daily_total() == 0.0
+    assert not tracker.should_hold(low)
+
+
+@pytest.mark.asyncio
+async def test_question_usage_and_low_priority_downgrade(app_config):
+    app_config["budget"]["daily_usd"] = 1.0
+    configure_cost_tracker(PRICING, app_config["budget"])
+    orchestrator = Orchestrator(app_config)
+    orchestrator.cache = None
+    fakes = install_fake_clients(orchestrator)
+
+    # 에이전트 3개 + 통합, 호출마다 입력 10 / 출력 20 토큰
+    # (Claude와 통합은 system 프롬프트 캐시 쓰기 5토큰 추가)
+    result = await orchestrator.process_question("질문", {"priority": "low"})
+    usage = result["metadata"]["usage"]
+    assert usage["input_tokens"] == 50 and usage["output_tokens"] == 80
+    assert usage["cost"] == pytest.approx(
+        (10 * 30 + 20 * 60 + 2 * (15 * 3 + 20 * 15)) / 1_000_000
+    )
+    assert result["metadata"]["daily_cost"] == pytest.approx(usage["cost"])
+    assert result["responses"]["gemini"]["metadata"]["input_tokens"] == 10
+    assert not result["metadata"]["downgraded"]
+
+    # 예산의 80%를 넘기면 LOW 질문은 저렴한 모델로
+    cost_tracker.seed(0.9)
+    for agent in orchestrator.downgrades.values():
+        if agent.name == "gemini":
+            agent.model = fakes["gemini"]
+        else:
+            agent.client = fakes[agent.name]
+    fakes["chatgpt"].calls.clear()
+
+    result = await orchestrator.process_question("질문", {"priority": "low"})
+    assert result["metadata"]["downgraded"]
+    assert result["responses"]["chatgpt"]["metadata"]["model"] == "gpt-4o-mini"
+    assert fakes["chatgpt"].calls[0]["model"] == "gpt-4o-mini"
+
+    result = await orchestrator.process_question("질문", {"priority": "high"})
+    assert not result["metadata"]["downgraded"]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_holds_questions_over_budget():
+    held = {"on": True}
+    scheduler = QuestionScheduler(
+        hold=lambda q: held["on"] and q.priority == QuestionPriority.LOW,
+        recheck_interval=0.01,
+    )
+    for page_id, priority in (
+        ("low", QuestionPriority.LOW),
+        ("med", QuestionPriority.MEDIUM),
+    ):
+        scheduler.put_nowait(
+            Question(
+                page_id=page_id,
+                text="q",
+                status=QuestionStatus.PENDING,
+                priority=priority,
+            )
+        )
+
+    assert (await scheduler.get()).page_id == "med"
+    assert scheduler.stats()["low"]["held"] == 1
+
+    held["on"] = False  # 예산이 풀리면 재확인 주기 안에 꺼냄
+    assert (await scheduler.get()).page_id == "low"
+
+
+@pytest.mark.asyncio
+async def test_static_prompt_prefix_is_cached(app_config):
+    configure_cost_tracker(app_config["pricing"])
+    orchestrator = Orchestrator(app_config)
+    orchestrator.cache = None
+    fakes = install_fake_clients(orchestrator)
+
+    await orchestrator.process_question("첫 질문")
+    result = await orchestrator.process_question("두 번째 질문")
+
+    # 고정 지시문은 캐시 표시를 붙인 system으로, 가변 내용만 사용자 메시지로
+    request = fakes["claude"].calls[-1]
+    assert request["system"][0]["cache_control"] == {"type": "ephemeral"}
+    assert "두 번째 질문" not in request["system"][0]["text"]
+    assert "출력 구조" not in request["messages"][0]["content"]
+    assert fakes["chatgpt"].calls[-1]["messages"][0]["role"] == "system"
+
+    claude = result["responses"]["claude"]["metadata"]
+    assert claude["cache_read_tokens"] == 5 and claude["input_tokens"] == 15
+    assert claude["cache_savings"] == pytest.approx(
+        5 * (3.0 - 0.3) / 1_000_000, abs=1e-6
+    )
+    assert claude["first_token"] is not None
+    assert result["responses"]["chatgpt"]["metadata"]["cache_read_tokens"] == 5
+    assert result["synthesis_metadata"]["cache_read_tokens"] == 5
+    assert result["metadata"]["usage"]["cache_read_tokens"] == 15
@@ -0,0 +1,87 @@
+"""
+Deadline budget tests
+"""
+
+import time
+
+import pytest
+
+from core.orchestrator import Orchestrator
+from core.pipeline import Pipeline
+from tests.fakes import install_fake_clients
+from utils.circuit_breaker import (
+    CircuitState,
+    configure_circuit_breakers,
+    get_circuit_breaker,
+)
+
+
+def make_orchestrator(app_config, budget: float, reserve: float):
+    app_config["deadlines"] = {"medium": budget, "synthesis_reserve": reserve}
+    orchestrator = Orchestrator(app_config)
+    orchestrator.cache = None
+    return orchestrator, install_fake_clients(orchestrator)
+
+
+def test_remaining_stages_follow_longest_path():
+    pipeline = Pipeline.from_config(
+        "p",
+        [
+            {"agent": "gemini"},
+            {"agent": "chatgpt", "inputs": ["gemini"]},
+            {"agent": "claude"},
+        ],
+    )
+    assert pipeline.remaining_stages("gemini") == 2
+    assert pipeline.remaining_stages("chatgpt") == 1
+    assert pipeline.remaining_stages("claude") == 1
+
+
+@pytest.mark.asyncio
+async def test_overrunning_stage_is_cut_short(app_config):
+    """기한을 넘긴 단계는 취소되고 나머지 결과로 통합"""
+    orchestrator, fakes = make_orchestrator(app_config, budget=0.8, reserve=0.2)
+    fakes["gemini"].latency = 5.0
+
+    start = time.perf_counter()
+    result = await orchestrator.process_question("질문", {"priority": "medium"})
+    elapsed = time.perf_counter() - start
+
+    assert result["success"]
+    assert result["metadata"]["cut_short"] == ["gemini"]
+    assert result["responses"]["gemini"]["metadata"]["cut_short"]
+    assert result["synthesis"] == "synthesis"
+    assert elapsed < 1.0
+
+    # 남은 단계 기한이 SDK 타임아웃으로 전달됨
+    timeout = fakes["claude"].calls[0]["timeout"]
+    assert 0 < timeout <= 0.6
+
+
+@pytest.mark.asyncio
+async def test_slow_synthesis_falls_back(app_config):
+    """통합이 기한을 넘기면 기본 포맷으로 대체"""
+    orchestrator, fakes = make_orchestrator(app_config, budget=0.5, reserve=0.3)
+    fakes["synthesis"].latency = 5.0
+
+    result = await orchestrator.process_question("질문", {})
+
+    assert result["success"]
+    assert result["metadata"]["cut_short"] == ["synthesis"]
+    assert result["synthesis"].startswith("# AI 협업 분석 결과")
+
+
+@pytest.mark.asyncio
+async def test_deadline_cut_offs_do_not_trip_breakers(app_config):
+    """기한 때문에 끊긴 단계/통합은 프로바이더 장애로 세지 않음"""
+    configure_circuit_breakers({"failure_threshold": 1, "recovery_timeout": 60})
+    orchestrator, fakes = make_orchestrator(app_config, budget=0.6, reserve=0.2)
+    fakes["gemini"].latency = 5.0
+    fakes["synthesis"].latency = 5.0
+
+    result = await orchestrator.process_question("질문", {"priority": "medium"})
+
+    assert result["metadata"]["cut_short"] == ["gemini", "synthesis"]
+    assert get_circuit_breaker("gemini").state == CircuitState.CLOSED
+    assert get_circuit_breaker("synthesis").state == CircuitState.CLOSED
+    assert get_circuit_breaker("gemini").failures == 0
@@ -0,0 +1,74 @@
+"""
+Hedged request tests
+"""
+
+import time
+
+import pytest
+
+from core.hedging import Hedger, LatencyTracker
+from core.orchestrator import Orchestrator
+from tests.fakes import FakeGeminiModel, install_fake_clients
+
+
+def test_latency_percentile():
+    tracker = LatencyTracker(window=100)
+    for ms in range(1, 101):
+        tracker.record(ms / 1000)
+    assert tracker.percentile(90) == pytest.approx(0.09)
+    assert tracker.percentile(50) == pytest.approx(0.05)
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged_to_fallback_model(app_config):
+    """p90을 넘긴 호출은 폴백 모델로 헤지되고 느린 기본 요청은 취소"""
+    app_config["agents"]["gemini"]["hedge"] = {
+        "enabled": True,
+        "min_samples": 5,
+        "max_hedge_rate": 1.0,
+        "fallback_model": "gemini-flash",
+    }
+    orchestrator = Orchestrator(app_config)
+    orchestrator.cache = None
+    fakes = install_fake_clients(orchestrator)
+    fakes["gemini"].latency = 5.0
+
+    hedger = orchestrator.hedgers["gemini"]
+    hedger.fallback_agent.model = FakeGeminiModel(text="fast answer")
+    for _ in range(5):
+        hedger.latency.record(0.05)
+
+    start = time.perf_counter()
+    result = await orchestrator.process_question("질문", {})
+    elapsed = time.perf_counter() - start
+
+    gemini = result["responses"]["gemini"]
+    assert gemini["content"] == "fast answer"
+    assert gemini["metadata"]["hedge"]["winner"] == "hedge"
+    assert gemini["metadata"]["hedge"]["model"] == "gemini-flash"
+    assert elapsed < 1.0
+    assert hedger.stats()["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_rate_is_capped(app_config):
+    """헤지 비율 상한을 넘으면 헤지하지 않고 기본 요청을 기다림"""
+    app_config["agents"]["gemini"]["hedge"] = {
+        "enabled": True,
+        "max_hedge_rate": 0.5,
+    }
+    orchestrator = Orchestrator(app_config)
+    orchestrator.cache = None
+    fakes = install_fake_clients(orchestrator)
+    fakes["gemini"].latency = 0.05
+
+    hedger: Hedger = orchestrator.hedgers["gemini"]
+    hedger.hedge_delay = lambda: 0.001  # 매 호출이 헤지 기준을 넘도록 고정
+
+    for i in range(4):
+        await orchestrator.process_question(f"질문 {i}", {})
+
+    assert hedger.calls == 4
+    assert hedger.hedges == 2
+    # 헤지 2회 + 기본 4회 (헤지는 같은 모델로 전송)
+    assert len(fakes["gemini"].calls) == 6
@@ -0,0 +1,73 @@
+"""
+JobStore tests
+"""
+
+from datetime import datetime
+
+from core.job_store import WRITE_STATUS, JobState, JobStore
+from models.agent_response import AgentResponse
+from models.question import Question, QuestionStatus
+
+
+def make_question(page_id: str) -> Question:
+    return Question(page_id=page_id, text="질문", status=QuestionStatus.PENDING)
+
+
+def test_enqueue_deduplicates_active_and_completed(tmp_path):
+    jobs = JobStore(str(tmp_path / "jobs.db"))
+
+    assert jobs.enqueue(make_question("a"))
+    assert not jobs.enqueue(make_question("a"))
+
+    jobs.start_attempt("a")
+    jobs.complete("a", result_url="https://notion.so/r")
+    assert not jobs.enqueue(make_question("a"))
+
+    # 실패한 질문이 다시 pending되면 재처리
+    assert jobs.enqueue(make_question("b"))
+    jobs.start_attempt("b")
+    jobs.transition("b", JobState.FAILED)
+    assert jobs.enqueue(make_question("b"))
+    assert jobs.get_attempts("b") == 1  # 시도 횟수는 유지
+
+    # 실패 상태가 아직 Notion에 반영되지 않았으면 (쓰기 대기 중) 재등록 안 함
+    jobs.start_attempt("b")
+    jobs.transition("b", JobState.FAILED)
+    jobs.put_write("b", WRITE_STATUS, QuestionStatus.FAILED.value)
+    assert not jobs.enqueue(make_question("b"))
+    [write] = jobs.pending_writes(10)
+    jobs.finish_write(write["id"])
+    assert jobs.enqueue(make_question("b"))
+    assert jobs.get_attempts("b") == 2
+
+
+def test_recover_after_restart(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    jobs = JobStore(path)
+    for page_id in ("queued", "running", "synthesized", "done"):
+        jobs.enqueue(make_question(page_id))
+    jobs.start_attempt("running")
+    jobs.save_stage(
+        "running",
+        "gemini",
+        AgentResponse(
+            agent_name="gemini",
+            content="research",
+            timestamp=datetime.now(),
+            success=True,
+        ),
+    )
+    jobs.start_attempt("synthesized")
+    jobs.save_result("synthesized", {"success": True, "synthesis": "s"})
+    jobs.start_attempt("done")
+    jobs.complete("done")
+    jobs.close()
+
+    # 프로세스 재시작
+    jobs = JobStore(path)
+    recovered = [q.page_id for q in jobs.recover()]
+
+    assert recovered == ["queued", "running", "synthesized"]
+    assert jobs.load_stage("running", "gemini").content == "research"
+    assert jobs.load_result("synthesized")["synthesis"] == "s"
+    assert jobs.start_attempt("running") == 2
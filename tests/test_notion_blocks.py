@@ -0,0 +1,82 @@
+"""
+Notion block builder and chunked result page tests
+"""
+
+import pytest
+
+from integrations.notion_blocks import markdown_to_blocks, rich_text, split_text
+from models.question import Question, QuestionStatus
+from tests.test_notion_client import make_client
+
+
+def _text(block):
+    return "".join(
+        item["text"]["content"] for item in block[block["type"]]["rich_text"]
+    )
+
+
+def test_markdown_is_converted_to_typed_blocks():
+    blocks = markdown_to_blocks(
+        "# 제목\n\n첫 줄\n이어지는 줄\n\n- 항목 **굵게**\n1. 번호\n- [x] 완료\n"
+        "> 인용\n\n---\n```python\nprint('hi')\n```"
+    )
+
+    assert [b["type"] for b in blocks] == [
+        "heading_1",
+        "paragraph",
+        "bulleted_list_item",
+        "numbered_list_item",
+        "to_do",
+        "quote",
+        "divider",
+        "code",
+    ]
+    assert _text(blocks[1]) == "첫 줄\n이어지는 줄"
+    assert blocks[2]["bulleted_list_item"]["rich_text"][1]["annotations"] == {
+        "bold": True
+    }
+    assert blocks[4]["to_do"]["checked"] is True
+    assert blocks[7]["code"]["language"] == "python"
+
+
+def test_long_text_is_split_within_limits():
+    text = "가나다 " * 1000  # 4000자
+    items = rich_text(text)
+
+    assert all(len(item["text"]["content"]) <= 2000 for item in items)
+    assert "".join(item["text"]["content"] for item in items) == text
+    # 서로게이트 쌍(이모지)은 UTF-16 기준 2로 셈
+    assert all(
+        len(chunk.encode("utf-16-le")) <= 4000 for chunk in split_text("😀" * 1500)
+    )
+
+
+@pytest.mark.asyncio
+async def test_result_page_keeps_full_content_with_minimal_calls():
+    client = make_client()
+    question = Question(
+        page_id="q1", text="질문", status=QuestionStatus.PROCESSING, priority=None
+    )
+    synthesis = "\n\n".join(f"문단 {i} " + "내용 " * 600 for i in range(150))
+    long_answer = "\n\n".join(f"- 항목 {i}" for i in range(250))
+
+    result = await client.create_result_page(
+        question=question,
+        responses={"claude": {"success": True, "content": long_answer}},
+        synthesis=synthesis,
+        metadata={"total_duration": 1.0, "successful_agents": 1},
+    )
+
+    api = client.client
+    created = api.created_pages[0]["children"]
+    appended = [block for _, children in api.appended for block in children]
+    page_text = "".join(_text(b) for b in created + appended if b["type"] != "divider")
+    assert synthesis.replace("\n\n", "") in page_text
+
+    # 토글 children 100개 + 토글 ID로 이어 붙인 150개
+    toggle = next(b for b in created + appended if b["type"] == "toggle")
+    overflow = [c for block_id, c in api.appended if block_id != result["id"]]
+    assert len(toggle["toggle"]["children"]) + sum(map(len, overflow)) == 250
+
+    assert all(len(children) <= 100 for _, children in api.appended)
+    assert result["api_calls"] == 1 + len(api.appended) == 4
@@ -0,0 +1,70 @@
+"""
+NotionClient tests
+"""
+
+import pytest
+
+from integrations.notion_client import NotionClient
+from tests.fakes import FakeNotionAPI, make_notion_page
+
+
+def make_client(page_size=100, full_resync_interval=600):
+    client = NotionClient(
+        api_key="test",
+        inbox_db_id="inbox",
+        results_db_id="results",
+        page_size=page_size,
+        full_resync_interval=full_resync_interval,
+    )
+    client.client = FakeNotionAPI()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_query_follows_pagination():
+    client = make_client(page_size=2)
+    client.client.inbox = [make_notion_page(f"p{i}", f"질문 {i}") for i in range(5)]
+
+    questions = await client.query_pending_questions()
+
+    assert [q.page_id for q in questions] == ["p0", "p1", "p2", "p3", "p4"]
+    assert len(client.client.queries) == 3
+    assert all(q["page_size"] == 2 for q in client.client.queries)
+
+
+@pytest.mark.asyncio
+async def test_delta_query_after_full_sync():
+    client = make_client()
+    client.client.inbox = [make_notion_page("p0", "질문")]
+
+    await client.query_pending_questions()
+    await client.query_pending_questions()
+
+    full_filter, delta_filter = (q["filter"] for q in client.client.queries)
+    assert "and" not in full_filter
+    assert delta_filter["and"][1]["timestamp"] == "last_edited_time"
+
+
+@pytest.mark.asyncio
+async def test_delta_query_follows_pagination():
+    client = make_client(page_size=2)
+    await client.query_pending_questions()
+
+    client.client.inbox = [make_notion_page(f"p{i}", f"질문 {i}") for i in range(3)]
+    client.client.queries.clear()
+    questions = await client.query_pending_questions()
+
+    assert [q.page_id for q in questions] == ["p0", "p1", "p2"]
+    assert len(client.client.queries) == 2
+    assert all("and" in q["filter"] for q in client.client.queries)
+    assert client.client.queries[1]["start_cursor"] == "2"
+
+
+@pytest.mark.asyncio
+async def test_periodic_full_resync():
+    client = make_client(full_resync_interval=0)
+
+    await client.query_pending_questions()
+    await client.query_pending_questions()
+
+    assert all("and" not in q["filter"] for q in client.client.queries)
@@ -0,0 +1,105 @@
+"""
+NotionWatcher worker-pool tests
+"""
+
+import asyncio
+
+import pytest
+
+from core.notion_watcher import NotionWatcher
+from models.question import QuestionPriority
+from tests.fakes import FakeInbox
+
+
+@pytest.mark.asyncio
+async def test_slow_question_does_not_stall_intake():
+    inbox = FakeInbox()
+    inbox.add("slow")
+    watcher = NotionWatcher(inbox, polling_interval=0.05, max_concurrent_tasks=2)
+
+    done = []
+    release_slow = asyncio.Event()
+
+    async def callback(question):
+        if question.page_id == "slow":
+            await release_slow.wait()
+        done.append(question.page_id)
+
+    task = asyncio.create_task(watcher.start(callback))
+    await asyncio.sleep(0.1)
+
+    # 느린 질문이 처리 중인 동안 새 질문이 들어와도 바로 처리되어야 함
+    inbox.add("fast-1")
+    inbox.add("fast-2")
+    await asyncio.sleep(0.3)
+
+    assert set(done) == {"fast-1", "fast-2"}
+    assert watcher.stats()["in_flight"] == 1
+
+    release_slow.set()
+    await asyncio.sleep(0.05)
+    watcher.stop()
+    await asyncio.wait_for(task, timeout=1)
+
+    assert set(done) == {"slow", "fast-1", "fast-2"}
+    assert watcher.stats() == {
+        "workers": 2,
+        "queued": 0,
+        "in_flight": 0,
+        "offloaded": 0,
+        "processed": 3,
+    }
+
+
+@pytest.mark.asyncio
+async def test_question_is_not_enqueued_twice():
+    inbox = FakeInbox()
+    inbox.add("a")
+    watcher = NotionWatcher(inbox, polling_interval=60, max_concurrent_tasks=1)
+
+    assert await watcher.poll_once() == 1
+    assert await watcher.poll_once() == 0
+    assert watcher.stats()["queued"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_status_update_forces_full_sync():
+    inbox = FakeInbox()
+    inbox.add("a")
+    inbox.broken.add("a")
+    watcher = NotionWatcher(inbox, polling_interval=60, max_concurrent_tasks=1)
+
+    async def callback(question):
+        pass
+
+    await watcher.poll_once()
+    await watcher._process_question(watcher.queue.get_nowait(), callback)
+    await watcher.poll_once()
+
+    # 처리 못한 질문이 pending으로 남았으므로 전체 조회로 다시 가져와야 함
+    assert inbox.full_flags == [None, True]
+
+
+@pytest.mark.asyncio
+async def test_shutdown_with_held_questions():
+    """예산 때문에 붙잡아 둔 질문이 있어도 종료되고, 질문은 원장에 남음"""
+    inbox = FakeInbox()
+    inbox.add("low", priority=QuestionPriority.LOW)
+    watcher = NotionWatcher(
+        inbox,
+        polling_interval=0.05,
+        max_concurrent_tasks=1,
+        hold=lambda q: q.priority == QuestionPriority.LOW,
+    )
+
+    async def callback(question):
+        raise AssertionError("붙잡아 둔 질문이 처리됨")
+
+    task = asyncio.create_task(watcher.start(callback))
+    await asyncio.sleep(0.1)
+    assert watcher.stats()["queued"] == 1
+
+    watcher.stop()
+    await asyncio.wait_for(task, timeout=1)
+    assert watcher.stats()["queued"] == 0
+    assert [q.page_id for q in watcher.jobs.recover()] == ["low"]
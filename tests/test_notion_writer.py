@@ -0,0 +1,96 @@
+"""
+Write-behind NotionWriter tests
+"""
+
+import pytest
+
+from core.job_store import JobState, JobStore
+from core.notion_writer import NotionWriter
+from integrations.notion_client import NotionClient
+from models.question import Question, QuestionStatus
+from tests.fakes import FakeNotionAPI
+
+RESULT = {
+    "success": True,
+    "responses": {
+        "gemini": {"content": "g", "success": True, "error": None, "metadata": {}}
+    },
+    "synthesis": "종합",
+    "metadata": {"total_duration": 1.0, "successful_agents": 1, "total_agents": 1},
+}
+
+
+def make_writer(path=":memory:"):
+    notion = NotionClient(api_key="test", inbox_db_id="inbox", results_db_id="results")
+    notion.client = FakeNotionAPI()
+    jobs = JobStore(path)
+    return NotionWriter(notion, jobs, batch_size=10), notion.client, jobs
+
+
+def synthesize(jobs: JobStore, page_id: str):
+    jobs.enqueue(Question(page_id=page_id, text="질문", status=QuestionStatus.PENDING))
+    jobs.start_attempt(page_id)
+    jobs.save_result(page_id, RESULT)
+
+
+@pytest.mark.asyncio
+async def test_status_updates_are_coalesced_and_results_go_first():
+    writer, api, jobs = make_writer()
+    synthesize(jobs, "a")
+
+    await writer.update_question_status("b", QuestionStatus.PROCESSING)
+    await writer.update_question_status("b", QuestionStatus.FAILED)
+    await writer.update_question_status("a", QuestionStatus.PROCESSING)
+    writer.submit_result("a")
+
+    await writer.flush()
+
+    # b는 마지막 상태만, a는 결과 생성 후 completed로 (processing은 대체됨)
+    assert [
+        (p, u["properties"]["상태"]["status"]["name"]) for p, u in api.updated_pages
+    ] == [
+        ("b", "failed"),
+        ("a", "completed"),
+    ]
+    assert len(api.created_pages) == 1
+    assert jobs.get_state("a") == JobState.COMPLETED
+    assert jobs.get_job("a")["result_url"] == "https://notion.so/result-0"
+    assert writer.stats() == {"pending": 0, "written": 3, "coalesced": 2, "failed": 0}
+
+
+@pytest.mark.asyncio
+async def test_pending_writes_survive_restart(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    writer, api, jobs = make_writer(path)
+    synthesize(jobs, "a")
+    writer.submit_result("a")
+    jobs.close()
+
+    # 재시작: 대기열이 원장에 남아 있어 새 작성기가 이어서 반영
+    writer, api, jobs = make_writer(path)
+    await writer.flush()
+
+    assert len(api.created_pages) == 1
+    assert jobs.get_state("a") == JobState.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_failed_write_is_retried_later(monkeypatch):
+    writer, api, jobs = make_writer()
+
+    async def no_sleep(delay):
+        pass
+
+    # NotionClient 자체 재시도(async_retry) 대기 생략
+    monkeypatch.setattr("utils.retry.asyncio.sleep", no_sleep)
+
+    async def broken_update(page_id, **kwargs):
+        raise RuntimeError("Notion 오류")
+
+    api.pages.update = broken_update
+    await writer.update_question_status("a", QuestionStatus.PROCESSING)
+    await writer.flush()
+
+    assert writer.stats()["failed"] == 1
+    assert writer.stats()["pending"] == 1  # 백오프 후 재시도 대기
+    assert jobs.pending_writes(10) == []
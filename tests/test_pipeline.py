@@ -0,0 +1,204 @@
+"""
+Pipeline scheduler tests
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from core.orchestrator import Orchestrator
+from core.pipeline import EarlyStart, Pipeline, PipelineRegistry
+from main import Application
+from models.agent_response import AgentResponse
+from tests.fakes import install_fake_clients
+
+
+def make_runner(latency: float, calls: list):
+    async def runner(stage, question, context):
+        calls.append((stage.name, dict(context)))
+        await asyncio.sleep(latency)
+        return AgentResponse(
+            agent_name=stage.agent,
+            content=f"{stage.name} result",
+            timestamp=datetime.now(),
+            success=True,
+        )
+
+    return runner
+
+
+@pytest.mark.asyncio
+async def test_independent_stages_run_in_parallel():
+    pipeline = Pipeline.from_config(
+        "fast",
+        [
+            {"agent": "gemini"},
+            {"agent": "chatgpt", "inputs": ["gemini"]},
+            {"agent": "claude"},
+        ],
+    )
+    calls = []
+
+    start = time.perf_counter()
+    responses = await pipeline.run("q", {}, make_runner(0.2, calls))
+    elapsed = time.perf_counter() - start
+
+    assert [r.agent_name for r in responses] == ["gemini", "claude", "chatgpt"]
+    # gemini ∥ claude, 이후 chatgpt → 2단계 분량
+    assert elapsed < 0.55
+    chatgpt_context = next(ctx for name, ctx in calls if name == "chatgpt")
+    assert chatgpt_context["gemini_result"] == "gemini result"
+
+
+@pytest.mark.asyncio
+async def test_custom_named_stage_feeds_agent_result_key():
+    pipeline = Pipeline.from_config(
+        "named",
+        [
+            {"name": "research", "agent": "gemini"},
+            {"agent": "chatgpt", "inputs": ["research"]},
+        ],
+    )
+    calls = []
+
+    responses = await pipeline.run("q", {}, make_runner(0, calls))
+
+    chatgpt_context = next(ctx for name, ctx in calls if name == "chatgpt")
+    assert chatgpt_context["gemini_result"] == "research result"
+    assert responses[0].agent_name == "gemini"
+    assert responses[0].metadata["stage"] == "research"
+
+
+@pytest.mark.asyncio
+async def test_synthesis_sees_every_stage_of_a_reused_agent(app_config):
+    app_config["pipeline"]["categories"] = {
+        "검토": [
+            {"agent": "gemini"},
+            {"name": "plan", "agent": "claude", "inputs": ["gemini"]},
+            {"name": "review", "agent": "claude", "inputs": ["plan"]},
+        ]
+    }
+    orchestrator = Orchestrator(app_config)
+    orchestrator.cache = None
+    fakes = install_fake_clients(orchestrator)
+
+    def synthesis_prompt():
+        return fakes["synthesis"].calls[-1]["messages"][0]["content"]
+
+    result = await orchestrator.process_question("q", {"category": "검토"})
+    assert set(result["responses"]) == {"gemini", "plan", "review"}
+    assert "### plan\nclaude answer" in synthesis_prompt()
+    assert "### review\nclaude answer" in synthesis_prompt()
+
+    # 유사 질문 재사용(resynthesize)도 단계 이름 키에서 에이전트를 복원
+    app = SimpleNamespace(jobs=SimpleNamespace(load_result=lambda page_id: result))
+    reused = Application._load_duplicate_responses(app, {"page_id": "p"})
+    assert [r.agent_name for r in reused] == ["gemini", "claude", "claude"]
+    await orchestrator.process_question("q", {"category": "검토"}, responses=reused)
+    assert "### review\nclaude answer" in synthesis_prompt()
+    assert "정보 없음" not in synthesis_prompt()
+
+
+def test_same_agent_inputs_are_rejected():
+    with pytest.raises(ValueError):
+        Pipeline.from_config(
+            "dup",
+            [
+                {"name": "a", "agent": "gemini"},
+                {"name": "b", "agent": "gemini"},
+                {"agent": "claude", "inputs": ["a", "b"]},
+            ],
+        )
+
+
+def test_default_pipeline_is_sequential_chain():
+    pipeline = PipelineRegistry.from_config(None).get("anything")
+    assert [s.name for s in pipeline.stages] == ["gemini", "chatgpt", "claude"]
+    assert pipeline.stages[2].inputs == ["gemini", "chatgpt"]
+
+
+def test_cycle_is_rejected():
+    with pytest.raises(ValueError):
+        Pipeline.from_config(
+            "bad",
+            [
+                {"agent": "gemini", "inputs": ["claude"]},
+                {"agent": "claude", "inputs": ["gemini"]},
+            ],
+        )
+
+
+def streaming_runner(calls: list, started: dict):
+    """업스트림은 섹션을 나눠 스트리밍, 다운스트림은 받은 입력을 기록"""
+
+    async def runner(stage, question, context):
+        started[stage.name] = asyncio.get_running_loop().time()
+        calls.append((stage.name, dict(context)))
+        text = ""
+        for section in ("# A\n가\n", "# B\n나\n", "# C\n다\n", "# D\n" + "라" * 50):
+            await asyncio.sleep(0.05)
+            text += section
+            if context.get("on_chunk"):
+                context["on_chunk"](section)
+        return AgentResponse(
+            agent_name=stage.agent,
+            content=text if stage.name == "gemini" else f"{stage.name} draft",
+            timestamp=datetime.now(),
+            success=True,
+        )
+
+    return runner
+
+
+@pytest.mark.asyncio
+async def test_early_start_uses_prefix_and_refines():
+    pipeline = Pipeline.from_config(
+        "p", [{"agent": "gemini"}, {"agent": "chatgpt", "inputs": ["gemini"]}]
+    )
+    refined = []
+
+    async def refiner(stage, question, context, draft):
+        refined.append(context["gemini_result"])
+        return AgentResponse(
+            agent_name=stage.agent,
+            content="refined",
+            timestamp=datetime.now(),
+            success=True,
+        )
+
+    calls, started = [], {}
+
+    async def runner(stage, question, context):
+        # 오케스트레이터처럼 on_partial을 에이전트 on_chunk로 연결
+        if context.get("on_partial"):
+            context["on_chunk"] = context["on_partial"]
+        return await streaming_runner(calls, started)(stage, question, context)
+
+    responses = await pipeline.run(
+        "q", {}, runner, early_start=EarlyStart(prefix_sections=2, refiner=refiner)
+    )
+
+    chatgpt_context = dict(calls)["chatgpt"]
+    assert chatgpt_context["gemini_result"] == "# A\n가\n# B\n나"
+    # 업스트림이 끝나기 전에 시작
+    assert started["chatgpt"] - started["gemini"] < 0.2
+
+    gemini, chatgpt = responses
+    assert refined == [gemini.content]
+    assert chatgpt.content == "refined"
+    pipelined = chatgpt.metadata["pipelined"]
+    assert pipelined["refined"] and pipelined["head_start"] > 0
+    assert (
+        pipelined["inputs"]["gemini"]["seen"] < pipelined["inputs"]["gemini"]["total"]
+    )
+
+
+def test_refinement_only_when_output_differs_materially():
+    early = EarlyStart(max_unseen=0.5)
+    assert not early.needs_refinement("# A\n가\n", "# A\n가\n# B")
+    assert early.needs_refinement("# A\n가", "# A\n가" + "\n# B\n" + "나" * 50)
+    assert early.needs_refinement("# A\n완전히 다른", "# Z\nxyz 다른 내용 ")
+    assert not early.needs_refinement("# A", "")
@@ -0,0 +1,194 @@
+"""
+Token bucket rate limiter tests
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from core.orchestrator import Orchestrator
+from tests.fakes import install_fake_clients
+from utils.rate_limiter import (
+    RateLimiter,
+    configure_rate_limiters,
+    is_rate_limit_error,
+    rate_limiters,
+    retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_requests_bucket_reserves_fifo_waits(monkeypatch):
+    """용량을 넘는 요청은 순서대로 1/rate 간격의 대기 시간을 예약"""
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    limiter = RateLimiter(max_requests=2, time_window=1, clock=FakeClock())
+
+    waits = [await limiter.acquire() for _ in range(5)]
+
+    assert waits == pytest.approx([0, 0, 0.5, 1.0, 1.5])
+    assert sleeps == pytest.approx([0.5, 1.0, 1.5])
+    assert limiter.stats()["acquired"] == 5
+
+
+@pytest.mark.asyncio
+async def test_token_budget_precharge_and_reconcile(monkeypatch):
+    """예상 토큰을 미리 차감하고 실제 사용량으로 돌려받음"""
+
+    async def fake_sleep(delay):
+        pass
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    limiter = RateLimiter(
+        max_requests=100, time_window=60, max_tokens_per_minute=600, clock=FakeClock()
+    )
+
+    assert await limiter.acquire(tokens=600) == 0
+    # 버킷이 비었으므로 다음 100토큰은 10초(= 100 / 10토큰/초) 대기
+    assert await limiter.acquire(tokens=100) == pytest.approx(10)
+
+    limiter.reset()
+    await limiter.acquire(tokens=600)
+    limiter.reconcile(estimated=600, actual=100)
+    assert await limiter.acquire(tokens=300) == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_refunds_reservation(monkeypatch):
+    """대기 중 취소된 요청의 RPM/TPM 예약은 다음 요청에 돌아감"""
+    real_sleep = asyncio.sleep
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+        await real_sleep(3600)
+
+    limiter = RateLimiter(
+        max_requests=1, time_window=60, max_tokens_per_minute=600, clock=FakeClock()
+    )
+    assert await limiter.acquire(tokens=600) == 0
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    waiter = asyncio.create_task(limiter.acquire(tokens=300))
+    await real_sleep(0)
+    assert sleeps == pytest.approx([60])
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    # 취소된 예약이 남아 있었다면 120초(RPM), 60초(TPM) 대기
+    waiter = asyncio.create_task(limiter.acquire(tokens=300))
+    await real_sleep(0)
+    assert sleeps[-1] == pytest.approx(60)
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_waiters_do_not_block_each_other():
+    """대기 중에 락을 잡지 않으므로 동시 요청이 교착 없이 모두 통과"""
+    limiter = RateLimiter(max_requests=5, time_window=0.1)
+
+    await asyncio.wait_for(
+        asyncio.gather(*(limiter.acquire() for _ in range(10))), timeout=2
+    )
+
+    assert limiter.stats()["acquired"] == 10
+
+
+@pytest.mark.asyncio
+async def test_agents_acquire_provider_limiters(app_config):
+    """모든 에이전트와 통합 엔진이 프로바이더 리미터를 거침"""
+    configure_rate_limiters(app_config["rate_limits"])
+    assert rate_limiters["openai"].max_tokens_per_minute == (
+        app_config["rate_limits"]["openai"]["max_tokens_per_minute"]
+    )
+
+    orchestrator = Orchestrator(app_config)
+    orchestrator.cache = None
+    install_fake_clients(orchestrator)
+
+    await orchestrator.process_question("질문", context={"category": "일반"})
+
+    assert rate_limiters["gemini"].acquired == 1
+    assert rate_limiters["openai"].acquired == 1
+    assert rate_limiters["anthropic"].acquired == 2  # claude + synthesis
+
+
+class FakeRateLimitError(Exception):
+    """openai/anthropic APIStatusError 형태의 429 예외"""
+
+    def __init__(self, headers: dict):
+        super().__init__("rate limited")
+        self.status_code = 429
+        self.response = SimpleNamespace(headers=headers)
+
+
+def test_retry_after_headers():
+    """Retry-After 및 x-ratelimit-* 헤더 해석"""
+    assert retry_after(FakeRateLimitError({"retry-after": "7"})) == 7
+    assert retry_after(FakeRateLimitError({"retry-after-ms": "1500"})) == 1.5
+    assert retry_after(
+        FakeRateLimitError(
+            {
+                "x-ratelimit-remaining-requests": "0",
+                "x-ratelimit-reset-requests": "1m30s",
+            }
+        )
+    ) == pytest.approx(90)
+    assert (
+        retry_after(FakeRateLimitError({"x-ratelimit-remaining-requests": "3"})) is None
+    )
+
+    notion_error = SimpleNamespace(
+        code="rate_limited", status=429, headers={"retry-after": "2"}
+    )
+    assert is_rate_limit_error(notion_error)
+    assert retry_after(notion_error) == 2
+
+
+@pytest.mark.asyncio
+async def test_aimd_backoff_and_recovery(monkeypatch):
+    """429는 유효 속도를 절반으로 줄이고 전체를 멈춤, 성공이 이어지면 다시 증가"""
+
+    clock = FakeClock()
+
+    async def fake_sleep(delay):
+        clock.now += delay
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    limiter = RateLimiter(
+        max_requests=10, time_window=1, clock=clock, max_scale=2.0, increase=0.5
+    )
+
+    limiter.observe(FakeRateLimitError({"retry-after": "5"}))
+    assert limiter.effective_requests == 5
+    # 같은 백오프 중의 429는 추가로 줄이지 않음
+    limiter.observe(FakeRateLimitError({"retry-after": "5"}))
+    assert limiter.effective_requests == 5
+    # 백오프가 끝날 때까지 대기
+    assert await limiter.acquire() >= 5
+
+    for _ in range(5):
+        limiter.observe()
+    assert limiter.effective_requests == 10
+    for _ in range(100):
+        limiter.observe()
+    assert limiter.effective_requests == 20  # max_scale 상한
+
+    # 속도 제한이 아닌 오류는 무시
+    limiter.observe(ValueError("boom"))
+    assert limiter.stats()["rate_limited"] == 2
@@ -0,0 +1,88 @@
+"""
+Streaming result page tests
+"""
+
+import pytest
+
+from core.orchestrator import Orchestrator
+from core.result_stream import ResultStream
+from models.question import Question, QuestionStatus
+from tests.fakes import install_fake_clients
+from tests.test_notion_client import make_client
+from utils.rate_limiter import configure_rate_limiters
+
+ANSWER = "\n\n".join(f"## 섹션 {i}\n\n내용 {i} " + "단어 " * 20 for i in range(5))
+
+
+def make_stream(app_config, notion):
+    configure_rate_limiters({"notion": {"max_requests": 1000, "time_window": 1}})
+    app_config["deadlines"] = {}
+    orchestrator = Orchestrator(app_config)
+    orchestrator.cache = None
+    fakes = install_fake_clients(orchestrator)
+    for fake in fakes.values():
+        fake.text = ANSWER
+
+    question = Question(
+        page_id="q1", text="질문", status=QuestionStatus.PROCESSING, priority=None
+    )
+    stream = ResultStream(
+        notion, question, ["gemini", "chatgpt", "claude"], flush_chars=50
+    )
+    return orchestrator, stream
+
+
+def section_text(api, block_id):
+    return "".join(
+        item["text"]["content"]
+        for parent, children in api.appended
+        if parent == block_id
+        for block in children
+        for item in block[block["type"]].get("rich_text", [])
+    )
+
+
+@pytest.mark.asyncio
+async def test_sections_are_appended_while_streaming(app_config):
+    notion = make_client()
+    orchestrator, stream = make_stream(app_config, notion)
+
+    result = await orchestrator.process_question("질문", {"result_stream": stream})
+    page = await stream.finish(result)
+
+    api = notion.client
+    assert page["url"] == "https://notion.so/result-0"
+    assert len(api.created_pages) == 1
+    assert result["metadata"]["time_to_first_content"] is not None
+
+    # 섹션마다 여러 번 나눠 붙였고, 합치면 최종 응답 전체
+    for name in ("synthesis", "gemini", "chatgpt", "claude"):
+        block_id = stream.page["sections"][name]
+        assert sum(1 for parent, _ in api.appended if parent == block_id) > 1
+        expected = "".join(
+            line.lstrip("# ") for line in ANSWER.split("\n") if line.strip()
+        )
+        assert section_text(api, block_id) == expected
+    assert result["responses"]["gemini"]["metadata"]["first_token"] is not None
+
+
+@pytest.mark.asyncio
+async def test_page_failure_falls_back_to_batch_creation(app_config, monkeypatch):
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr("utils.retry.asyncio.sleep", no_sleep)
+    notion = make_client()
+
+    async def broken_create(**kwargs):
+        raise RuntimeError("notion down")
+
+    notion.client.pages.create = broken_create
+    orchestrator, stream = make_stream(app_config, notion)
+
+    result = await orchestrator.process_question("질문", {"result_stream": stream})
+
+    assert result["success"]
+    assert result["responses"]["claude"]["content"] == ANSWER
+    assert await stream.finish(result) is None
+    assert "time_to_first_content" not in result["metadata"]
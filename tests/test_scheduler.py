@@ -0,0 +1,177 @@
+"""
+Priority scheduler tests
+"""
+
+import asyncio
+
+import pytest
+
+from core.notion_watcher import NotionWatcher
+from core.scheduler import QuestionScheduler
+from models.question import Question, QuestionPriority, QuestionStatus
+from tests.fakes import FakeInbox, make_notion_page
+from tests.test_notion_client import make_client
+
+
+def make_question(page_id, priority):
+    return Question(
+        page_id=page_id, text="q", status=QuestionStatus.PENDING, priority=priority
+    )
+
+
+@pytest.mark.asyncio
+async def test_high_priority_jumps_queue_and_low_ages():
+    now = [0.0]
+    scheduler = QuestionScheduler(aging_interval=100, clock=lambda: now[0])
+    for i in range(3):
+        scheduler.put_nowait(make_question(f"low-{i}", QuestionPriority.LOW))
+    now[0] = 1
+    scheduler.put_nowait(make_question("high", QuestionPriority.HIGH))
+    scheduler.put_nowait(make_question("medium", QuestionPriority.MEDIUM))
+
+    assert (await scheduler.get()).page_id == "high"
+    assert (await scheduler.get()).page_id == "medium"
+
+    # 200초 기다린 LOW는 새 HIGH와 같은 순위가 되어 먼저 들어온 순서로 처리
+    scheduler.put_nowait(make_question("medium-2", QuestionPriority.MEDIUM))
+    now[0] = 201
+    scheduler.put_nowait(make_question("high-2", QuestionPriority.HIGH))
+    assert (await scheduler.get()).page_id == "low-0"
+
+    stats = scheduler.stats()
+    assert stats["high"]["dequeued"] == 1 and stats["high"]["avg_wait"] == 0
+    assert stats["low"]["dequeued"] == 1 and stats["low"]["avg_wait"] == 201
+    assert stats["low"]["queued"] == 2
+
+
+@pytest.mark.asyncio
+async def test_reserved_slot_only_takes_high():
+    inbox = FakeInbox()
+    watcher = NotionWatcher(
+        inbox, polling_interval=60, max_concurrent_tasks=2, reserved_high_slots=1
+    )
+    release = asyncio.Event()
+    started = []
+
+    async def callback(question):
+        started.append(question.page_id)
+        await release.wait()
+
+    for i in range(3):
+        inbox.add(f"low-{i}", priority=QuestionPriority.LOW)
+    task = asyncio.create_task(watcher.start(callback))
+    await asyncio.sleep(0.05)
+    # 공용 워커는 LOW 하나를 처리 중, 전용 워커는 비어 있음
+    assert started == ["low-0"]
+
+    inbox.add("high", priority=QuestionPriority.HIGH)
+    await watcher.poll_once()
+    await asyncio.sleep(0.05)
+    assert started == ["low-0", "high"]
+
+    release.set()
+    watcher.stop()
+    await asyncio.wait_for(task, timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_pending_questions_sorted_by_priority_not_name():
+    client = make_client()
+    client.client.inbox = [
+        make_notion_page("m", "q", priority="medium"),
+        make_notion_page("l", "q", priority="low"),
+        make_notion_page("h", "q", priority="high"),
+    ]
+
+    questions = await client.query_pending_questions()
+
+    assert [q.page_id for q in questions] == ["h", "m", "l"]
+
+
+def make_team_question(page_id, category, created_by=None):
+    question = make_question(page_id, QuestionPriority.MEDIUM)
+    question.category = category
+    question.created_by = created_by
+    return question
+
+
+def drain(scheduler):
+    order = []
+    while not scheduler.empty():
+        order.append(scheduler.get_nowait().page_id)
+    return order
+
+
+def test_fair_share_interleaves_keys_by_weight():
+    scheduler = QuestionScheduler(
+        fair_share={"enabled": True, "weights": {"마케팅": 2.0}}
+    )
+    for i in range(6):
+        scheduler.put_nowait(make_team_question(f"a{i}", "영업", "u1"))
+    for i in range(4):
+        scheduler.put_nowait(make_team_question(f"b{i}", "마케팅"))
+
+    assert drain(scheduler) == [
+        "a0",
+        "b0",
+        "b1",
+        "a1",
+        "b2",
+        "b3",
+        "a2",
+        "a3",
+        "a4",
+        "a5",
+    ]
+
+    stats = scheduler.fair_stats()
+    assert stats["영업/u1"]["dispatched"] == 6
+    assert stats["마케팅"] == {
+        "weight": 2.0,
+        "dispatched": 4,
+        "queued": 0,
+        "virtual_finish": 2.0,
+    }
+
+
+def test_fair_share_does_not_bank_credit_for_idle_keys():
+    """쉬던 키가 늦게 들어와도 밀린 몫을 한꺼번에 가져가지 않음"""
+    scheduler = QuestionScheduler(fair_share={"enabled": True})
+    for i in range(4):
+        scheduler.put_nowait(make_team_question(f"a{i}", "영업"))
+    assert drain(scheduler) == ["a0", "a1", "a2", "a3"]
+
+    for i in range(3):
+        scheduler.put_nowait(make_team_question(f"a{i + 4}", "영업"))
+        scheduler.put_nowait(make_team_question(f"b{i}", "법무"))
+    assert drain(scheduler) == ["b0", "a4", "b1", "a5", "b2", "a6"]
+
+
+def test_drain_does_not_rescan_queue():
+    """꺼낼 때마다 대기열 전체를 훑지 않음 (hold 확인은 질문당 한 번꼴)"""
+    now = [0.0]
+    calls = [0]
+
+    def hold(question):
+        calls[0] += 1
+        return False
+
+    scheduler = QuestionScheduler(
+        aging_interval=10,
+        clock=lambda: now[0],
+        fair_share={"enabled": True},
+        hold=hold,
+    )
+    priorities = list(QuestionPriority)
+    for i in range(3000):
+        question = make_team_question(f"q{i}", f"팀{i % 7}")
+        question.priority = priorities[i % 3]
+        scheduler.put_nowait(question)
+
+    order = []
+    while scheduler.qsize():
+        now[0] += 0.05  # 꺼내는 동안 LOW/MEDIUM이 에이징으로 올라감
+        order.append(scheduler.get_nowait().page_id)
+
+    assert len(order) == len(set(order)) == 3000
+    assert calls[0] <= 3000
@@ -0,0 +1,53 @@
+"""
+Near-duplicate detection tests
+"""
+
+import pytest
+
+from core.notion_watcher import NotionWatcher
+from core.similarity_index import SimilarityIndex
+from tests.fakes import FakeInbox
+
+
+def test_paraphrase_matches_within_category():
+    index = SimilarityIndex(threshold=0.8)
+    index.add("a", "국내 AI 스타트업 시장의 향후 3년 전망은?", "시장")
+    index.add("b", "사내 보안 교육 프로그램을 어떻게 설계할까?", "시장")
+
+    key, score = index.search("국내 AI 스타트업 시장 향후 3년 전망", "시장")
+    assert key == "a"
+    assert score >= 0.8
+
+    # 다른 카테고리와는 비교하지 않음
+    assert index.search("국내 AI 스타트업 시장의 향후 3년 전망은?", "법률") == (
+        None,
+        0.0,
+    )
+    # 관련 없는 질문은 임계값 미만
+    assert index.search("점심 메뉴 추천해줘", "시장") == (None, 0.0)
+
+
+@pytest.mark.asyncio
+async def test_watcher_marks_duplicate_of_completed_question():
+    inbox = FakeInbox()
+    inbox.add("first", "신규 SaaS 제품 가격 전략을 세워줘")
+    watcher = NotionWatcher(
+        inbox,
+        polling_interval=60,
+        max_concurrent_tasks=1,
+        similarity_index=SimilarityIndex(threshold=0.8),
+    )
+    seen = []
+
+    async def callback(question):
+        seen.append(question)
+
+    await watcher.poll_once()
+    await watcher._process_question(watcher.queue.get_nowait(), callback)
+
+    inbox.add("second", "신규 SaaS 제품 가격 전략 세워줘")
+    await watcher.poll_once()
+    await watcher._process_question(watcher.queue.get_nowait(), callback)
+
+    assert "duplicate_of" not in (seen[0].metadata or {})
+    assert seen[1].metadata["duplicate_of"]["page_id"] == "first"
@@ -0,0 +1,54 @@
+"""
+Virtual-clock capacity simulation tests
+"""
+
+import asyncio
+import time
+
+from benchmarks.load import load_profile
+from benchmarks.simulate import format_sweep, run_virtual, sweep
+from utils.rate_limiter import RateLimiter
+
+
+def test_virtual_loop_skips_idle_time():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        limiter = RateLimiter(max_requests=2, time_window=60, clock=loop.time)
+        for _ in range(5):
+            await limiter.acquire()
+        await asyncio.sleep(3600)
+        return loop.time(), limiter.stats()["total_wait"]
+
+    started = time.perf_counter()
+    now, waited = run_virtual(scenario())
+
+    # 레이트 리밋 대기 + 한 시간 sleep이 실제로는 기다리지 않고 지나감
+    assert now >= 3600 + 60
+    assert waited >= 60
+    assert time.perf_counter() - started < 1
+
+
+def test_sweep_finds_worker_and_provider_saturation():
+    profile = load_profile()
+    for provider in profile["providers"].values():
+        provider["latency"] = {"median": 20.0, "p95": 40.0}
+        provider["error_rate"] = 0.0
+        provider["rate_limit_rate"] = 0.0
+    profile["providers"]["notion"]["latency"] = {"median": 0.1, "p95": 0.2}
+    profile["config"]["rate_limits"]["openai"] = {"max_requests": 3, "time_window": 60}
+
+    result = sweep(profile, questions=20, workers=[1, 4, 8], seed=2)
+
+    runs = result["runs"]
+    assert all(run["completed"] == 20 for run in runs)
+    # 프로바이더 지연이 수십 초인 실행도 가상 시간으로 바로 끝남
+    assert runs[0]["elapsed"] > 600 and runs[0]["wall_time"] < runs[0]["elapsed"]
+    assert runs[0]["queue_depth"]["max"] > 0
+    assert runs[1]["throughput_per_min"] > runs[0]["throughput_per_min"]
+
+    # 워커를 늘리면 분당 3회인 openai 한도에서 막힘
+    saturation = result["saturation"]
+    assert saturation["workers"] == 1
+    assert saturation["openai"] in (4, 8)
+    assert saturation["gemini"] is None
+    assert "포화 지점" in format_sweep(result)
@@ -4,6 +4,22 @@ Utility modules
 
 from .logger import get_logger
 from .retry import async_retry
-from .rate_limiter import RateLimiter, rate_limiters
+from .rate_limiter import RateLimiter, configure_rate_limiters, rate_limiters
+from .cache import ResponseCache
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, get_circuit_breaker
+from .cost import CostTracker, configure_cost_tracker, cost_tracker
 
-__all__ = ["get_logger", "async_retry", "RateLimiter", "rate_limiters"]
+__all__ = [
+    "get_logger",
+    "async_retry",
+    "RateLimiter",
+    "configure_rate_limiters",
+    "rate_limiters",
+    "ResponseCache",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "get_circuit_breaker",
+    "CostTracker",
+    "configure_cost_tracker",
+    "cost_tracker",
+]
@@ -0,0 +1,189 @@
+"""
+Content-addressed response cache with TTL and LRU eviction
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCT = re.compile(r"[\s?!.。？！]+$")
+
+
+def normalize_question(text: str) -> str:
+    """
+    캐시 키용 질문 정규화
+
+    대소문자, 공백, 끝의 물음표/마침표 차이는 같은 질문으로 취급합니다.
+    """
+    text = _WHITESPACE.sub(" ", text.strip().lower())
+    return _TRAILING_PUNCT.sub("", text)
+
+
+@functools.lru_cache(maxsize=None)
+def prompt_fingerprint(func: Callable, *static: str) -> str:
+    """
+    프롬프트 템플릿 해시 (프롬프트 생성 함수의 소스 코드 기준)
+
+    템플릿을 수정하면 해시가 바뀌어 기존 캐시가 자연스럽게 무효화됩니다.
+    static에는 함수 밖에 둔 고정 프롬프트(시스템 프롬프트 등)를 넘깁니다.
+    """
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = getattr(func, "__qualname__", repr(func))
+    source = "\n".join([source, *static])
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+
+def make_cache_key(**parts: Any) -> str:
+    """키 구성 요소들로 콘텐츠 주소 키 생성"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    TTL + LRU 응답 캐시
+
+    메모리 LRU를 1차 캐시로, SQLite 파일을 2차(디스크) 캐시로 사용합니다.
+    디스크 캐시는 재시작 후에도 유지되며 max_disk_entries를 넘으면
+    가장 오래 사용되지 않은 항목부터 삭제합니다.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl: float = 86400,
+        path: Optional[str] = None,
+        max_disk_entries: int = 10000,
+    ):
+        """
+        Args:
+            max_entries: 메모리 캐시 최대 항목 수
+            ttl: 항목 유효 시간 (초)
+            path: 디스크 캐시 SQLite 경로 (None이면 메모리 캐시만 사용)
+            max_disk_entries: 디스크 캐시 최대 항목 수
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self._conn: Optional[sqlite3.Connection] = None
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache (
+                    key TEXT PRIMARY KEY,
+                    value_json TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache (accessed_at)"
+            )
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> Optional["ResponseCache"]:
+        """cache 설정 섹션에서 생성 (비활성화면 None)"""
+        if not config or not config.get("enabled", False):
+            return None
+        return cls(
+            max_entries=config.get("max_entries", 1000),
+            ttl=config.get("ttl", 86400),
+            path=config.get("path"),
+            max_disk_entries=config.get("max_disk_entries", 10000),
+        )
+
+    def get(self, key: str) -> Optional[Dict]:
+        """캐시 조회 (없거나 만료되면 None)"""
+        now = time.time()
+
+        entry = self._memory.get(key)
+        if entry:
+            expires_at, value = entry
+            if expires_at > now:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._memory[key]
+
+        if self._conn:
+            row = self._conn.execute(
+                "SELECT value_json, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row and row[1] > now:
+                self._conn.execute(
+                    "UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                value = json.loads(row[0])
+                self._remember(key, row[1], value)
+                self.hits += 1
+                return value
+            if row:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: Dict):
+        """캐시 저장"""
+        now = time.time()
+        expires_at = now + self.ttl
+        self._remember(key, expires_at, value)
+
+        if self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value_json, expires_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), expires_at, now),
+            )
+            self._evict_disk(now)
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        self._memory.clear()
+        if self._conn:
+            self._conn.execute("DELETE FROM cache")
+
+    def stats(self) -> Dict[str, int]:
+        """캐시 적중 통계"""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._memory)}
+
+    def _remember(self, key: str, expires_at: float, value: Dict):
+        """메모리 LRU에 저장"""
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self, now: float):
+        """만료 항목 및 용량 초과 항목 삭제"""
+        self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        overflow = count - self.max_disk_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY accessed_at LIMIT ?)",
+                (overflow,),
+            )
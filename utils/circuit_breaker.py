@@ -0,0 +1,184 @@
+"""
+Circuit breaker for external providers (closed / open / half-open)
+"""
+
+import time
+from enum import Enum
+from typing import Callable, Dict, Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# config.yaml에 circuit_breakers가 없을 때 사용하는 기본값
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RECOVERY_TIMEOUT = 60.0
+
+
+class CircuitState(Enum):
+    """서킷 브레이커 상태"""
+
+    CLOSED = "closed"  # 정상 - 모든 요청 통과
+    OPEN = "open"  # 차단 - 요청 즉시 실패
+    HALF_OPEN = "half_open"  # 복구 확인 - 시험 요청 하나만 통과
+
+
+class CircuitOpenError(Exception):
+    """차단된 서킷으로 요청시 발생 (재시도하지 않음)"""
+
+    retryable = False
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} 서킷 차단 중 ({retry_in:.0f}초 후 복구 시도)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    연속 실패 기반 서킷 브레이커
+
+    failure_threshold번 연속 실패하면 OPEN이 되어 recovery_timeout 동안
+    요청을 즉시 거부합니다. 이후 HALF_OPEN에서 시험 요청 하나를 통과시켜
+    성공하면 CLOSED, 실패하면 다시 OPEN으로 돌아갑니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        recovery_timeout: float = DEFAULT_RECOVERY_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            name: 식별자 (에이전트/서비스 이름)
+            failure_threshold: OPEN으로 전환할 연속 실패 횟수
+            recovery_timeout: OPEN 유지 시간 (초)
+            clock: 시각 함수 (테스트/시뮬레이션용)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        """요청 허용 여부 (HALF_OPEN에서는 시험 요청 하나만 허용)"""
+        if self.state == CircuitState.OPEN:
+            if self._clock() - self.opened_at < self.recovery_timeout:
+                return False
+            self._transition(CircuitState.HALF_OPEN)
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+
+        return True
+
+    def check(self):
+        """요청 허용 확인 (차단 중이면 CircuitOpenError)"""
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_in())
+
+    def retry_in(self) -> float:
+        """복구 시도까지 남은 시간 (초)"""
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self.opened_at + self.recovery_timeout - self._clock())
+
+    def record_success(self):
+        """요청 성공 기록"""
+        self.failures = 0
+        self._trial_in_flight = False
+        if self.state != CircuitState.CLOSED:
+            self._transition(CircuitState.CLOSED)
+
+    def record_failure(self):
+        """요청 실패 기록"""
+        self.failures += 1
+        self._trial_in_flight = False
+        if (
+            self.state == CircuitState.HALF_OPEN
+            or self.failures >= self.failure_threshold
+        ):
+            self.opened_at = self._clock()
+            if self.state != CircuitState.OPEN:
+                self._transition(CircuitState.OPEN)
+
+    def release(self):
+        """
+        결과 없이 끝난 요청 기록 (429, 취소)
+
+        성공/실패를 세지 않고 HALF_OPEN 시험 요청 자리만 돌려주므로 다음
+        요청이 다시 시험 요청이 됩니다.
+        """
+        if self.state == CircuitState.HALF_OPEN:
+            self._trial_in_flight = False
+
+    def snapshot(self) -> Dict:
+        """운영자용 상태 요약"""
+        return {
+            "state": self.state.value,
+            "failures": self.failures,
+            "retry_in": round(self.retry_in(), 1),
+        }
+
+    def _transition(self, state: CircuitState):
+        previous, self.state = self.state, state
+        if state == CircuitState.OPEN:
+            logger.warning(
+                f"🔌 {self.name} 서킷 차단 ({previous.value} → open, "
+                f"연속 실패 {self.failures}회, {self.recovery_timeout:.0f}초 후 복구 시도)"
+            )
+        elif state == CircuitState.HALF_OPEN:
+            logger.info(f"🔌 {self.name} 서킷 복구 확인 중 (half_open)")
+        else:
+            logger.info(f"🔌 {self.name} 서킷 복구 (closed)")
+
+
+# 전역 서킷 브레이커 레지스트리 (에이전트 이름, "synthesis", "notion")
+circuit_breakers: Dict[str, CircuitBreaker] = {}
+_settings: Dict = {}
+
+
+def configure_circuit_breakers(
+    config: Optional[Dict], clock: Callable[[], float] = time.monotonic
+) -> Dict[str, CircuitBreaker]:
+    """
+    circuit_breakers 설정 적용 (기존 브레이커 초기화)
+
+    Args:
+        config: circuit_breakers 설정 섹션 (없으면 기본값)
+        clock: 시각 함수
+    """
+    config = config or {}
+    _settings.clear()
+    _settings.update(
+        failure_threshold=config.get("failure_threshold", DEFAULT_FAILURE_THRESHOLD),
+        recovery_timeout=config.get("recovery_timeout", DEFAULT_RECOVERY_TIMEOUT),
+        clock=clock,
+    )
+    circuit_breakers.clear()
+    return circuit_breakers
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """이름별 서킷 브레이커 (없으면 설정값으로 생성)"""
+    breaker = circuit_breakers.get(name)
+    if breaker is None:
+        breaker = circuit_breakers[name] = CircuitBreaker(name, **_settings)
+    return breaker
+
+
+def circuit_states() -> Dict[str, Dict]:
+    """모든 서킷 브레이커 상태"""
+    return {name: b.snapshot() for name, b in sorted(circuit_breakers.items())}
+
+
+configure_circuit_breakers(None)
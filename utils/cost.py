@@ -0,0 +1,254 @@
+"""
+Token usage pricing and daily budget tracking
+"""
+
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 예산 단계
+BUDGET_OK = "ok"
+BUDGET_DOWNGRADE = "downgrade"  # LOW 질문은 저렴한 모델로
+BUDGET_HOLD = "hold"  # LOW 질문은 다음 날까지 대기
+
+
+class CostTracker:
+    """
+    모델 가격표 기반 호출 비용 계산 및 일일 지출 집계
+
+    가격은 100만 토큰당 USD이며, 모델 이름이 가격표에 없으면 가장 긴 접두사가
+    일치하는 항목을 사용합니다(예: claude-sonnet-4-5 → claude-sonnet-4-5-20250929).
+    프롬프트 캐시에서 읽은/캐시에 쓴 입력 토큰은 cache_read/cache_write 가격으로
+    계산합니다(없으면 일반 입력 가격).
+    일일 예산(daily_usd)이 있으면 지출이 downgrade_at 비율을 넘을 때 LOW 질문을
+    저렴한 모델로 바꾸고, hold_at 비율을 넘으면 LOW 질문을 날짜가 바뀔 때까지
+    스케줄러에 붙잡아 둡니다.
+
+    config.yaml 형식:
+        pricing:
+          gpt-4: {input: 30.0, output: 60.0}
+          claude-sonnet-4-5: {input: 3.0, output: 15.0, cache_read: 0.3, cache_write: 3.75}
+        budget:
+          daily_usd: 50
+          downgrade_at: 0.8
+          hold_at: 1.0
+    """
+
+    def __init__(
+        self,
+        pricing: Optional[Dict[str, Dict[str, float]]] = None,
+        budget: Optional[Dict] = None,
+        today: Callable[[], date] = date.today,
+    ):
+        """
+        Args:
+            pricing: 모델별 {input, output} 가격 (100만 토큰당 USD)
+            budget: 일일 예산 설정 (없거나 daily_usd가 0이면 제한 없음)
+            today: 오늘 날짜 함수 (테스트용)
+        """
+        self.today = today
+        self.configure(pricing, budget)
+
+    def configure(
+        self,
+        pricing: Optional[Dict[str, Dict[str, float]]] = None,
+        budget: Optional[Dict] = None,
+    ):
+        """가격표/예산 재설정 (지출 기록도 초기화)"""
+        budget = budget or {}
+        self.pricing = dict(pricing or {})
+        self.daily_budget = budget.get("daily_usd") or 0.0
+        self.downgrade_at = budget.get("downgrade_at", 0.8)
+        self.hold_at = budget.get("hold_at", 1.0)
+
+        self._day = self.today()
+        self._daily_cost = 0.0
+        self._daily_tokens = {"input": 0, "output": 0}
+        self._level = BUDGET_OK
+        self._unpriced = set()
+
+    def price(self, model: str) -> Optional[Dict[str, float]]:
+        """모델 가격 (정확히 일치 → 가장 긴 접두사 일치, 없으면 None)"""
+        if model in self.pricing:
+            return self.pricing[model]
+        matches = [name for name in self.pricing if model.startswith(name)]
+        if matches:
+            return self.pricing[max(matches, key=len)]
+        return None
+
+    def record(
+        self,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        estimated: bool = False,
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0,
+        price_factor: float = 1.0,
+    ) -> Dict:
+        """
+        호출 한 번의 사용량 기록
+
+        Args:
+            model: 모델 이름
+            input_tokens: 입력 토큰 수 (캐시에서 읽은/캐시에 쓴 토큰 포함)
+            output_tokens: 출력 토큰 수
+            estimated: API가 사용량을 주지 않아 추정한 값인지
+            cache_read_tokens: 입력 중 프롬프트 캐시에서 읽은 토큰 수
+            cache_write_tokens: 입력 중 프롬프트 캐시에 새로 쓴 토큰 수
+            price_factor: 가격 배율 (배치 API 할인 등)
+
+        Returns:
+            응답 metadata에 넣을 사용량
+            {'input_tokens', 'output_tokens', 'tokens', 'cost'[, 'estimated',
+             'cache_read_tokens', 'cache_write_tokens', 'cache_savings']}
+        """
+        price = self.price(model)
+        savings = 0.0
+        if price is None:
+            cost = 0.0
+            if model not in self._unpriced:
+                self._unpriced.add(model)
+                logger.warning(f"💸 가격표에 없는 모델, 비용 0으로 기록: {model}")
+        else:
+            input_price = price.get("input", 0.0)
+            read_price = price.get("cache_read", input_price)
+            uncached = input_tokens - cache_read_tokens - cache_write_tokens
+            cost = (
+                (
+                    uncached * input_price
+                    + cache_read_tokens * read_price
+                    + cache_write_tokens * price.get("cache_write", input_price)
+                    + output_tokens * price.get("output", 0.0)
+                )
+                * price_factor
+                / 1_000_000
+            )
+            savings = (
+                cache_read_tokens
+                * (input_price - read_price)
+                * price_factor
+                / 1_000_000
+            )
+
+        self._roll_day()
+        self._daily_cost += cost
+        self._daily_tokens["input"] += input_tokens
+        self._daily_tokens["output"] += output_tokens
+        self._update_level()
+
+        usage = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "tokens": input_tokens + output_tokens,
+            "cost": round(cost, 6),
+        }
+        if estimated:
+            usage["estimated"] = True
+        if cache_read_tokens or cache_write_tokens:
+            usage["cache_read_tokens"] = cache_read_tokens
+            usage["cache_write_tokens"] = cache_write_tokens
+            usage["cache_savings"] = round(savings, 6)
+        return usage
+
+    def seed(self, cost: float):
+        """재시작시 오늘 이미 쓴 비용 반영"""
+        self._roll_day()
+        self._daily_cost += cost
+        self._update_level()
+
+    def daily_total(self) -> float:
+        """오늘 지출 (USD)"""
+        self._roll_day()
+        return round(self._daily_cost, 6)
+
+    def level(self) -> str:
+        """현재 예산 단계 (ok | downgrade | hold)"""
+        self._roll_day()
+        return self._level
+
+    def should_downgrade(self, priority: Optional[str]) -> bool:
+        """이 우선순위 질문을 저렴한 모델로 처리해야 하는지"""
+        return priority == "low" and self.level() in (BUDGET_DOWNGRADE, BUDGET_HOLD)
+
+    def should_hold(self, question) -> bool:
+        """스케줄러가 이 질문을 붙잡아 둬야 하는지 (LOW 질문, 예산 소진)"""
+        return question.priority.value == "low" and self.level() == BUDGET_HOLD
+
+    def stats(self) -> Dict:
+        """오늘 지출 현황"""
+        self._roll_day()
+        return {
+            "day": self._day.isoformat(),
+            "cost": round(self._daily_cost, 6),
+            "input_tokens": self._daily_tokens["input"],
+            "output_tokens": self._daily_tokens["output"],
+            "budget": self.daily_budget,
+            "level": self._level,
+        }
+
+    def _roll_day(self):
+        """날짜가 바뀌면 일일 집계 초기화"""
+        today = self.today()
+        if today != self._day:
+            if self._daily_cost:
+                logger.info(
+                    f"💸 {self._day.isoformat()} 지출 ${self._daily_cost:.4f}, "
+                    "일일 집계 초기화"
+                )
+            self._day = today
+            self._daily_cost = 0.0
+            self._daily_tokens = {"input": 0, "output": 0}
+            self._update_level()
+
+    def _update_level(self):
+        """예산 단계 갱신 (바뀌면 로그)"""
+        level = BUDGET_OK
+        if self.daily_budget:
+            spent = self._daily_cost / self.daily_budget
+            if spent >= self.hold_at:
+                level = BUDGET_HOLD
+            elif spent >= self.downgrade_at:
+                level = BUDGET_DOWNGRADE
+
+        if level != self._level:
+            messages = {
+                BUDGET_OK: "예산 여유, 정상 처리",
+                BUDGET_DOWNGRADE: "LOW 질문은 저렴한 모델로 처리",
+                BUDGET_HOLD: "LOW 질문은 다음 날까지 대기",
+            }
+            logger.warning(
+                f"💸 일일 지출 ${self._daily_cost:.2f} / ${self.daily_budget:.2f}: "
+                f"{messages[level]}"
+            )
+            self._level = level
+
+
+# 전역 비용 집계 (main에서 pricing/budget 설정으로 재구성)
+cost_tracker = CostTracker()
+
+
+def configure_cost_tracker(
+    pricing: Optional[Dict[str, Dict[str, float]]] = None,
+    budget: Optional[Dict] = None,
+) -> CostTracker:
+    """
+    pricing/budget 설정으로 전역 비용 집계 재구성
+
+    cost_tracker 객체는 그대로 두고 설정만 교체하므로 이미 import한 모듈에도
+    반영됩니다.
+    """
+    cost_tracker.configure(pricing, budget)
+    if cost_tracker.daily_budget:
+        logger.info(f"⚙️  일일 예산: ${cost_tracker.daily_budget:.2f}")
+    return cost_tracker
+
+
+def start_of_today() -> float:
+    """오늘 0시 (time.time 기준 epoch 초)"""
+    now = datetime.now()
+    return time.mktime(now.replace(hour=0, minute=0, second=0).timetuple())
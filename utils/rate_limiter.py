@@ -3,62 +3,418 @@ Rate limiting with token bucket algorithm
 """
 
 import asyncio
+import email.utils
+import math
+import re
 import time
-from collections import deque
-from typing import Optional
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# config.yaml에 rate_limits가 없을 때 사용하는 기본값
+DEFAULT_RATE_LIMITS = {
+    "gemini": {"max_requests": 60, "time_window": 60},
+    "openai": {"max_requests": 50, "time_window": 60},
+    "anthropic": {"max_requests": 50, "time_window": 60},
+    "notion": {"max_requests": 3, "time_window": 1},
+}
+
+# 토큰 예산 시간 윈도우 (분당 토큰)
+TOKEN_WINDOW = 60.0
+
+# 429 응답에 대기 시간 헤더가 없을 때의 기본 백오프 (초)
+DEFAULT_BACKOFF = 1.0
+
+# "6m0s", "1.5s", "20ms" 형식 (OpenAI x-ratelimit-reset-*)
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    프롬프트 토큰 수 추정 (사전 차감용)
+
+    한국어/영어가 섞인 텍스트에서 대략 2~3자당 1토큰이므로
+    보수적으로 2자당 1토큰으로 계산합니다.
+    """
+    return math.ceil(len(text) / 2)
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    """헤더 값을 남은 시간(초)으로 변환 (숫자, "6m0s", HTTP 날짜, RFC 3339)"""
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    parts = _DURATION.findall(value)
+    if parts and "".join(n + u for n, u in parts) == value:
+        return sum(float(n) * _DURATION_UNITS[u] for n, u in parts)
+
+    try:
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            moment = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    return max(0.0, moment.timestamp() - time.time())
+
+
+def _error_headers(error: BaseException) -> Optional[Any]:
+    """SDK 예외에서 HTTP 응답 헤더 추출"""
+    headers = getattr(error, "headers", None)  # notion_client.APIResponseError
+    if headers is None:
+        response = getattr(error, "response", None)  # openai/anthropic APIStatusError
+        headers = getattr(response, "headers", None)
+    return headers
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """429 (속도 제한) 응답 여부 - OpenAI, Anthropic, Notion, Gemini SDK 예외 지원"""
+    code = getattr(error, "code", None)  # Notion: "rate_limited", Gemini: 429
+    status = getattr(error, "status_code", None) or getattr(error, "status", None)
+    return status == 429 or code == 429 or code == "rate_limited"
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """
+    속도 제한 예외의 헤더에서 대기 시간 추출
+
+    Retry-After(-ms)를 우선 사용하고, 없으면 남은 요청/토큰 수가 0인
+    x-ratelimit-* / anthropic-ratelimit-* 헤더의 reset 시각을 사용합니다.
+
+    Returns:
+        대기 시간 (초) - 알 수 없으면 None
+    """
+    headers = _error_headers(error)
+    if headers is None:
+        return None
+
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        delay = _parse_duration(value)
+        if delay is not None:
+            return delay / 1000
+
+    value = headers.get("retry-after")
+    if value is not None:
+        delay = _parse_duration(value)
+        if delay is not None:
+            return delay
+
+    delays = []
+    for prefix in ("x-ratelimit", "anthropic-ratelimit"):
+        for kind in ("requests", "tokens"):
+            if prefix == "x-ratelimit":
+                remaining = headers.get(f"{prefix}-remaining-{kind}")
+                reset = headers.get(f"{prefix}-reset-{kind}")
+            else:
+                remaining = headers.get(f"{prefix}-{kind}-remaining")
+                reset = headers.get(f"{prefix}-{kind}-reset")
+            if remaining is not None and reset is not None and remaining.strip() == "0":
+                delay = _parse_duration(reset)
+                if delay is not None:
+                    delays.append(delay)
+    return max(delays) if delays else None
+
+
+class _Bucket:
+    """
+    토큰 버킷 하나
+
+    잔량이 음수가 될 수 있으며(예약), 음수만큼을 채워지는 속도로 나눈 시간이
+    다음 요청의 대기 시간이 됩니다.
+    """
+
+    def __init__(self, capacity: float, window: float, now: float):
+        self.base_capacity = capacity
+        self.window = window
+        self.capacity = capacity
+        self.rate = capacity / window
+        self.level = capacity
+        # 백오프 중에는 미래 시각 (그때부터 다시 채워짐)
+        self.updated = now
+
+    def refill(self, now: float):
+        if now > self.updated:
+            self.level = min(
+                self.capacity, self.level + (now - self.updated) * self.rate
+            )
+            self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """amount만큼 예약하고 필요한 대기 시간(초) 반환"""
+        self.refill(now)
+        self.level -= min(amount, self.capacity)
+        return max(0.0, self.updated - now) + max(0.0, -self.level / self.rate)
+
+    def refund(self, amount: float, now: float):
+        """예약했지만 쓰지 않은 amount 반환"""
+        self.refill(now)
+        self.level = min(self.capacity, self.level + min(amount, self.capacity))
+
+    def scale(self, factor: float, now: float):
+        """유효 용량/속도를 설정값의 factor배로 조정"""
+        self.refill(now)
+        self.capacity = self.base_capacity * factor
+        self.rate = self.capacity / self.window
+        self.level = min(self.level, self.capacity)
+
+    def pause(self, until: float):
+        """until까지 채우지 않고 남은 잔량도 비움"""
+        self.level = min(self.level, 0.0)
+        self.updated = max(self.updated, until)
 
 
 class RateLimiter:
     """
     토큰 버킷 알고리즘 기반 속도 제한
+
+    분당 요청 수(RPM) 버킷과 선택적인 분당 토큰 수(TPM) 버킷을 함께 사용합니다.
+    acquire()는 락 없이 O(1)로 예약한 뒤 락 밖에서 대기하므로, 대기자는
+    도착 순서(FIFO)대로 통과하고 서로를 막지 않습니다.
+
+    유효 속도는 AIMD로 조정됩니다. 유효 속도 한 윈도우 분량의 요청이 연속으로
+    성공하면 increase만큼 올리고(최대 max_scale배), 429를 받으면 decrease배로
+    줄이며 Retry-After 동안 프로바이더 전체 요청을 멈춥니다.
     """
 
     def __init__(
-        self, max_requests: int, time_window: float, name: Optional[str] = None
+        self,
+        max_requests: int,
+        time_window: float,
+        name: Optional[str] = None,
+        max_tokens_per_minute: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        min_scale: float = 0.1,
+        max_scale: float = 1.0,
+        increase: float = 0.05,
+        decrease: float = 0.5,
     ):
         """
         Args:
             max_requests: 시간 윈도우 내 최대 요청 수
             time_window: 시간 윈도우 (초)
             name: 식별자 (로깅용)
+            max_tokens_per_minute: 분당 최대 토큰 수 (None이면 제한 없음)
+            clock: 시각 함수 (테스트/시뮬레이션용)
+            min_scale: 유효 속도 하한 (설정값 대비 배율)
+            max_scale: 유효 속도 상한 (설정값 대비 배율, 1보다 크면 설정값 이상 탐색)
+            increase: 윈도우 단위 가산 증가폭 (배율)
+            decrease: 429 수신시 곱할 감소 배율
         """
         self.max_requests = max_requests
         self.time_window = time_window
         self.name = name or "RateLimiter"
-        self.requests = deque()
-        self._lock = asyncio.Lock()
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self._clock = clock
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.increase = increase
+        self.decrease = decrease
+
+        # 통계
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.rate_limited = 0
 
-    async def acquire(self):
+        self.reset()
+
+    @classmethod
+    def from_config(
+        cls, name: str, config: Dict, clock: Callable[[], float] = time.monotonic
+    ) -> "RateLimiter":
+        """rate_limits.<provider> 설정에서 생성"""
+        return cls(
+            max_requests=config["max_requests"],
+            time_window=config["time_window"],
+            name=name,
+            max_tokens_per_minute=config.get("max_tokens_per_minute"),
+            clock=clock,
+            min_scale=config.get("min_scale", 0.1),
+            max_scale=config.get("max_scale", 1.0),
+            increase=config.get("increase", 0.05),
+            decrease=config.get("decrease", 0.5),
+        )
+
+    async def acquire(self, tokens: int = 0) -> float:
         """
         요청 허가 대기
         속도 제한 초과시 자동으로 대기
+
+        Args:
+            tokens: 이번 요청의 예상 토큰 수 (TPM 버킷에서 미리 차감)
+
+        Returns:
+            대기한 시간 (초)
         """
-        async with self._lock:
-            now = time.time()
+        now = self._clock()
+        requests = self._requests
+        token_bucket = self._tokens if tokens else None
+        wait = requests.reserve(1, now)
+        if token_bucket is not None:
+            wait = max(wait, token_bucket.reserve(tokens, now))
 
-            # 오래된 요청 제거
-            while self.requests and self.requests[0] < now - self.time_window:
-                self.requests.popleft()
+        self.acquired += 1
+        self.total_wait += wait
 
-            # 제한 초과시 대기
-            if len(self.requests) >= self.max_requests:
-                sleep_time = self.requests[0] + self.time_window - now
-                if sleep_time > 0:
-                    await asyncio.sleep(sleep_time)
-                    return await self.acquire()
+        try:
+            if wait > 0:
+                logger.debug(f"⏳ {self.name} 속도 제한 대기: {wait:.2f}초")
+                await asyncio.sleep(wait)
 
-            # 요청 기록
-            self.requests.append(now)
+            # 대기 중에 429 백오프가 걸렸으면 끝날 때까지 추가 대기
+            paused = self._paused_until - self._clock()
+            while paused > 0:
+                self.total_wait += paused
+                wait += paused
+                await asyncio.sleep(paused)
+                paused = self._paused_until - self._clock()
+        except asyncio.CancelledError:
+            # 보내지 않은 요청의 예약을 돌려줌 (뒤에 오는 요청이 그만큼 덜 대기)
+            now = self._clock()
+            requests.refund(1, now)
+            if token_bucket is not None:
+                token_bucket.refund(tokens, now)
+            raise
+        return wait
+
+    def reconcile(self, estimated: int, actual: int):
+        """
+        실제 사용량으로 TPM 버킷 보정
+
+        Args:
+            estimated: acquire()에 넘긴 예상 토큰 수
+            actual: API 응답의 실제 사용 토큰 수
+        """
+        if self._tokens is None:
+            return
+        self._tokens.refill(self._clock())
+        self._tokens.level = min(
+            self._tokens.capacity, self._tokens.level + estimated - actual
+        )
+
+    @property
+    def effective_requests(self) -> float:
+        """현재 유효 요청 수 (시간 윈도우당)"""
+        return self.max_requests * self.scale
+
+    def observe(self, error: Optional[BaseException] = None):
+        """
+        API 호출 결과 반영 (AIMD)
+
+        Args:
+            error: 호출 예외 (성공이면 None, 속도 제한이 아닌 오류는 무시)
+        """
+        if error is None:
+            self._successes += 1
+            if (
+                self._successes >= self.effective_requests
+                and self.scale < self.max_scale
+            ):
+                self._successes = 0
+                self._set_scale(min(self.max_scale, self.scale + self.increase))
+                logger.info(
+                    f"📈 {self.name} 유효 속도 증가: "
+                    f"{self.effective_requests:.1f}회/{self.time_window}초"
+                )
+            return
+
+        if is_rate_limit_error(error):
+            self.backoff(retry_after(error))
+
+    def backoff(self, delay: Optional[float] = None):
+        """
+        429 수신 처리: 유효 속도를 줄이고 delay 동안 프로바이더 전체 요청 중단
+
+        Args:
+            delay: 대기 시간 (초, None이면 기본 백오프)
+        """
+        now = self._clock()
+        until = now + (DEFAULT_BACKOFF if delay is None else delay)
+        self.rate_limited += 1
+        self._successes = 0
+
+        # 같은 429 폭주에 대해서는 한 번만 감소
+        if now >= self._paused_until:
+            self._set_scale(max(self.min_scale, self.scale * self.decrease))
+            logger.warning(
+                f"📉 {self.name} 속도 제한(429): 유효 속도 "
+                f"{self.effective_requests:.1f}회/{self.time_window}초, "
+                f"{until - now:.1f}초 대기"
+            )
+
+        self._paused_until = max(self._paused_until, until)
+        self._requests.pause(until)
+        if self._tokens is not None:
+            self._tokens.pause(until)
+
+    def _set_scale(self, scale: float):
+        now = self._clock()
+        self.scale = scale
+        self._requests.scale(scale, now)
+        if self._tokens is not None:
+            self._tokens.scale(scale, now)
 
     def reset(self):
         """카운터 리셋"""
-        self.requests.clear()
+        now = self._clock()
+        self.scale = 1.0
+        self._successes = 0
+        self._paused_until = now
+        self._requests = _Bucket(self.max_requests, self.time_window, now)
+        self._tokens = (
+            _Bucket(self.max_tokens_per_minute, TOKEN_WINDOW, now)
+            if self.max_tokens_per_minute
+            else None
+        )
+
+    def stats(self) -> Dict[str, float]:
+        """대기 통계"""
+        return {
+            "acquired": self.acquired,
+            "total_wait": self.total_wait,
+            "avg_wait": self.total_wait / self.acquired if self.acquired else 0.0,
+            "rate_limited": self.rate_limited,
+            "effective_requests": self.effective_requests,
+        }
+
+
+def configure_rate_limiters(
+    config: Optional[Dict], clock: Callable[[], float] = time.monotonic
+) -> Dict[str, RateLimiter]:
+    """
+    rate_limits 설정으로 전역 레이트 리미터 재구성
+
+    rate_limiters 딕셔너리 객체는 그대로 두고 내용만 교체하므로
+    이미 import한 모듈에도 반영됩니다.
+
+    Args:
+        config: rate_limits 설정 섹션 (없으면 기본값)
+        clock: 시각 함수
+    """
+    limits = {**DEFAULT_RATE_LIMITS, **(config or {})}
+    rate_limiters.clear()
+    for name, limit in limits.items():
+        rate_limiters[name] = RateLimiter.from_config(name, limit, clock=clock)
+        logger.info(
+            f"⚙️  {name} 속도 제한: {limit['max_requests']}회/{limit['time_window']}초"
+            + (
+                f", {limit['max_tokens_per_minute']} 토큰/분"
+                if limit.get("max_tokens_per_minute")
+                else ""
+            )
+        )
+    return rate_limiters
 
 
-# 전역 레이트 리미터 인스턴스
-rate_limiters = {
-    "gemini": RateLimiter(max_requests=60, time_window=60, name="Gemini"),
-    "openai": RateLimiter(max_requests=50, time_window=60, name="OpenAI"),
-    "anthropic": RateLimiter(max_requests=50, time_window=60, name="Anthropic"),
-    "notion": RateLimiter(max_requests=3, time_window=1, name="Notion"),
+# 전역 레이트 리미터 인스턴스 (Application 시작시 configure_rate_limiters로 재구성)
+rate_limiters: Dict[str, RateLimiter] = {
+    name: RateLimiter.from_config(name, limit)
+    for name, limit in DEFAULT_RATE_LIMITS.items()
 }
@@ -44,6 +44,10 @@ def async_retry(
                 except exceptions as e:
                     last_exception = e
 
+                    # 재시도해도 의미 없는 예외 (예: 서킷 차단)
+                    if getattr(e, "retryable", True) is False:
+                        raise
+
                     if attempt == max_attempts:
                         logger.error(
                             f"❌ {func.__name__} 실패 " f"({max_attempts}회 시도): {e}"